@@ -0,0 +1,122 @@
+# *******************************************************
+# Nom ......... : acteur.py
+# Rôle ........ : Acteur de salle : exécution séquentielle des actions d'une salle
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Chaque salle possède une boîte aux lettres et une unique tâche
+#                 asyncio qui en consomme les actions validées, une par une et
+#                 dans l'ordre d'arrivée. L'état de la salle n'est ainsi modifié
+#                 que par cette tâche. La latence (attente + traitement) et la
+#                 profondeur de la boîte sont mesurées pour chaque salle.
+#
+# Technologies  : Python, asyncio
+# Dépendances . : asyncio, time
+# Usage ....... : resultat = await salle.acteur.soumettre(gestionnaire, *arguments)
+# *******************************************************
+
+import asyncio
+import time
+
+class SalleFermee(Exception):
+    """
+    Levée pour les actions soumises à un acteur arrêté (salle supprimée).
+    """
+
+class ActeurSalle:
+    """
+    Boîte aux lettres + tâche unique propriétaire de l'état d'une salle.
+    La tâche n'est créée qu'à la première action soumise.
+    """
+
+    __slots__ = ("boite", "tache", "arrete", "actions_traitees", "duree_totale", "latence_max", "profondeur_max")
+
+    def __init__(self):
+        self.boite = None
+        self.tache = None
+        self.arrete = False
+        # Mesures exposées par /statistiques/salles
+        self.actions_traitees = 0
+        self.duree_totale = 0.0
+        self.latence_max = 0.0
+        self.profondeur_max = 0
+
+    @property
+    def profondeur(self) -> int:
+        """
+        Nombre d'actions en attente dans la boîte aux lettres.
+        """
+        return self.boite.qsize() if self.boite is not None else 0
+
+    @property
+    def latence_moyenne(self) -> float:
+        """
+        Latence moyenne (secondes) entre la soumission et la fin d'une action.
+        """
+        return self.duree_totale / self.actions_traitees if self.actions_traitees else 0.0
+
+    async def soumettre(self, fonction, *arguments):
+        """
+        Dépose une action dans la boîte et attend son exécution par l'acteur.
+        Retourne le résultat de `fonction(*arguments)` ou relève son exception.
+        """
+        if self.arrete:
+            raise SalleFermee("Salle fermée")
+        if self.tache is None:
+            self.boite = asyncio.Queue()
+            self.tache = asyncio.create_task(self._boucle())
+        futur = asyncio.get_running_loop().create_future()
+        self.boite.put_nowait((fonction, arguments, futur, time.perf_counter()))
+        if self.boite.qsize() > self.profondeur_max:
+            self.profondeur_max = self.boite.qsize()
+        return await futur
+
+    async def _boucle(self):
+        """
+        Tâche de l'acteur : exécute les actions une par une, dans l'ordre de dépôt.
+        """
+        while True:
+            element = await self.boite.get()
+            if element is None:
+                break
+            fonction, arguments, futur, debut = element
+            if futur.cancelled():
+                continue
+            try:
+                resultat = await fonction(*arguments)
+            except Exception as e:
+                if not futur.done():
+                    futur.set_exception(e)
+            else:
+                if not futur.done():
+                    futur.set_result(resultat)
+            latence = time.perf_counter() - debut
+            self.actions_traitees += 1
+            self.duree_totale += latence
+            if latence > self.latence_max:
+                self.latence_max = latence
+        # Les actions arrivées après l'arrêt n'ont plus de salle sur laquelle agir
+        while not self.boite.empty():
+            element = self.boite.get_nowait()
+            if element is not None and not element[2].done():
+                element[2].set_exception(SalleFermee("Salle fermée"))
+
+    def arreter(self):
+        """
+        Demande l'arrêt de l'acteur après l'action en cours (appelable depuis l'acteur lui-même).
+        """
+        self.arrete = True
+        if self.boite is not None:
+            self.boite.put_nowait(None)
+
+    def statistiques(self) -> dict:
+        """
+        Mesures courantes de l'acteur.
+        """
+        return {
+            "profondeur": self.profondeur,
+            "profondeur_max": self.profondeur_max,
+            "actions_traitees": self.actions_traitees,
+            "latence_moyenne_ms": round(self.latence_moyenne * 1000, 3),
+            "latence_max_ms": round(self.latence_max * 1000, 3),
+        }
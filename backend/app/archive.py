@@ -0,0 +1,274 @@
+# *******************************************************
+# Nom ......... : archive.py
+# Rôle ........ : Archive en ajout seul des parties terminées, lue par projection mémoire
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Les parties terminées (enregistrements de rediffusions.py) sont ajoutées
+#                 à un seul fichier <nom>.bna par le thread d'écriture par lots du journal
+#                 des parties, chacune derrière un en-tête de taille fixe. Après chaque lot,
+#                 l'index <nom>.bni reçoit une entrée de taille fixe par partie (identifiant,
+#                 date, position) : un lecteur qui voit une entrée d'index voit toujours
+#                 l'enregistrement complet. Les identifiants commencent par la date en
+#                 hexadécimal et l'index est écrit dans l'ordre des dates : la recherche par
+#                 identifiant comme par période est une dichotomie dans l'index.
+#                 LecteurArchive projette les deux fichiers en mémoire (mmap) : parcours et
+#                 recherches rendent des memoryview sur la projection, sans copie, pendant que
+#                 le serveur continue d'ajouter (rafraichir() étend la projection).
+#                 Dans une grappe, chaque worker écrit sa propre archive (<nom>-p<partition>).
+#                 Un lot dont l'écriture échoue (OSError) est compté, journalisé et retiré
+#                 des deux fichiers (tronqués à leur taille d'avant le lot) : l'archive
+#                 reste lisible en séquence et le thread continue avec les lots suivants.
+#
+#                 <nom>.bna : ENTETE puis, par partie, EN_TETE_PARTIE et l'enregistrement :
+#                   identifiant (16 o ASCII), date (int64), longueur (uint32), coups (uint32),
+#                   taille de grille (uint16), gagnant (int8), 1 octet libre
+#                 <nom>.bni : ENTETE_INDEX puis, par partie, ENTREE_INDEX :
+#                   identifiant (16 o), date (int64), position de l'en-tête dans <nom>.bna (uint64)
+#                 Entiers petit-boutistes.
+#
+# Technologies  : Python, mmap, threading
+# Dépendances . : glob, logging, mmap, os, struct, app.config, app.journal_parties, app.journalisation
+# Usage ....... : archive_parties.archiver(id_partie, date, taille, coups, gagnant, donnees)
+#                 with LecteurArchive("rediffusions/parties") as lecteur: lecteur.chercher(id_partie)
+# *******************************************************
+
+import glob
+import logging
+import mmap
+import os
+import struct
+
+from .config import DOSSIER_REDIFFUSIONS, NB_PARTITIONS, PARTITION
+from .journal_parties import JournalParties
+from .journalisation import journaliser
+
+ENTETE = b"BNA1"
+ENTETE_INDEX = b"BNI1"
+EXTENSION = ".bna"
+EXTENSION_INDEX = ".bni"
+EN_TETE_PARTIE = struct.Struct("<16sqIIHbx")
+ENTREE_INDEX = struct.Struct("<16sqQ")
+LONGUEUR_ID = 16
+
+def nom_archive(nom: str = "parties", partition: int = PARTITION, nb_partitions: int = NB_PARTITIONS) -> str:
+    """
+    Nom de l'archive de ce processus (un fichier par worker dans une grappe).
+    """
+    return nom if nb_partitions <= 1 else f"{nom}-p{partition}"
+
+def date_identifiant(id_partie: str) -> int:
+    """
+    Date (secondes) codée en tête d'un identifiant de partie, -1 s'il est mal formé.
+    """
+    try:
+        return int(id_partie[:8], 16)
+    except ValueError:
+        return -1
+
+class ArchiveParties(JournalParties):
+    """
+    Écriture de l'archive : archiver() est appelée depuis la boucle d'événements et ne fait
+    qu'encoder et déposer ; le thread du journal écrit les lots (données puis index).
+    """
+
+    def __init__(self, dossier: str = DOSSIER_REDIFFUSIONS, nom: str = None):
+        super().__init__(dossier, nom_thread="archive-parties")
+        self.nom = nom or nom_archive()
+        self.parties = 0
+
+    @property
+    def chemin(self) -> str:
+        return os.path.join(self.dossier, self.nom)
+
+    def archiver(self, id_partie: str, date: int, taille: int, coups: int, gagnant: int, donnees: bytes):
+        """
+        Dépose une partie terminée ; `id_partie` (16 caractères ASCII) commence par `date` en hexadécimal.
+        """
+        en_tete = EN_TETE_PARTIE.pack(id_partie.encode("ascii"), date, len(donnees), coups, taille, gagnant)
+        self.ajouter(id_partie, en_tete + donnees)
+
+    def derniere_date(self) -> int:
+        """
+        Date de la dernière partie de l'index de ce processus (0 si aucune) : les suivantes
+        doivent être datées d'au moins autant pour garder l'index trié d'un démarrage à l'autre.
+        """
+        try:
+            with open(self.chemin + EXTENSION_INDEX, "rb") as index:
+                taille = index.seek(0, os.SEEK_END)
+                if taille < len(ENTETE_INDEX) + ENTREE_INDEX.size:
+                    return 0
+                index.seek(taille - (taille - len(ENTETE_INDEX)) % ENTREE_INDEX.size - ENTREE_INDEX.size)
+                return ENTREE_INDEX.unpack(index.read(ENTREE_INDEX.size))[1]
+        except OSError:
+            return 0
+
+    def _traiter(self, par_salle):
+        """
+        Thread d'écriture : ajoute le lot à l'archive, puis ses entrées à l'index.
+        """
+        if not par_salle:
+            return
+        tailles = {}  # chemin -> taille avant le lot, pour annuler un lot incomplet
+        try:
+            entrees = bytearray()
+            with open(self.chemin + EXTENSION, "ab") as fichier:
+                tailles[fichier.name] = fichier.tell()
+                if fichier.tell() == 0:
+                    fichier.write(ENTETE)
+                for donnees in par_salle.values():
+                    id_partie, date = EN_TETE_PARTIE.unpack_from(donnees)[:2]
+                    entrees += ENTREE_INDEX.pack(id_partie, date, fichier.tell())
+                    fichier.write(donnees)
+            with open(self.chemin + EXTENSION_INDEX, "ab") as index:
+                tailles[index.name] = index.tell()
+                if index.tell() == 0:
+                    index.write(ENTETE_INDEX)
+                index.write(entrees)
+        except OSError as erreur:
+            self.erreurs += 1
+            journaliser(logging.ERROR, "archive_erreur", parties=len(par_salle), erreur=str(erreur))
+            for chemin, taille in tailles.items():
+                try:
+                    os.truncate(chemin, taille)
+                except OSError:
+                    pass
+            return
+        self.octets_ecrits += sum(len(donnees) for donnees in par_salle.values())
+        self.parties += len(par_salle)
+        self.lots += 1
+
+class LecteurArchive:
+    """
+    Lecture d'une archive par projection mémoire ; les enregistrements rendus sont des
+    memoryview sur la projection (valables tant que le lecteur est ouvert).
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self.donnees = None
+        self.index = None
+        self.nombre = 0
+        self.rafraichir()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __len__(self) -> int:
+        return self.nombre
+
+    @staticmethod
+    def _projeter(chemin: str, entete: bytes):
+        """
+        Projection en lecture d'un fichier entier, None s'il est absent ou encore vide.
+        """
+        try:
+            with open(chemin, "rb") as fichier:
+                if os.fstat(fichier.fileno()).st_size <= len(entete):
+                    return None
+                projection = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+        if projection[:len(entete)] != entete:
+            raise ValueError(f"{chemin} : en-tête d'archive absent")
+        return memoryview(projection)
+
+    def rafraichir(self) -> int:
+        """
+        Étend la projection aux parties ajoutées depuis l'ouverture ; retourne leur nombre total.
+        L'index est projeté avant les données : toute entrée visible a son enregistrement complet.
+        """
+        index = self._projeter(self.chemin + EXTENSION_INDEX, ENTETE_INDEX)
+        if index is None:
+            return self.nombre
+        donnees = self._projeter(self.chemin + EXTENSION, ENTETE)
+        if donnees is None:
+            return self.nombre
+        # Les anciennes projections restent valides pour les memoryview déjà rendues
+        self.index, self.donnees = index, donnees
+        self.nombre = (len(index) - len(ENTETE_INDEX)) // ENTREE_INDEX.size
+        return self.nombre
+
+    def fermer(self):
+        self.index = self.donnees = None
+        self.nombre = 0
+
+    def entree(self, rang: int):
+        """
+        (identifiant, date, position) de la partie de rang donné dans l'index.
+        """
+        id_brut, date, position = ENTREE_INDEX.unpack_from(self.index, len(ENTETE_INDEX) + rang * ENTREE_INDEX.size)
+        return id_brut.decode("ascii"), date, position
+
+    def lire(self, position: int):
+        """
+        Partie dont l'en-tête est à `position` : (identifiant, date, coups, taille, gagnant, enregistrement).
+        """
+        id_brut, date, longueur, coups, taille, gagnant = EN_TETE_PARTIE.unpack_from(self.donnees, position)
+        debut = position + EN_TETE_PARTIE.size
+        return id_brut.decode("ascii"), date, coups, taille, gagnant, self.donnees[debut:debut + longueur]
+
+    def _premier_rang(self, date: int) -> int:
+        """
+        Rang de la première entrée d'index datée de `date` ou après (dichotomie).
+        """
+        bas, haut = 0, self.nombre
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            if ENTREE_INDEX.unpack_from(self.index, len(ENTETE_INDEX) + milieu * ENTREE_INDEX.size)[1] < date:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        return bas
+
+    def chercher(self, id_partie: str):
+        """
+        Partie d'identifiant donné (voir lire()), None si elle n'est pas dans l'archive.
+        """
+        date = date_identifiant(id_partie)
+        if date < 0 or self.index is None:
+            return None
+        for rang in range(self._premier_rang(date), self.nombre):
+            identifiant, date_entree, position = self.entree(rang)
+            if date_entree != date:
+                return None
+            if identifiant == id_partie:
+                return self.lire(position)
+        return None
+
+    def entre(self, debut: int, fin: int):
+        """
+        Parties datées de [debut, fin[, dans l'ordre de l'archive.
+        """
+        if self.index is None:
+            return
+        for rang in range(self._premier_rang(debut), self.nombre):
+            _, date, position = self.entree(rang)
+            if date >= fin:
+                return
+            yield self.lire(position)
+
+    def __iter__(self):
+        """
+        Toutes les parties indexées, par lecture séquentielle de l'archive.
+        """
+        if self.donnees is None:
+            return
+        position = len(ENTETE)
+        for _ in range(self.nombre):
+            partie = self.lire(position)
+            yield partie
+            position += EN_TETE_PARTIE.size + len(partie[-1])
+
+def ouvrir_archives(dossier: str = DOSSIER_REDIFFUSIONS, nom: str = "parties"):
+    """
+    Lecteurs de toutes les archives d'un dossier (celle de chaque worker d'une grappe).
+    """
+    chemins = sorted(glob.glob(os.path.join(glob.escape(dossier), glob.escape(nom) + "*" + EXTENSION_INDEX)))
+    return [LecteurArchive(chemin[:-len(EXTENSION_INDEX)]) for chemin in chemins]
+
+# Archive des parties de ce processus
+archive_parties = ArchiveParties()
@@ -0,0 +1,231 @@
+# *******************************************************
+# Nom ......... : balayeur.py
+# Rôle ........ : Nettoyage périodique des salles abandonnées et des sockets muettes
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Une tâche de fond parcourt les salles toutes les INTERVALLE_BALAYAGE
+#                 secondes :
+#                 - battement de cœur : une connexion muette depuis INTERVALLE_PING reçoit
+#                   {"action": "ping"} ; sans aucun message (pong compris) dans les
+#                   DELAI_PONG secondes suivantes, elle est fermée comme une coupure
+#                   (la place du joueur est alors gardée pour une reprise) ;
+#                 - salle sans aucun joueur connecté depuis DELAI_SALLE_VIDE (créée mais
+#                   jamais rejointe, joueur IA seul, gestionnaire interrompu...) : supprimée ;
+#                 - salle sans aucune action depuis DELAI_INACTIVITE_SALLE : les joueurs
+#                   sont prévenus ("salle_fermee") puis la salle est supprimée ;
+#                 - les spectateurs (spectateurs.py) ont le même battement de cœur ;
+#                 - index orphelins (joueur_vers_salle, seaux anti-spam, spectateurs) : purgés.
+#                 taille_approximative() estime la mémoire d'une salle pour /statistiques/memoire.
+#
+# Technologies  : Python, asyncio
+# Dépendances . : asyncio, collections, logging, os, sys, time, types, app.config, app.game_manager,
+#                 app.connexion, app.ia, app.acteur, app.diffusion, app.limiteur, app.spectateurs,
+#                 app.journalisation
+# Usage ....... : balayeur.demarrer() (cycle de vie de l'application) ; balayeur.balayer()
+# *******************************************************
+
+import asyncio
+import logging
+import os
+import sys
+import time
+import types
+from collections import deque
+
+from .config import (INTERVALLE_BALAYAGE, DELAI_SALLE_VIDE, DELAI_INACTIVITE_SALLE,
+                     INTERVALLE_PING, DELAI_PONG)
+from .game_manager import gestionnaire_parties
+from .connexion import Connexion
+from .ia import JoueurIA
+from .acteur import SalleFermee
+from .diffusion import diffuser
+from .limiteur import limiteur
+from .spectateurs import tribunes
+from .journalisation import journaliser
+
+# Objets partagés ou propres à une socket : jamais comptés dans la taille d'une salle
+NON_PARCOURUS = (Connexion, JoueurIA, asyncio.Future, asyncio.Queue, asyncio.Event,
+                 types.ModuleType, types.FunctionType, types.MethodType, type)
+
+def taille_approximative(objet, vus=None) -> int:
+    """
+    Taille en octets d'un objet et de tout ce qu'il contient (sys.getsizeof récursif).
+    Chaque objet n'est compté qu'une fois ; les connexions et tâches sont ignorées.
+    """
+    if vus is None:
+        vus = set()
+    if id(objet) in vus or isinstance(objet, NON_PARCOURUS):
+        return 0
+    vus.add(id(objet))
+    taille = sys.getsizeof(objet)
+    if isinstance(objet, dict):
+        for cle, valeur in objet.items():
+            taille += taille_approximative(cle, vus) + taille_approximative(valeur, vus)
+    elif isinstance(objet, (list, tuple, set, frozenset, deque)):
+        for element in objet:
+            taille += taille_approximative(element, vus)
+    elif hasattr(objet, "__dict__"):
+        taille += taille_approximative(vars(objet), vus)
+    if hasattr(objet.__class__, "__slots__"):
+        for nom in objet.__class__.__slots__:
+            taille += taille_approximative(getattr(objet, nom, None), vus)
+    return taille
+
+def memoire_processus() -> int:
+    """
+    Mémoire résidente du processus en octets (Linux), 0 si elle n'est pas disponible.
+    """
+    try:
+        with open("/proc/self/statm") as fichier:
+            pages_residentes = int(fichier.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return pages_residentes * os.sysconf("SC_PAGE_SIZE")
+
+class Balayeur:
+    """
+    Tâche de nettoyage des salles et de surveillance des connexions.
+    """
+
+    def __init__(self, intervalle=INTERVALLE_BALAYAGE, delai_salle_vide=DELAI_SALLE_VIDE,
+                 delai_inactivite=DELAI_INACTIVITE_SALLE, intervalle_ping=INTERVALLE_PING,
+                 delai_pong=DELAI_PONG):
+        self.intervalle = intervalle
+        self.delai_salle_vide = delai_salle_vide
+        self.delai_inactivite = delai_inactivite
+        self.intervalle_ping = intervalle_ping
+        self.delai_pong = delai_pong
+        self.tache = None
+        # Compteurs exposés par /metrics et /statistiques/memoire
+        self.balayages = 0
+        self.duree_dernier_balayage = 0.0
+        self.pings_envoyes = 0
+        self.connexions_muettes = 0
+        self.salles_supprimees = {"vide": 0, "inactive": 0}
+        self.orphelins_purges = 0
+
+    def demarrer(self):
+        if self.intervalle > 0 and self.tache is None:
+            self.tache = asyncio.create_task(self._boucle())
+
+    def arreter(self):
+        if self.tache is not None:
+            self.tache.cancel()
+            self.tache = None
+
+    async def _boucle(self):
+        while True:
+            await asyncio.sleep(self.intervalle)
+            try:
+                await self.balayer()
+            except Exception:
+                journaliser(logging.ERROR, "erreur_balayage", exc_info=True)
+
+    async def balayer(self, maintenant=None):
+        """
+        Un passage complet sur toutes les salles du processus.
+        """
+        debut = time.perf_counter()
+        maintenant = time.monotonic() if maintenant is None else maintenant
+        for salle in list(gestionnaire_parties.salles.values()):
+            connectes = [ws for ws in salle.ws.values() if isinstance(ws, Connexion)]
+            for connexion in connectes:
+                self.surveiller(connexion, maintenant)
+            if salle.sieges_reserves:
+                continue  # La reprise décide du sort de la salle (voir liberer_place)
+            inactivite = maintenant - salle.derniere_activite
+            if not connectes and inactivite > self.delai_salle_vide:
+                await self.fermer_salle(salle, "vide")
+            elif inactivite > self.delai_inactivite:
+                await self.fermer_salle(salle, "inactive")
+        for id_salle in list(tribunes.par_salle):
+            for connexion in tribunes.connexions(id_salle):
+                self.surveiller(connexion, maintenant)
+        self.purger_orphelins()
+        self.balayages += 1
+        self.duree_dernier_balayage = time.perf_counter() - debut
+
+    def surveiller(self, connexion, maintenant):
+        """
+        Battement de cœur : ping après INTERVALLE_PING de silence, fermeture après DELAI_PONG de plus.
+        """
+        silence = maintenant - connexion.derniere_reception
+        if silence < self.intervalle_ping or connexion.fermee:
+            return
+        if silence > self.intervalle_ping + self.delai_pong:
+            self.connexions_muettes += 1
+            asyncio.ensure_future(connexion.fermer(code=1001))
+        elif not connexion.ping_en_attente:
+            connexion.ping_en_attente = True
+            self.pings_envoyes += 1
+            connexion.deposer(connexion.encoder({"action": "ping"}))
+
+    async def fermer_salle(self, salle, raison):
+        try:
+            await salle.acteur.soumettre(self._fermer, salle, raison)
+        except SalleFermee:
+            pass
+
+    async def _fermer(self, salle, raison):
+        """
+        Exécuté par l'acteur de la salle : prévient les joueurs, ferme leurs connexions
+        et arrête les joueurs IA, puis supprime la salle.
+        """
+        if gestionnaire_parties.salle_par_id(salle.id) is not salle:
+            return
+        journaliser(logging.INFO, "salle_balayee", salle=salle.id, raison=raison, joueurs=len(salle.joueurs))
+        if raison == "inactive":
+            await diffuser(salle, {
+                "action": "salle_fermee",
+                "message": "Partie fermée après une trop longue inactivité."
+            })
+        for ws in salle.ws.values():
+            if isinstance(ws, Connexion):
+                asyncio.ensure_future(ws.vider_et_fermer())
+            elif isinstance(ws, JoueurIA):
+                ws.arreter()
+        self.salles_supprimees[raison] += 1
+        gestionnaire_parties.supprimer_salle(salle.id)
+
+    def purger_orphelins(self):
+        """
+        Retire les entrées d'index qui désignent une salle disparue.
+        """
+        salles = gestionnaire_parties.salles
+        orphelins = [pid for pid, id_salle in gestionnaire_parties.joueur_vers_salle.items()
+                     if id_salle not in salles]
+        for pid in orphelins:
+            del gestionnaire_parties.joueur_vers_salle[pid]
+        seaux = [id_salle for id_salle in limiteur.seaux if id_salle not in salles]
+        for id_salle in seaux:
+            limiteur.oublier_salle(id_salle)
+        suivies = [id_salle for id_salle in tribunes.par_salle if id_salle not in salles]
+        for id_salle in suivies:
+            tribunes.fermer_salle(id_salle)
+        self.orphelins_purges += len(orphelins) + len(seaux) + len(suivies)
+
+    def statistiques(self, echantillon=100) -> dict:
+        """
+        Nombre de salles et taille approximative moyenne d'une salle, mesurée sur un échantillon.
+        """
+        salles = gestionnaire_parties.salles
+        mesurees = [taille_approximative(salle) for salle in list(salles.values())[:echantillon]]
+        par_salle = sum(mesurees) // len(mesurees) if mesurees else 0
+        return {
+            "salles": len(salles),
+            "joueurs": len(gestionnaire_parties.joueur_vers_salle),
+            "octets_par_salle": par_salle,
+            "octets_salles_estimes": par_salle * len(salles),
+            "salles_mesurees": len(mesurees),
+            "memoire_processus": memoire_processus(),
+            "balayages": self.balayages,
+            "duree_dernier_balayage_ms": round(self.duree_dernier_balayage * 1000, 3),
+            "salles_supprimees": dict(self.salles_supprimees),
+            "pings_envoyes": self.pings_envoyes,
+            "connexions_muettes": self.connexions_muettes,
+            "orphelins_purges": self.orphelins_purges,
+        }
+
+# Balayeur du processus (démarré par le cycle de vie de l'application)
+balayeur = Balayeur()
@@ -0,0 +1,197 @@
+# *******************************************************
+# Nom ......... : cartes_chaleur.py
+# Rôle ........ : Cartes de chaleur des tirs et des placements, agrégées en continu
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Chaque tir valide (résultat de traiter_attaque) et chaque flotte confirmée
+#                 alimentent des compteurs par case, un jeu de tableaux NumPy de taille fixe
+#                 (taille x taille) par taille de grille : tirs, touches (taux de réussite),
+#                 premiers tirs de chaque joueur et cases occupées par un navire.
+#                 Comme pour le journal des parties (même thread de lots, lots.py), les
+#                 gestionnaires ne font qu'encoder l'événement (5 octets) et le déposer dans
+#                 une file, en O(1) et sans verrou ; le thread regroupe les événements par
+#                 taille de grille et les additionne aux compteurs par lots (np.bincount).
+#                 Seul ce thread lit et modifie les tableaux : après chaque lot, il encode la
+#                 réponse HTTP des tailles modifiées et la publie en remplaçant une référence ;
+#                 la boucle d'événements ne fait que resservir la dernière réponse publiée.
+#                 Les grilles de plus de CARTES_TAILLE_MAX cases de côté ne sont pas suivies.
+#
+#                 Événement : indice de case x * taille + y (uint32), drapeaux (uint8) :
+#                   TOUCHE, PREMIER (premier tir reçu par ce plateau), NAVIRE (case d'une
+#                   flotte confirmée), FLOTTE (première case de cette flotte)
+#
+# Technologies  : Python, NumPy, threading
+# Dépendances . : struct, time, numpy, app.config, app.codec, app.lots
+# Usage ....... : cartes_chaleur.noter_tir(plateau, x, y, touche) ; cartes_chaleur.noter_flotte(plateau)
+#                 cartes_chaleur.reponse(10)
+# *******************************************************
+
+import struct
+import time
+
+import numpy as np
+
+from .config import CARTES_TAILLE_MAX, INTERVALLE_CARTES
+from .codec import encoder
+from .lots import TravailleurLots
+
+TOUCHE = 1
+PREMIER = 2
+NAVIRE = 4
+FLOTTE = 8
+
+EVENEMENT = struct.Struct("<IB")
+EVENEMENT_NP = np.dtype([("indice", "<u4"), ("drapeaux", "u1")])
+
+class CarteCases:
+    """
+    Compteurs par case pour une taille de grille (tableaux à plat, case x * taille + y).
+    """
+
+    __slots__ = ("taille", "tirs", "touches", "premiers", "navires", "flottes")
+
+    def __init__(self, taille: int):
+        self.taille = taille
+        self.tirs = np.zeros(taille * taille, dtype=np.int64)
+        self.touches = np.zeros(taille * taille, dtype=np.int64)
+        self.premiers = np.zeros(taille * taille, dtype=np.int64)
+        self.navires = np.zeros(taille * taille, dtype=np.int64)
+        self.flottes = 0
+
+    def additionner(self, evenements: np.ndarray):
+        """
+        Ajoute un lot d'événements de cette taille de grille aux compteurs.
+        """
+        cases = self.taille * self.taille
+        indices = evenements["indice"]
+        drapeaux = evenements["drapeaux"]
+        navire = (drapeaux & NAVIRE) != 0
+        self.tirs += np.bincount(indices[~navire], minlength=cases)
+        self.touches += np.bincount(indices[(drapeaux & TOUCHE) != 0], minlength=cases)
+        self.premiers += np.bincount(indices[(drapeaux & PREMIER) != 0], minlength=cases)
+        self.navires += np.bincount(indices[navire], minlength=cases)
+        self.flottes += int(np.count_nonzero(drapeaux & FLOTTE))
+
+    def resume(self) -> dict:
+        """
+        Cartes de la taille de grille, en listes de lignes comme les grilles du jeu
+        (appelée par le thread d'agrégation, seul à lire les tableaux).
+        """
+        forme = (self.taille, self.taille)
+        tirs, touches = self.tirs, self.touches
+        taux = np.divide(touches, tirs, out=np.zeros(tirs.shape), where=tirs > 0)
+        return {
+            "taille_grille": self.taille,
+            "tirs": int(tirs.sum()),
+            "touches": int(touches.sum()),
+            "premiers_tirs": int(self.premiers.sum()),
+            "flottes": self.flottes,
+            "cartes": {
+                "tirs": tirs.reshape(forme).tolist(),
+                "taux_touche": np.round(taux, 4).reshape(forme).tolist(),
+                "premiers_tirs": self.premiers.reshape(forme).tolist(),
+                "navires": self.navires.reshape(forme).tolist(),
+            },
+        }
+
+class CartesChaleur(TravailleurLots):
+    """
+    Cartes de toutes les tailles de grille. noter_tir() et noter_flotte() sont appelées depuis
+    la boucle d'événements et ne font que déposer ; le thread additionne par lots et publie
+    les réponses encodées.
+    """
+
+    def __init__(self, taille_max: int = CARTES_TAILLE_MAX, intervalle: float = INTERVALLE_CARTES):
+        super().__init__(intervalle, "cartes-chaleur")
+        self.taille_max = taille_max
+        self.cartes = {}        # taille -> CarteCases (thread d'agrégation seulement)
+        # Publiés par le thread en remplaçant la référence, jamais modifiés en place
+        self.reponses = {}      # taille -> réponse encodée
+        self.totaux = {}        # taille -> {"tirs": ..., "flottes": ...}
+        # Compteurs exposés par /statistiques/cartes et /metrics
+        self.deposes = 0
+        self.ignores = 0
+        self.reponses_construites = 0
+        self.duree_construction = 0.0
+        self.reponses_servies = 0
+
+    def _deposer(self, taille: int, evenements: bytes):
+        self.deposer(taille, evenements)
+        self.deposes += 1
+
+    def noter_tir(self, plateau, x: int, y: int, touche: bool):
+        """
+        Tir valide qui vient d'être joué sur `plateau` (manqué si `touche` est faux).
+        """
+        taille = plateau.taille
+        if taille > self.taille_max:
+            self.ignores += 1
+            return
+        drapeaux = (TOUCHE if touche else 0) | (PREMIER if plateau.un_seul_tir() else 0)
+        self._deposer(taille, EVENEMENT.pack(x * taille + y, drapeaux))
+
+    def noter_flotte(self, plateau):
+        """
+        Flotte confirmée d'un joueur : un événement par case de navire (une flotte = un dépôt).
+        """
+        taille = plateau.taille
+        if taille > self.taille_max or not plateau.case_vers_navire:
+            self.ignores += 1
+            return
+        drapeaux = NAVIRE | FLOTTE
+        evenements = bytearray()
+        for indice in plateau.case_vers_navire:
+            evenements += EVENEMENT.pack(indice, drapeaux)
+            drapeaux = NAVIRE
+        self._deposer(taille, bytes(evenements))
+
+    def _traiter(self, par_taille):
+        """
+        Thread d'agrégation : additionne le lot taille par taille, puis encode et publie
+        la réponse de chaque taille modifiée.
+        """
+        if not par_taille:
+            return
+        reponses, totaux = dict(self.reponses), dict(self.totaux)
+        for taille, evenements in par_taille.items():
+            carte = self.cartes.get(taille)
+            if carte is None:
+                carte = self.cartes[taille] = CarteCases(taille)
+            carte.additionner(np.frombuffer(evenements, dtype=EVENEMENT_NP))
+            debut = time.perf_counter()
+            resume = carte.resume()
+            reponses[taille] = encoder(resume)
+            self.duree_construction += time.perf_counter() - debut
+            self.reponses_construites += 1
+            totaux[taille] = {"tirs": resume["tirs"], "flottes": resume["flottes"]}
+        self.reponses, self.totaux = reponses, totaux
+        self.lots += 1
+
+    def reponse(self, taille: int):
+        """
+        Dernières cartes publiées d'une taille de grille, encodées en JSON ;
+        None si aucune partie n'y a été jouée.
+        """
+        reponse = self.reponses.get(taille)
+        if reponse is not None:
+            self.reponses_servies += 1
+        return reponse
+
+    def statistiques(self) -> dict:
+        return {
+            "tailles": dict(sorted(self.totaux.items())),
+            "deposes": self.deposes,
+            "agreges": self.recus,
+            "en_file": self.deposes - self.recus,
+            "ignores": self.ignores,
+            "lots": self.lots,
+            "erreurs": self.erreurs,
+            "reponses_construites": self.reponses_construites,
+            "construction_ms": round(self.duree_construction / self.reponses_construites * 1000, 3)
+                               if self.reponses_construites else 0.0,
+            "reponses_servies": self.reponses_servies,
+        }
+
+# Cartes partagées par le serveur
+cartes_chaleur = CartesChaleur()
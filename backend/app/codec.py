@@ -0,0 +1,104 @@
+# *******************************************************
+# Nom ......... : codec.py
+# Rôle ........ : Décodage, validation et encodage rapides des messages WebSocket
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Choisit le backend JSON le plus rapide disponible (orjson si installé,
+#                 sinon json de la bibliothèque standard) et valide les actions via des
+#                 validateurs Pydantic précompilés : un TypeAdapter sur l'union
+#                 discriminée des modèles à champs, et des instances partagées pour les
+#                 actions sans champ (aucune construction de modèle par message).
+#
+# Technologies  : Python, Pydantic
+# Dépendances . : json, typing, pydantic, orjson (optionnel), app.config
+# Usage ....... : payload = validateur.valider(decoder(texte))
+# *******************************************************
+
+import json
+from typing import Annotated, Dict, Union
+
+from pydantic import Field, TypeAdapter
+
+from .config import BACKEND_JSON
+
+# ---- Backends JSON interchangeables ----
+
+def _backend_json_standard():
+    """
+    Backend de la bibliothèque standard (même format que WebSocket.send_json).
+    """
+    def encoder(message) -> str:
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+    return "json", json.loads, encoder
+
+def _backend_orjson():
+    """
+    Backend orjson : décodage et encodage natifs, plusieurs fois plus rapides.
+    """
+    import orjson
+
+    def encoder(message) -> str:
+        return orjson.dumps(message).decode()
+    return "orjson", orjson.loads, encoder
+
+BACKENDS_JSON = {
+    "json": _backend_json_standard,
+    "orjson": _backend_orjson,
+}
+
+def charger_backend_json(nom: str = BACKEND_JSON):
+    """
+    Renvoie (nom, decoder, encoder) pour le backend demandé ; "auto" essaie orjson
+    puis se replie sur json si le paquet n'est pas installé.
+    """
+    if nom == "auto":
+        try:
+            return _backend_orjson()
+        except ImportError:
+            return _backend_json_standard()
+    return BACKENDS_JSON[nom]()
+
+NOM_BACKEND_JSON, decoder, encoder = charger_backend_json()
+
+# ---- Validation précompilée des actions ----
+
+class ActionInconnue(Exception):
+    """
+    Levée quand le champ "action" ne correspond à aucun modèle connu.
+    """
+
+class ValidateurActions:
+    """
+    Valide un message décodé selon le modèle associé à son action.
+    Les actions sans autre champ que "action" renvoient une instance partagée,
+    les autres passent par un unique TypeAdapter discriminé sur "action".
+    """
+
+    def __init__(self, modeles: Dict[str, type]):
+        self.instances_simples = {}
+        modeles_a_champs = []
+        for action, modele in modeles.items():
+            if set(modele.model_fields) == {"action"}:
+                self.instances_simples[action] = modele.model_construct(action=action)
+            elif modele not in modeles_a_champs:
+                modeles_a_champs.append(modele)
+        self.actions_a_champs = {a for a, m in modeles.items() if m in modeles_a_champs}
+        self.adaptateur = None
+        if len(modeles_a_champs) == 1:
+            self.adaptateur = TypeAdapter(modeles_a_champs[0])
+        elif modeles_a_champs:
+            union = Union[tuple(modeles_a_champs)]
+            self.adaptateur = TypeAdapter(Annotated[union, Field(discriminator="action")])
+
+    def valider(self, donnees: dict):
+        """
+        Retourne le payload validé ; lève ActionInconnue ou pydantic.ValidationError.
+        """
+        action = donnees.get("action")
+        instance = self.instances_simples.get(action)
+        if instance is not None:
+            return instance
+        if action not in self.actions_a_champs:
+            raise ActionInconnue(action)
+        return self.adaptateur.validate_python(donnees)
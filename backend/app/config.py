@@ -20,7 +20,7 @@ HÔTE = os.environ.get("BATTLESHIP_HOST", "0.0.0.0")
 PORT = int(os.environ.get("BATTLESHIP_PORT", 8000))
 
 # === Paramètres du jeu ===
-TAILLE_GRILLE = 10  # Taille de la grille (par défaut 10x10)
+TAILLE_GRILLE = 10  # Taille de la grille par défaut (10x10, celle de l'interface web)
 
 # Liste des navires disponibles avec leur taille
 NAVIRES = [
@@ -31,6 +31,25 @@ NAVIRES = [
     {"nom": "Torpilleur", "taille": 2},
 ]
 
+# Flottes proposées à la création d'une salle (?flotte=...) ; "classique" par défaut.
+# Une flotte peut aussi être donnée par ses tailles : ?flotte=5,4,3
+FLOTTE_PAR_DEFAUT = "classique"
+FLOTTES = {
+    "classique": NAVIRES,
+    # 20 escadres classiques (340 cases) : pour les grandes grilles, à partir de 42x42
+    "mega": [{"nom": f"{n['nom']} {i + 1}", "taille": n["taille"]} for i in range(20) for n in NAVIRES],
+}
+
+# Limites d'une salle configurée (?taille=...&flotte=...)
+TAILLE_GRILLE_MIN = 5
+TAILLE_GRILLE_MAX = int(os.environ.get("BATTLESHIP_MAX_BOARD", 1000))
+NAVIRES_MAX = int(os.environ.get("BATTLESHIP_MAX_SHIPS", 500))
+DENSITE_FLOTTE_MAX = 0.2  # Part maximale des cases occupées par des navires
+# Secondes de calcul (dans un thread) accordées à un placement automatique avant erreur_placement
+DELAI_PLACEMENT_AUTO = float(os.environ.get("BATTLESHIP_PLACEMENT_TIMEOUT", 1.0))
+# Au-delà, l'instantané d'une grille ne liste que ses cases non vides
+TAILLE_GRILLE_COMPLETE_MAX = 32
+
 # Couleurs attribuées à chaque type de navire (utilisées côté interface ou logs)
 COULEURS_NAVIRES = {
     "Porte-avions": "vert",
@@ -40,5 +59,87 @@ COULEURS_NAVIRES = {
     "Torpilleur": "marron",
 }
 
-# === Clé secrète pour la sécurité des sessions WebSocket ===
-CLÉ_SECRÈTE = os.environ.get("BATTLESHIP_SECRET", "clé-dev-À-CHANGER")
\ No newline at end of file
+# === Anti-spam : seaux à jetons par joueur et par action ===
+# Multiplicateur des intervalles ci-dessous (0 = anti-spam désactivé, pour les tests de charge)
+FACTEUR_ANTI_SPAM = float(os.environ.get("BATTLESHIP_SPAM_FACTOR", 1))
+# Intervalle minimal (secondes) entre deux actions identiques d'un même joueur
+INTERVALLES_ANTI_SPAM = {
+    action: intervalle * FACTEUR_ANTI_SPAM
+    for action, intervalle in {
+        "attaque": 0.4,
+        "placer_navire": 0.4,
+        "confirmation_placement": 0.7,
+        "rejouer": 1.2,
+        "demande_placement_auto": 0.4,
+        "reinitialisation_placement": 0.7,
+        "joueur_pret": 0.8,
+    }.items()
+}
+RAFALE_ANTI_SPAM = int(os.environ.get("BATTLESHIP_SPAM_BURST", 1))  # Actions acceptées d'affilée
+# Limite globale de messages par adresse IP (0 = désactivée)
+LIMITE_MESSAGES_PAR_IP = float(os.environ.get("BATTLESHIP_IP_RATE", 50))  # messages / seconde
+RAFALE_IP = int(os.environ.get("BATTLESHIP_IP_BURST", 100))
+
+# === Appariement des joueurs ===
+# Identifiant de salle réservé : /ws/game/auto rejoint la file d'appariement
+ID_SALLE_APPARIEMENT = os.environ.get("BATTLESHIP_MATCHMAKING_ROOM", "auto")
+# "fifo" : les joueurs sans salle sont appariés par ordre d'arrivée, uniquement entre eux ;
+# "" : ils complètent n'importe quelle salle incomplète (comportement historique)
+MODE_APPARIEMENT = os.environ.get("BATTLESHIP_MATCHMAKING", "fifo")
+
+# === Sérialisation JSON : "auto" (orjson si installé), "orjson" ou "json" ===
+BACKEND_JSON = os.environ.get("BATTLESHIP_JSON_BACKEND", "auto")
+
+# === Envoi WebSocket : file bornée par connexion ===
+TAILLE_FILE_ENVOI = int(os.environ.get("BATTLESHIP_SEND_QUEUE", 64))  # Messages en attente max par client
+# Politique en cas de file pleine : "abandon", "fusion" ou "deconnexion"
+POLITIQUE_DEBORDEMENT = os.environ.get("BATTLESHIP_OVERFLOW_POLICY", "abandon")
+
+# === Adversaire IA : difficulté par défaut ("facile", "moyen", "difficile") et rythme ===
+DIFFICULTE_IA = os.environ.get("BATTLESHIP_AI_LEVEL", "moyen")
+BUDGET_COUP_IA = float(os.environ.get("BATTLESHIP_AI_BUDGET", 0.05))  # Secondes de calcul max par tir
+DELAI_COUP_IA = float(os.environ.get("BATTLESHIP_AI_DELAY", 0.6))     # Pause « humaine » avant chaque action
+TAILLE_MAX_IA = int(os.environ.get("BATTLESHIP_AI_MAX_BOARD", 100))    # Cartes de densité denses : grilles bornées
+
+# === Journalisation : niveau, format ("texte" ou "json") et échantillonnage ===
+NIVEAU_JOURNAL = os.environ.get("BATTLESHIP_LOG_LEVEL", "INFO").upper()
+FORMAT_JOURNAL = os.environ.get("BATTLESHIP_LOG_FORMAT", "texte")
+# Événements très fréquents (messages reçus) : un seul journalisé sur N
+ECHANTILLONNAGE_JOURNAL = int(os.environ.get("BATTLESHIP_LOG_SAMPLE", 100))
+
+# === Journal des parties : un fichier binaire par salle, écrit par lots hors de la boucle ===
+DOSSIER_JOURNAUX = os.environ.get("BATTLESHIP_JOURNAL_DIR", "")  # Ex. "journaux" ; "" = désactivé (pas de purge)
+INTERVALLE_JOURNAUX = float(os.environ.get("BATTLESHIP_JOURNAL_FLUSH", 0.2))  # Secondes entre deux lots
+
+# === Rediffusions : export compact de chaque partie terminée (voir rediffusions.py et archive.py) ===
+DOSSIER_REDIFFUSIONS = os.environ.get("BATTLESHIP_REPLAY_DIR", "rediffusions")  # Archive ; "" = mémoire seule
+REDIFFUSIONS_EN_MEMOIRE = int(os.environ.get("BATTLESHIP_REPLAY_CACHE", 10000))  # Dernières parties gardées
+INTERVALLE_IMAGES_CLES = int(os.environ.get("BATTLESHIP_REPLAY_KEYFRAME", 32))   # Coups entre deux images clés
+
+# === Cartes de chaleur : compteurs par case de tous les tirs et placements (voir cartes_chaleur.py) ===
+CARTES_TAILLE_MAX = int(os.environ.get("BATTLESHIP_HEATMAP_MAX_BOARD", 100))  # Cartes denses : grilles bornées (0 = désactivé)
+INTERVALLE_CARTES = float(os.environ.get("BATTLESHIP_HEATMAP_FLUSH", 0.5))    # Secondes entre deux lots (et réponses publiées)
+
+# === Reprise de session : secondes pendant lesquelles la place d'un joueur coupé est gardée (0 = aucune) ===
+DELAI_REPRISE = float(os.environ.get("BATTLESHIP_RESUME_GRACE", 30))
+
+# === Nettoyage (voir balayeur.py) : salles abandonnées et battement de cœur des connexions ===
+INTERVALLE_BALAYAGE = float(os.environ.get("BATTLESHIP_SWEEP_INTERVAL", 5))       # Secondes entre deux passages (0 = désactivé)
+DELAI_SALLE_VIDE = float(os.environ.get("BATTLESHIP_EMPTY_ROOM_TTL", 60))         # Salle sans joueur connecté
+DELAI_INACTIVITE_SALLE = float(os.environ.get("BATTLESHIP_ROOM_IDLE", 1800))      # Salle sans aucune action
+INTERVALLE_PING = float(os.environ.get("BATTLESHIP_PING_INTERVAL", 20))           # Silence avant un ping
+DELAI_PONG = float(os.environ.get("BATTLESHIP_PING_TIMEOUT", 10))                 # Attente de réponse au ping
+
+# === Spectateurs : connexions en lecture seule par salle (voir spectateurs.py) ===
+SPECTATEURS_MAX = int(os.environ.get("BATTLESHIP_MAX_SPECTATORS", 10000))  # Par salle
+
+# === Grappe de workers : partition de ce processus et backend d'état partagé (voir grappe.py) ===
+NB_PARTITIONS = int(os.environ.get("BATTLESHIP_SHARDS", 1))  # 1 = un seul processus, rien n'est relayé
+PARTITION = int(os.environ.get("BATTLESHIP_SHARD", 0))
+# "memoire" (un seul processus), "unix:///tmp/bataille.sock" (courtier.py) ou "redis://hôte:port"
+BACKEND_ETAT = os.environ.get("BATTLESHIP_STATE_BACKEND", "memoire")
+
+# === Clé secrète des jetons de reprise ; vide = clé aléatoire propre au processus (grappe.py en tire
+# une commune à tous ses workers). Plusieurs processus lancés autrement doivent partager la même clé.
+CLÉ_SECRÈTE = os.environ.get("BATTLESHIP_SECRET", "")
+DUREE_JETON_REPRISE = int(os.environ.get("BATTLESHIP_RESUME_TOKEN_TTL", 12 * 3600))  # Secondes de validité
@@ -0,0 +1,238 @@
+# *******************************************************
+# Nom ......... : connexion.py
+# Rôle ........ : File d'envoi bornée et tâche d'écriture dédiée par WebSocket
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Chaque connexion possède sa propre file de messages sortants et
+#                 une tâche qui les écrit sur la socket. Les gestionnaires ne font
+#                 plus que déposer des messages : un client lent ne bloque plus la
+#                 salle. En cas de débordement, la politique configurée s'applique
+#                 (abandon des mises à jour de grille, fusion ou déconnexion), et
+#                 des compteurs exposent la profondeur de file et les pertes.
+#                 La mise à jour de grille la plus récente n'est jamais jetée : seules
+#                 des mises à jour plus anciennes le sont (le client redemande alors la
+#                 grille), sinon le client trop lent est déconnecté.
+#                 Une connexion ayant négocié le sous-protocole binaire reçoit des
+#                 trames binaires (bytes) au lieu de trames texte.
+#                 L'instant du dernier message reçu sert au battement de cœur (balayeur.py).
+#
+# Technologies  : Python, asyncio
+# Dépendances . : asyncio, time, collections, app.config, app.codec, app.protocole_binaire
+# Usage ....... : connexion = Connexion(websocket); connexion.demarrer()
+# *******************************************************
+
+import asyncio
+import time
+from collections import deque
+
+from .config import TAILLE_FILE_ENVOI, POLITIQUE_DEBORDEMENT
+from .codec import encoder
+from .protocole_binaire import encoder_binaire
+
+# Politiques de débordement disponibles
+ABANDON = "abandon"          # jette la plus ancienne mise à jour de grille en attente
+FUSION = "fusion"            # remplace la mise à jour de même nature en attente par la nouvelle
+DECONNEXION = "deconnexion"  # ferme la connexion du client trop lent
+
+# Messages remplaçables, une clé par nature : un instantané ne remplace qu'un instantané
+# plus ancien (sans perte), un delta qu'un delta plus ancien ; le protocole versionné
+# (version_base) fait alors détecter l'écart au client, qui redemande la grille complète.
+CLES_FUSION = {
+    "mise_a_jour_grille": "instantane",
+    "delta_grille": "delta",
+}
+
+# Délai maximal accordé à la fermeture d'une socket bloquée
+DELAI_FERMETURE = 1.0
+
+# Compteurs cumulés pour toutes les connexions du processus
+STATISTIQUES_ENVOI = {
+    "envoyes": 0,
+    "octets": 0,
+    "abandonnes": 0,
+    "fusionnes": 0,
+    "deconnexions_lentes": 0,
+}
+
+class Connexion:
+    """
+    Enveloppe une WebSocket avec une file d'envoi bornée et une tâche d'écriture.
+    Expose send_json/send_text comme une WebSocket : les appels ne font qu'empiler.
+    """
+
+    def __init__(self, websocket, taille_file=TAILLE_FILE_ENVOI, politique=POLITIQUE_DEBORDEMENT, binaire=False):
+        self.websocket = websocket
+        self.binaire = binaire     # True si le client a négocié le sous-protocole binaire
+        self.taille_file = taille_file
+        self.politique = politique
+        self.file = deque()        # éléments [cle_fusion, trame (str ou bytes)]
+        self.en_attente = {}       # cle_fusion -> élément encore dans la file
+        self.signal = asyncio.Event()
+        self.tache = None
+        self.tache_fermeture = None  # Fermeture décidée pendant un dépôt (client trop lent)
+        self.fermee = False
+        self.derniere_reception = time.monotonic()
+        self.ping_en_attente = False
+        # Compteurs propres à la connexion
+        self.envoyes = 0
+        self.octets = 0
+        self.abandonnes = 0
+        self.fusionnes = 0
+        self.profondeur_max = 0
+
+    @property
+    def profondeur(self) -> int:
+        """
+        Nombre de messages en attente d'écriture.
+        """
+        return len(self.file)
+
+    def noter_reception(self):
+        """
+        Le client a envoyé un message : il est vivant (tout message vaut réponse à un ping).
+        """
+        self.derniere_reception = time.monotonic()
+        self.ping_en_attente = False
+
+    def demarrer(self):
+        """
+        Lance la tâche d'écriture de la connexion.
+        """
+        if self.tache is None:
+            self.tache = asyncio.create_task(self._ecrire())
+
+    def deposer(self, texte, cle=None) -> bool:
+        """
+        Dépose une trame déjà sérialisée (texte ou binaire) dans la file d'envoi (sans attendre).
+        Retourne False si le message a été perdu (débordement ou connexion fermée).
+        """
+        if self.fermee:
+            return False
+        if cle is not None and self.politique == FUSION and cle in self.en_attente:
+            # La nouvelle mise à jour remplace l'ancienne, à la même place dans la file
+            self.en_attente[cle][1] = texte
+            self.fusionnes += 1
+            STATISTIQUES_ENVOI["fusionnes"] += 1
+            return True
+        if len(self.file) >= self.taille_file and not self._liberer_place(cle):
+            return False
+        element = [cle, texte]
+        self.file.append(element)
+        if cle is not None:
+            self.en_attente[cle] = element
+        if len(self.file) > self.profondeur_max:
+            self.profondeur_max = len(self.file)
+        self.signal.set()
+        return True
+
+    def _liberer_place(self, cle_nouveau) -> bool:
+        """
+        Applique la politique de débordement quand la file est pleine.
+        Retourne True si une place a été libérée pour le nouveau message : seule une mise à
+        jour de grille déjà suivie d'une plus récente (en file ou le nouveau message) est jetée.
+        """
+        if self.politique != DECONNEXION:
+            jetables = [element for element in self.file if element[0] is not None]
+            if cle_nouveau is None:
+                jetables = jetables[:-1]  # La mise à jour de grille la plus récente reste en file
+            if jetables:
+                self.file.remove(jetables[0])
+                self.en_attente.pop(jetables[0][0], None)
+                self.abandonnes += 1
+                STATISTIQUES_ENVOI["abandonnes"] += 1
+                return True
+        # Rien de jetable (ou politique stricte) : le client est trop lent, on le déconnecte
+        STATISTIQUES_ENVOI["deconnexions_lentes"] += 1
+        self.fermee = True
+        self.tache_fermeture = asyncio.ensure_future(self.fermer(code=1013))
+        return False
+
+    async def send_text(self, texte: str):
+        """
+        Compatibilité WebSocket : empile une trame texte.
+        """
+        self.deposer(texte)
+
+    async def send_bytes(self, donnees: bytes):
+        """
+        Compatibilité WebSocket : empile une trame binaire.
+        """
+        self.deposer(donnees)
+
+    def encoder(self, message: dict):
+        """
+        Sérialise un message dans le format négocié par le client.
+        """
+        return encoder_binaire(message) if self.binaire else encoder(message)
+
+    async def send_json(self, message: dict):
+        """
+        Compatibilité WebSocket : sérialise (JSON ou binaire) puis empile un message.
+        Les mises à jour de grille sont marquées comme remplaçables.
+        """
+        self.deposer(self.encoder(message), CLES_FUSION.get(message.get("action")))
+
+    async def _ecrire(self):
+        """
+        Tâche d'écriture : vide la file dans l'ordre sur la WebSocket.
+        """
+        try:
+            while True:
+                while not self.file:
+                    if self.fermee:
+                        return
+                    self.signal.clear()
+                    await self.signal.wait()
+                cle, texte = self.file.popleft()
+                if cle is not None:
+                    self.en_attente.pop(cle, None)
+                if texte.__class__ is bytes:
+                    await self.websocket.send_bytes(texte)
+                    taille = len(texte)
+                else:
+                    await self.websocket.send_text(texte)
+                    taille = len(texte) if texte.isascii() else len(texte.encode())
+                self.envoyes += 1
+                self.octets += taille
+                STATISTIQUES_ENVOI["envoyes"] += 1
+                STATISTIQUES_ENVOI["octets"] += taille
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Socket fermée côté client : la boucle de réception s'en chargera
+            self.fermee = True
+
+    async def vider(self, delai=DELAI_FERMETURE):
+        """
+        Laisse la tâche d'écriture envoyer les messages en attente (au plus `delai` secondes).
+        """
+        if self.tache is None or self.tache.done():
+            return
+        self.fermee = True
+        self.signal.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self.tache), delai)
+        except Exception:
+            pass
+
+    async def vider_et_fermer(self, code=1000):
+        """
+        Envoie les messages en attente (au plus DELAI_FERMETURE secondes) puis ferme la WebSocket.
+        """
+        await self.vider()
+        await self.fermer(code=code)
+
+    async def fermer(self, code=1000):
+        """
+        Arrête la tâche d'écriture et ferme la WebSocket.
+        """
+        self.fermee = True
+        self.file.clear()
+        self.en_attente.clear()
+        if self.tache is not None and not self.tache.done():
+            self.tache.cancel()
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), DELAI_FERMETURE)
+        except Exception:
+            pass
@@ -0,0 +1,130 @@
+# *******************************************************
+# Nom ......... : courtier.py
+# Rôle ........ : Courtier local compatible Redis (sous-ensemble) pour une grappe sur un hôte
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Remplace un serveur Redis quand tous les workers tournent sur la même
+#                 machine : écoute sur une socket Unix (ou en TCP) et comprend les
+#                 commandes RESP utilisées par BackendCourtier (PING, PUBLISH, SUBSCRIBE,
+#                 UNSUBSCRIBE, RPUSH, LPOP, DEL). Un client abonné ne reçoit plus que
+#                 des messages, comme avec Redis. Tout l'état reste en mémoire.
+#
+# Technologies  : Python, asyncio
+# Dépendances . : argparse, asyncio, collections, os, app.etat_partage
+# Usage ....... : cd backend && python -m app.courtier --socket /tmp/bataille.sock
+# *******************************************************
+
+import argparse
+import asyncio
+import os
+from collections import deque
+
+from .etat_partage import lire_reponse, encoder_commande
+
+def _entier(n: int) -> bytes:
+    return b":%d\r\n" % n
+
+def _chaine(valeur) -> bytes:
+    return b"$-1\r\n" if valeur is None else b"$%d\r\n%s\r\n" % (len(valeur), valeur)
+
+class Courtier:
+    """
+    État du courtier : abonnés par canal et files (listes) par clé.
+    """
+
+    def __init__(self):
+        self.abonnes = {}  # canal -> set d'écrivains
+        self.files = {}    # clé -> deque de valeurs
+
+    async def servir_client(self, lecteur, ecrivain):
+        canaux = set()
+        try:
+            while True:
+                commande = await lire_reponse(lecteur)
+                if not isinstance(commande, list) or not commande:
+                    ecrivain.write(b"-ERR commande invalide\r\n")
+                    continue
+                nom, arguments = commande[0].upper(), commande[1:]
+                ecrivain.write(self.executer(nom, arguments, ecrivain, canaux))
+                await ecrivain.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for canal in canaux:
+                self._retirer_abonne(canal, ecrivain)
+            ecrivain.close()
+
+    def executer(self, nom, arguments, ecrivain, canaux) -> bytes:
+        if nom == b"PING":
+            return b"+PONG\r\n"
+        if nom == b"PUBLISH" and len(arguments) == 2:
+            canal, donnees = arguments
+            abonnes = self.abonnes.get(canal, ())
+            message = encoder_commande(b"message", canal, donnees)
+            for abonne in abonnes:
+                abonne.write(message)
+            return _entier(len(abonnes))
+        if nom == b"SUBSCRIBE" and arguments:
+            reponse = b""
+            for canal in arguments:
+                self.abonnes.setdefault(canal, set()).add(ecrivain)
+                canaux.add(canal)
+                reponse += b"*3\r\n" + _chaine(b"subscribe") + _chaine(canal) + _entier(len(canaux))
+            return reponse
+        if nom == b"UNSUBSCRIBE":
+            reponse = b""
+            for canal in arguments or list(canaux):
+                canaux.discard(canal)
+                self._retirer_abonne(canal, ecrivain)
+                reponse += b"*3\r\n" + _chaine(b"unsubscribe") + _chaine(canal) + _entier(len(canaux))
+            return reponse
+        if nom == b"RPUSH" and len(arguments) >= 2:
+            file = self.files.setdefault(arguments[0], deque())
+            file.extend(arguments[1:])
+            return _entier(len(file))
+        if nom == b"LPOP" and len(arguments) == 1:
+            file = self.files.get(arguments[0])
+            if not file:
+                return _chaine(None)
+            valeur = file.popleft()
+            if not file:
+                del self.files[arguments[0]]
+            return _chaine(valeur)
+        if nom == b"DEL":
+            return _entier(sum(self.files.pop(cle, None) is not None for cle in arguments))
+        return b"-ERR commande non supportee\r\n"
+
+    def _retirer_abonne(self, canal, ecrivain):
+        abonnes = self.abonnes.get(canal)
+        if abonnes is not None:
+            abonnes.discard(ecrivain)
+            if not abonnes:
+                del self.abonnes[canal]
+
+async def servir(chemin_socket=None, hote="127.0.0.1", port=None):
+    """
+    Démarre le courtier sur une socket Unix (ou en TCP si `port` est donné) et sert indéfiniment.
+    """
+    courtier = Courtier()
+    if port is not None:
+        serveur = await asyncio.start_server(courtier.servir_client, hote, port)
+    else:
+        if os.path.exists(chemin_socket):
+            os.unlink(chemin_socket)
+        serveur = await asyncio.start_unix_server(courtier.servir_client, chemin_socket)
+    async with serveur:
+        await serveur.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Courtier local (sous-ensemble de Redis) pour la grappe")
+    parser.add_argument("--socket", default="/tmp/bataille.sock", help="Chemin de la socket Unix")
+    parser.add_argument("--port", type=int, default=None, help="Écoute en TCP sur ce port au lieu de la socket")
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.socket, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# *******************************************************
+# Nom ......... : diffusion.py
+# Rôle ........ : Diffusion des événements d'une salle à tous ses joueurs
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Sérialise chaque événement une seule fois, envoie la trame à
+#                 toutes les websockets de la salle en parallèle (un client lent
+#                 ne bloque plus les autres) et permet de regrouper les événements
+#                 d'une même action dans une seule trame "lot". Chaque message est
+#                 sérialisé au plus une fois par format (JSON ou binaire) utilisé
+#                 dans la salle.
+#
+# Technologies  : Python, asyncio
+# Dépendances . : asyncio, app.codec, app.protocole_binaire
+# Usage ....... : await diffuser(salle, message_commun, lambda pid, idx: {...})
+# *******************************************************
+
+import asyncio
+
+from .codec import encoder
+from .protocole_binaire import encoder_binaire, encoder_lot_binaire
+
+def encoder_lot(textes) -> str:
+    """
+    Regroupe des messages déjà sérialisés dans une trame unique {"action": "lot", "messages": [...]}.
+    """
+    if len(textes) == 1:
+        return textes[0]
+    return '{"action":"lot","messages":[' + ",".join(textes) + "]}"
+
+# Fonctions (encoder, encoder_lot) de chaque format, indexées par Connexion.binaire
+FORMATS = {
+    False: (encoder, encoder_lot),
+    True: (encoder_binaire, encoder_lot_binaire),
+}
+
+async def _envoyer_texte(ws, texte):
+    """
+    Envoie une trame (texte ou binaire) ; une websocket fermée ne doit pas interrompre
+    la diffusion, sa déconnexion est traitée par sa propre boucle de réception.
+    """
+    try:
+        if texte.__class__ is bytes:
+            await ws.send_bytes(texte)
+        else:
+            await ws.send_text(texte)
+    except Exception:
+        pass
+
+async def diffuser(salle, *messages):
+    """
+    Envoie un ou plusieurs événements à tous les joueurs connectés de la salle.
+    Chaque message est soit un dict commun (sérialisé une seule fois par format utilisé),
+    soit une fonction (id_joueur, index_joueur) -> dict pour un contenu personnalisé.
+    Plusieurs messages partent dans une seule trame "lot", envoyée en parallèle à chaque joueur.
+    """
+    if not messages:
+        return
+    destinataires = [(pid, ws) for pid, ws in salle.ws.items() if ws is not None]
+    personnalise = any(callable(m) for m in messages)
+    trames_communes = {}  # format -> trame (messages tous communs) ou liste de textes communs
+    envois = []
+    for pid, ws in destinataires:
+        binaire = getattr(ws, "binaire", False)
+        encoder_message, encoder_lot_format = FORMATS[binaire]
+        communs = trames_communes.get(binaire)
+        if communs is None:
+            communs = [None if callable(m) else encoder_message(m) for m in messages]
+            if not personnalise:
+                communs = encoder_lot_format(communs)
+            trames_communes[binaire] = communs
+        if not personnalise:
+            envois.append(_envoyer_texte(ws, communs))
+            continue
+        idx = salle.joueurs.get(pid)
+        textes = [t if t is not None else encoder_message(m(pid, idx)) for t, m in zip(communs, messages)]
+        envois.append(_envoyer_texte(ws, encoder_lot_format(textes)))
+    await asyncio.gather(*envois)
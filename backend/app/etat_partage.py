@@ -0,0 +1,307 @@
+# *******************************************************
+# Nom ......... : etat_partage.py
+# Rôle ........ : Backends interchangeables d'état partagé et de messagerie entre processus
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Interface minimale dont ont besoin les processus d'une grappe :
+#                 publication/abonnement sur des canaux (routage des trames vers la
+#                 partition propriétaire d'une salle) et files partagées (appariement).
+#                 - BackendMemoire : tout dans le processus courant (défaut, un seul worker) ;
+#                 - BackendCourtier : client RESP (protocole Redis) vers courtier.py sur
+#                   une socket Unix, ou vers un vrai serveur Redis en TCP.
+#                 Le client n'utilise que PUBLISH, SUBSCRIBE, UNSUBSCRIBE, RPUSH et LPOP.
+#                 Si le courtier tombe, la connexion des abonnements est rouverte avec une
+#                 attente croissante et tous les canaux sont réabonnés ; celle des commandes
+#                 est rouverte à la commande suivante.
+#
+# Technologies  : Python, asyncio
+# Dépendances . : asyncio, collections, logging, typing, urllib.parse, app.config, app.journalisation
+# Usage ....... : backend = creer_backend("unix:///tmp/bataille.sock"); await backend.publier("canal", b"...")
+# *******************************************************
+
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from .config import BACKEND_ETAT
+from .journalisation import journaliser
+
+# Attente (secondes) avant de rouvrir la connexion des abonnements, doublée à chaque échec
+ATTENTE_RECONNEXION_MIN = 0.1
+ATTENTE_RECONNEXION_MAX = 5.0
+
+Rappel = Callable[[bytes], None]
+
+class ErreurCourtier(Exception):
+    """
+    Réponse d'erreur (-ERR ...) du courtier ou connexion perdue.
+    """
+
+class BackendEtat:
+    """
+    Interface commune des backends. Les rappels d'abonnement sont appelés depuis la
+    boucle d'événements, un message à la fois : ils ne doivent pas bloquer.
+    """
+
+    async def publier(self, canal: str, donnees: bytes):
+        raise NotImplementedError
+
+    async def abonner(self, canal: str, rappel: Rappel):
+        raise NotImplementedError
+
+    async def desabonner(self, canal: str):
+        raise NotImplementedError
+
+    async def pousser(self, cle: str, valeur: str):
+        """
+        Ajoute une valeur en fin de file partagée.
+        """
+        raise NotImplementedError
+
+    async def retirer(self, cle: str) -> Optional[str]:
+        """
+        Retire (atomiquement) la valeur en tête de file partagée, ou None si elle est vide.
+        """
+        raise NotImplementedError
+
+    async def fermer(self):
+        pass
+
+class BackendMemoire(BackendEtat):
+    """
+    Backend d'un seul processus : canaux et files sont de simples dicts.
+    """
+
+    def __init__(self):
+        self.abonnements: Dict[str, Rappel] = {}
+        self.files: Dict[str, deque] = {}
+
+    async def publier(self, canal, donnees):
+        rappel = self.abonnements.get(canal)
+        if rappel is not None:
+            asyncio.get_running_loop().call_soon(rappel, donnees)
+
+    async def abonner(self, canal, rappel):
+        self.abonnements[canal] = rappel
+
+    async def desabonner(self, canal):
+        self.abonnements.pop(canal, None)
+
+    async def pousser(self, cle, valeur):
+        self.files.setdefault(cle, deque()).append(valeur)
+
+    async def retirer(self, cle):
+        file = self.files.get(cle)
+        if not file:
+            return None
+        valeur = file.popleft()
+        if not file:
+            del self.files[cle]
+        return valeur
+
+# ---- Protocole RESP (sous-ensemble de Redis), partagé avec courtier.py ----
+
+def encoder_commande(*arguments) -> bytes:
+    """
+    Encode une commande : tableau de chaînes binaires.
+    """
+    morceaux = [b"*%d\r\n" % len(arguments)]
+    for argument in arguments:
+        if isinstance(argument, str):
+            argument = argument.encode("utf-8")
+        morceaux.append(b"$%d\r\n%s\r\n" % (len(argument), argument))
+    return b"".join(morceaux)
+
+async def lire_reponse(lecteur: asyncio.StreamReader):
+    """
+    Lit une valeur RESP complète : bytes, int, None, liste, ou ErreurCourtier pour "-".
+    """
+    ligne = await lecteur.readline()
+    if not ligne:
+        raise ConnectionError("Connexion au courtier fermée")
+    genre, contenu = ligne[:1], ligne[1:-2]
+    if genre == b"+":
+        return contenu
+    if genre == b"-":
+        return ErreurCourtier(contenu.decode("utf-8", "replace"))
+    if genre == b":":
+        return int(contenu)
+    if genre == b"$":
+        taille = int(contenu)
+        if taille < 0:
+            return None
+        return (await lecteur.readexactly(taille + 2))[:-2]
+    if genre == b"*":
+        nombre = int(contenu)
+        if nombre < 0:
+            return None
+        return [await lire_reponse(lecteur) for _ in range(nombre)]
+    raise ConnectionError(f"Réponse RESP invalide : {ligne[:20]!r}")
+
+async def ouvrir_connexion(adresse):
+    """
+    Ouvre une connexion vers un chemin de socket Unix (str) ou un couple (hôte, port).
+    """
+    if isinstance(adresse, str):
+        return await asyncio.open_unix_connection(adresse)
+    return await asyncio.open_connection(*adresse)
+
+class BackendCourtier(BackendEtat):
+    """
+    Client RESP : une connexion pour les commandes (réponses dans l'ordre d'envoi)
+    et une connexion dédiée aux abonnements, lue par une tâche. Les publications
+    n'attendent pas leur réponse (l'ordre des trames suffit au routage), seulement
+    que le tampon d'écriture se vide.
+    """
+
+    def __init__(self, adresse):
+        self.adresse = adresse
+        self.commandes = None     # (lecteur, écrivain)
+        self.en_attente = deque()  # futurs des réponses attendues, dans l'ordre (None : ignorée)
+        self.lecture_commandes = None
+        self.abonnes = None
+        self.lecture_abonnes = None
+        self.abonnements: Dict[str, Rappel] = {}
+        self.confirmations: Dict[str, asyncio.Future] = {}  # canal -> futur du SUBSCRIBE en cours
+        self.verrou = asyncio.Lock()  # Une seule ouverture de connexion à la fois
+        self.reconnexions = 0
+
+    async def _connecter(self):
+        if self.commandes is not None:
+            return
+        async with self.verrou:
+            if self.commandes is None:
+                self.commandes = await ouvrir_connexion(self.adresse)
+                self.lecture_commandes = asyncio.create_task(self._lire_commandes())
+
+    def _envoyer(self, *arguments, reponse=True) -> Optional[asyncio.Future]:
+        futur = asyncio.get_running_loop().create_future() if reponse else None
+        self.en_attente.append(futur)
+        self.commandes[1].write(encoder_commande(*arguments))
+        return futur
+
+    async def _executer(self, *arguments):
+        await self._connecter()
+        reponse = await self._envoyer(*arguments)
+        if isinstance(reponse, ErreurCourtier):
+            raise reponse
+        return reponse
+
+    async def _lire_commandes(self):
+        lecteur = self.commandes[0]
+        try:
+            while True:
+                reponse = await lire_reponse(lecteur)
+                futur = self.en_attente.popleft()
+                if futur is not None and not futur.done():
+                    futur.set_result(reponse)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            while self.en_attente:
+                futur = self.en_attente.popleft()
+                if futur is not None and not futur.done():
+                    futur.set_exception(ErreurCourtier(str(e)))
+            self.commandes[1].close()
+            self.commandes = None
+
+    async def _lire_abonnements(self):
+        """
+        Lit les messages des canaux abonnés ; si la connexion tombe, la rouvre avec une
+        attente croissante et réabonne tous les canaux de self.abonnements.
+        """
+        while True:
+            try:
+                await self._distribuer(self.abonnes[0])
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                self.abonnes[1].close()
+                self.abonnes = None
+                journaliser(logging.WARNING, "courtier_deconnecte", erreur=str(e))
+            attente = ATTENTE_RECONNEXION_MIN
+            while self.abonnes is None:
+                await asyncio.sleep(attente)
+                try:
+                    abonnes = await ouvrir_connexion(self.adresse)
+                except OSError:
+                    attente = min(attente * 2, ATTENTE_RECONNEXION_MAX)
+                    continue
+                # Les SUBSCRIBE en attente de confirmation sont confirmés par ce réabonnement
+                for canal in self.abonnements:
+                    abonnes[1].write(encoder_commande("SUBSCRIBE", canal))
+                self.abonnes = abonnes
+                self.reconnexions += 1
+                journaliser(logging.INFO, "courtier_reconnecte", canaux=len(self.abonnements))
+
+    async def _distribuer(self, lecteur):
+        while True:
+            message = await lire_reponse(lecteur)
+            if not (isinstance(message, list) and len(message) == 3):
+                continue
+            genre, canal = message[0], message[1].decode("utf-8")
+            if genre == b"message":
+                rappel = self.abonnements.get(canal)
+                if rappel is not None:
+                    rappel(message[2])
+            elif genre == b"subscribe":
+                futur = self.confirmations.pop(canal, None)
+                if futur is not None and not futur.done():
+                    futur.set_result(None)
+
+    async def publier(self, canal, donnees):
+        await self._connecter()
+        ecrivain = self.commandes[1]
+        self._envoyer("PUBLISH", canal, donnees, reponse=False)
+        await ecrivain.drain()
+
+    async def abonner(self, canal, rappel):
+        async with self.verrou:
+            if self.lecture_abonnes is None:
+                self.abonnes = await ouvrir_connexion(self.adresse)
+                self.lecture_abonnes = asyncio.create_task(self._lire_abonnements())
+        self.abonnements[canal] = rappel
+        # Attend la confirmation : aucune publication sur ce canal ne peut plus être perdue
+        futur = self.confirmations[canal] = asyncio.get_running_loop().create_future()
+        if self.abonnes is not None:  # Sinon la reconnexion en cours abonnera ce canal
+            self.abonnes[1].write(encoder_commande("SUBSCRIBE", canal))
+        await futur
+
+    async def desabonner(self, canal):
+        if self.abonnements.pop(canal, None) is not None and self.abonnes is not None:
+            self.abonnes[1].write(encoder_commande("UNSUBSCRIBE", canal))
+
+    async def pousser(self, cle, valeur):
+        await self._executer("RPUSH", cle, valeur)
+
+    async def retirer(self, cle):
+        valeur = await self._executer("LPOP", cle)
+        return valeur.decode("utf-8") if valeur is not None else None
+
+    async def fermer(self):
+        for tache in (self.lecture_commandes, self.lecture_abonnes):
+            if tache is not None:
+                tache.cancel()
+        for connexion in (self.commandes, self.abonnes):
+            if connexion is not None:
+                connexion[1].close()
+        self.commandes = self.abonnes = None
+        self.lecture_commandes = self.lecture_abonnes = None
+
+def adresse_backend(url: str):
+    """
+    "unix:///chemin.sock" -> chemin ; "redis://hôte:port" -> (hôte, port).
+    """
+    morceaux = urlparse(url)
+    if morceaux.scheme == "unix":
+        return morceaux.path
+    return morceaux.hostname or "127.0.0.1", morceaux.port or 6379
+
+def creer_backend(url: str = BACKEND_ETAT) -> BackendEtat:
+    """
+    Instancie le backend décrit par son URL ("memoire", "unix://..." ou "redis://...").
+    """
+    if url in ("", "memoire"):
+        return BackendMemoire()
+    if urlparse(url).scheme in ("unix", "redis"):
+        return BackendCourtier(adresse_backend(url))
+    raise ValueError(f"Backend d'état inconnu : {url}")
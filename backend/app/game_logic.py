@@ -7,37 +7,184 @@
 # Description . : Gère les grilles des joueurs, le placement manuel et automatique des navires,
 #                 la validation des positions, les attaques, la détection de fin de partie,
 #                 ainsi que le contrôle du tour et la réinitialisation de la partie.
+#                 Chaque grille est versionnée : les cases modifiées depuis le dernier
+#                 envoi sont mémorisées pour ne transmettre que des deltas. La grille
+#                 JSON n'est pas stockée : elle est déduite du plateau à l'envoi.
+#                 Taille de grille et flotte sont propres à chaque partie (jusqu'à
+#                 TAILLE_GRILLE_MAX) ; au-delà de TAILLE_GRILLE_COMPLETE_MAX,
+#                 l'instantané ne liste que les cases non vides. Les tirs de la partie
+#                 sont gardés dans l'ordre (coups) pour l'export de rediffusion.
 #
 # Technologies  : Python
-# Dépendances . : random, typing
+# Dépendances . : array, functools, random, sys, typing, app.config, app.utils, app.plateau, app.placement
 # Usage ....... : Importé par le backend FastAPI pour orchestrer la logique de jeu
 # *******************************************************
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Optional, Set
+from array import array
+from functools import lru_cache
 import random
-from .config import TAILLE_GRILLE, NAVIRES
-from .utils import grille_vide, positions_navire
+import sys
+from .config import (TAILLE_GRILLE, FLOTTES, FLOTTE_PAR_DEFAUT, TAILLE_GRILLE_MIN, TAILLE_GRILLE_MAX,
+                     NAVIRES_MAX, DENSITE_FLOTTE_MAX, TAILLE_GRILLE_COMPLETE_MAX)
+from .utils import positions_navire
+from .placement import generer_flotte, flotte_placable
+from .plateau import Plateau, MANQUE, TOUCHE, COULE, DEJA_ATTAQUE, INVALIDE
 
 # Alias pour désigner une coordonnée sur la grille
 Coordonnee = Tuple[int, int]
 
+@lru_cache(maxsize=256)
+def composer_flotte(flotte: str) -> Tuple[dict, ...]:
+    """
+    Navires d'une flotte : nom d'une flotte de FLOTTES ("classique", "mega"...) ou
+    tailles séparées par des virgules ("5,4,3" : navires "Navire 1", "Navire 2"...).
+    Le résultat est partagé par toutes les parties qui utilisent la même flotte.
+    Lève ValueError si la flotte est inconnue ou mal formée.
+    """
+    if flotte in FLOTTES:
+        return tuple(FLOTTES[flotte])
+    try:
+        tailles = [int(taille) for taille in flotte.split(",")]
+    except ValueError:
+        raise ValueError(f"Flotte inconnue : {flotte}") from None
+    if not 0 < len(tailles) <= NAVIRES_MAX or min(tailles) < 1:
+        raise ValueError(f"Flotte invalide : 1 à {NAVIRES_MAX} navires de taille 1 ou plus")
+    return tuple({"nom": f"Navire {i + 1}", "taille": taille} for i, taille in enumerate(tailles))
+
+class Navire:
+    """
+    Navire placé sur une grille : champs fixes, identifiant et nom internés
+    (partagés par toutes les salles au lieu d'une chaîne par navire).
+    """
+
+    __slots__ = ("taille", "coordonnees", "orientation", "id", "nom")
+
+    def __init__(self, taille: int, coordonnees: Coordonnee, orientation: str, id_navire: str, nom: str):
+        self.taille = taille
+        self.coordonnees = coordonnees
+        self.orientation = sys.intern(orientation)
+        self.id = sys.intern(id_navire)
+        self.nom = sys.intern(nom)
+
 class LogiqueJeu:
     """
     Classe centrale de gestion du jeu de bataille navale.
     Gère les états des joueurs, le placement des navires, les attaques, et le déroulement d'une partie.
+    La grille envoyée au frontend n'est pas stockée : chaque case est déduite du plateau.
     """
 
-    def __init__(self):
+    __slots__ = ("taille", "flotte", "composition", "plateaux", "navires", "pret", "tour_actuel",
+                 "versions_grilles", "cases_modifiees", "coups")
+
+    def __init__(self, taille: int = TAILLE_GRILLE, flotte: str = FLOTTE_PAR_DEFAUT):
         """
         Initialise les états internes pour deux joueurs :
-        - grilles, navires, statut de préparation, etc.
+        - plateaux, navires, statut de préparation, etc.
+        Lève ValueError si la taille ou la flotte demandée n'est pas jouable.
         """
-        self.grilles: List[List[List]] = [grille_vide(), grille_vide()]
-        self.navires: List[List[dict]] = [[], []]
+        composition = composer_flotte(flotte)
+        if not TAILLE_GRILLE_MIN <= taille <= TAILLE_GRILLE_MAX:
+            raise ValueError(f"Taille de grille entre {TAILLE_GRILLE_MIN} et {TAILLE_GRILLE_MAX}")
+        tailles = [n["taille"] for n in composition]
+        # Densité, puis emprise avec la marge de non-contact et existence d'une disposition
+        if sum(tailles) > DENSITE_FLOTTE_MAX * taille * taille or not flotte_placable(taille, tailles):
+            raise ValueError(f"Flotte trop grande pour une grille {taille}x{taille}")
+        self.taille = taille
+        self.flotte = sys.intern(flotte)
+        self.composition = composition  # Navires à placer : [{"nom", "taille"}, ...]
+        self.plateaux: List[Plateau] = [Plateau(taille), Plateau(taille)]  # Moteur (plateaux creux)
+        self.navires: List[List[Navire]] = [[], []]
         self.pret: List[bool] = [False, False]
-        self.navires_places: List[bool] = [False, False]
-        self.types_navires_places: List[Dict[str, bool]] = [{}, {}]
         self.tour_actuel: Optional[int] = None
+        self.versions_grilles: List[int] = [0, 0]  # Version de la grille connue du client
+        # Indices des cases changées depuis le dernier envoi (x * taille + y)
+        self.cases_modifiees: List[Set[int]] = [set(), set()]
+        # Tirs de la partie dans l'ordre, (indice de case << 1) | attaquant ; créé au premier tir
+        self.coups: Optional[array] = None
+
+    def valeur_case(self, id_joueur, x, y):
+        """
+        Contenu d'une case tel que l'affiche le frontend : '~' mer, 'O' tir manqué,
+        [id, 'S' | 'X' | 'C', nom] navire intact, touché ou coulé.
+        """
+        plateau = self.plateaux[id_joueur]
+        indice = x * plateau.taille + y
+        vise = plateau.est_vise(indice)
+        indice_navire = plateau.case_vers_navire.get(indice)
+        if indice_navire is None:
+            return 'O' if vise else '~'
+        navire = self.navires[id_joueur][indice_navire]
+        etat = 'C' if plateau.est_coule(indice_navire) else ('X' if vise else 'S')
+        return [navire.id, etat, navire.nom]
+
+    def grille(self, id_joueur):
+        """
+        Grille complète d'un joueur (liste de lignes), construite à la demande
+        (réservée aux petites grilles : voir instantane_grille).
+        """
+        plateau = self.plateaux[id_joueur]
+        taille = plateau.taille
+        grille = [['~'] * taille for _ in range(taille)]
+        for (x, y) in plateau.cases_non_vides():
+            grille[x][y] = self.valeur_case(id_joueur, x, y)
+        return grille
+
+    def _ecrire_case(self, id_joueur, x, y):
+        """
+        Marque une case pour le prochain delta (sa valeur est lue sur le plateau à l'envoi).
+        """
+        self.cases_modifiees[id_joueur].add(x * self.plateaux[id_joueur].taille + y)
+
+    def extraire_delta(self, id_joueur):
+        """
+        Renvoie (version_base, version, cases) où `cases` liste les [x, y, valeur]
+        modifiées depuis la dernière version envoyée, puis passe à la version suivante.
+        """
+        version_base = self.versions_grilles[id_joueur]
+        taille = self.plateaux[id_joueur].taille
+        cases = []
+        for indice in sorted(self.cases_modifiees[id_joueur]):
+            x, y = divmod(indice, taille)
+            cases.append([x, y, self.valeur_case(id_joueur, x, y)])
+        self.cases_modifiees[id_joueur].clear()
+        if cases:
+            self.versions_grilles[id_joueur] += 1
+        return version_base, self.versions_grilles[id_joueur], cases
+
+    def cases_non_vides(self, id_joueur):
+        """
+        Cases non vides de la grille d'un joueur, en [x, y, valeur].
+        """
+        return [[x, y, self.valeur_case(id_joueur, x, y)] for (x, y) in self.plateaux[id_joueur].cases_non_vides()]
+
+    def instantane_grille(self, id_joueur):
+        """
+        Renvoie (version, contenu) pour un envoi complet ; les changements en attente
+        y sont inclus et ne seront donc pas renvoyés en delta.
+        `contenu` vaut {"grille": lignes} jusqu'à TAILLE_GRILLE_COMPLETE_MAX, sinon
+        {"taille": n, "cases": [[x, y, valeur], ...]} (cases non vides d'une grille de mer).
+        """
+        if self.cases_modifiees[id_joueur]:
+            self.cases_modifiees[id_joueur].clear()
+            self.versions_grilles[id_joueur] += 1
+        if self.taille <= TAILLE_GRILLE_COMPLETE_MAX:
+            return self.versions_grilles[id_joueur], {"grille": self.grille(id_joueur)}
+        return self.versions_grilles[id_joueur], {"taille": self.taille, "cases": self.cases_non_vides(id_joueur)}
+
+    def vue_publique(self, id_joueur):
+        """
+        Cases déjà visées de la grille d'un joueur, telles que son adversaire les voit :
+        [x, y, 'O'] manqué, [x, y, 'X'] touché, [x, y, [id, 'C', nom]] navire coulé.
+        Les navires intacts n'y figurent pas.
+        """
+        vue = []
+        for (x, y) in self.plateaux[id_joueur].cases_visees():
+            valeur = self.valeur_case(id_joueur, x, y)
+            if isinstance(valeur, list) and valeur[1] != 'C':
+                valeur = 'X'
+            vue.append([x, y, valeur])
+        return vue
 
     def changer_tour(self):
         """
@@ -46,34 +193,12 @@ class LogiqueJeu:
         if self.tour_actuel is not None:
             self.tour_actuel = 1 - self.tour_actuel
 
-    def _positions_sont_valides(self, grille, positions):
-        """
-        Vérifie que toutes les positions données sont valides pour placer un navire :
-        - dans les limites de la grille,
-        - libres,
-        - sans contact direct avec un autre navire.
-        """
-        for xi, yi in positions:
-            if not (0 <= xi < TAILLE_GRILLE and 0 <= yi < TAILLE_GRILLE):
-                return False
-            if grille[xi][yi] != "~":
-                return False
-            # Vérifie les cases adjacentes (pas de contact navires)
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    xj, yj = xi + dx, yi + dy
-                    if 0 <= xj < TAILLE_GRILLE and 0 <= yj < TAILLE_GRILLE:
-                        case = grille[xj][yj]
-                        if case not in ("~", "O", "X"):
-                            return False
-        return True
-
-    def est_placement_valide(self, grille, taille_navire, x, y, orientation):
+    def est_placement_valide(self, id_joueur, taille_navire, x, y, orientation):
         """
-        Vérifie si un placement de navire est possible à la position (x, y) avec la taille et l’orientation données.
+        Vérifie si un placement de navire est possible à la position (x, y) avec la taille et l’orientation données
+        (dans la grille, sur des cases libres et sans contact avec un autre navire).
         """
-        positions = positions_navire(x, y, taille_navire, orientation)
-        return self._positions_sont_valides(grille, positions)
+        return self.plateaux[id_joueur].peut_placer(positions_navire(x, y, taille_navire, orientation))
 
     def placer_navire(self, id_joueur, taille_navire, coordonnees, orientation, nom_navire):
         """
@@ -82,120 +207,109 @@ class LogiqueJeu:
         """
         x, y = coordonnees
         positions = positions_navire(x, y, taille_navire, orientation)
-        if not self._positions_sont_valides(self.grilles[id_joueur], positions):
+        if not self.plateaux[id_joueur].peut_placer(positions):
             return False
-        if nom_navire in self.types_navires_places[id_joueur]:
+        navires = self.navires[id_joueur]
+        if any(navire.nom == nom_navire for navire in navires):
             return False  # Déjà placé
-        id_navire = f"navire_{len(self.navires[id_joueur])}_{nom_navire}"
+        id_navire = f"navire_{len(navires)}_{nom_navire}"
+        self.plateaux[id_joueur].placer(positions)
         for (xi, yi) in positions:
-            self.grilles[id_joueur][xi][yi] = [id_navire, 'S', nom_navire]
-        self.navires[id_joueur].append({
-            'taille': taille_navire,
-            'coordonnees': (x, y),
-            'orientation': orientation,
-            'id': id_navire,
-            'nom': nom_navire
-        })
-        self.types_navires_places[id_joueur][nom_navire] = True
+            self._ecrire_case(id_joueur, xi, yi)
+        navires.append(Navire(taille_navire, (x, y), orientation, id_navire, nom_navire))
         return True
 
     def tous_navires_places(self, id_joueur):
         """
         Vérifie si tous les navires obligatoires ont bien été placés par un joueur.
         """
-        noms_requis = [n['nom'] for n in NAVIRES]
-        return all(n in self.types_navires_places[id_joueur] for n in noms_requis)
+        noms_places = {navire.nom for navire in self.navires[id_joueur]}
+        return all(n['nom'] in noms_places for n in self.composition)
 
     def reset_etats_joueur(self, id_joueur):
         """
-        Réinitialise la grille, la liste des navires et des types placés pour un joueur donné.
+        Réinitialise la grille et la liste des navires d'un joueur donné.
         """
-        self.grilles[id_joueur] = grille_vide()
+        # Les cases vidées feront partie du prochain delta
+        plateau = self.plateaux[id_joueur]
+        self.cases_modifiees[id_joueur].update(plateau.indices_vises(), plateau.case_vers_navire)
+        self.plateaux[id_joueur] = Plateau(self.taille)
         self.navires[id_joueur] = []
-        self.types_navires_places[id_joueur] = {}
 
-    def placement_automatique(self, id_joueur):
+    def tirer_flotte(self, rng=random, delai=None):
+        """
+        Tire une flotte aléatoire (un triplet (x, y, orientation) par navire) sans toucher
+        à la partie : peut s'exécuter dans un thread. Lève PlacementImpossible après `delai` secondes.
+        """
+        return generer_flotte(self.taille, [n['taille'] for n in self.composition], rng, delai)
+
+    def placer_flotte(self, id_joueur, flotte):
         """
-        Place automatiquement tous les navires pour un joueur de manière aléatoire.
-        Soulève une exception si un navire ne peut être placé.
+        Remplace les navires d'un joueur par une flotte tirée par tirer_flotte().
         """
         self.reset_etats_joueur(id_joueur)
-        for navire in NAVIRES:
-            trouve = False
-            essais = 0
-            while not trouve and essais < 100:
-                x = random.randint(0, TAILLE_GRILLE - 1)
-                y = random.randint(0, TAILLE_GRILLE - 1)
-                orientation = random.choice(["HR", "HL", "VD", "VU"])
-                if self.placer_navire(id_joueur, navire['taille'], (x, y), orientation, navire['nom']):
-                    trouve = True
-                essais += 1
-            if not trouve:
-                raise Exception(f"Impossible de placer le navire {navire['nom']}")
-        return self.grilles[id_joueur]
-
-    def _positions_navire_sur_grille(self, grille, id_navire):
-        """
-        Renvoie la liste de toutes les coordonnées occupées par un navire spécifique sur une grille.
-        """
-        return [
-            (i, j)
-            for i in range(TAILLE_GRILLE)
-            for j in range(TAILLE_GRILLE)
-            if isinstance(grille[i][j], list) and grille[i][j][0] == id_navire
-        ]
+        for navire, (x, y, orientation) in zip(self.composition, flotte):
+            self.placer_navire(id_joueur, navire['taille'], (x, y), orientation, navire['nom'])
+        return self.navires[id_joueur]
+
+    def placement_automatique(self, id_joueur, rng=random, delai=None):
+        """
+        Place automatiquement tous les navires pour un joueur de manière aléatoire,
+        en tirant parmi les placements encore légaux (voir placement.py).
+        Lève PlacementImpossible si aucune flotte n'est trouvée (dans `delai` secondes).
+        """
+        return self.placer_flotte(id_joueur, self.tirer_flotte(rng, delai))
 
     def traiter_attaque(self, id_cible, x, y):
         """
-        Gère la logique d’une attaque :
-        - Met à jour la grille cible
+        Gère la logique d’une attaque :
+        - Met à jour le plateau et la grille cible
         - Détecte touche, coulé, gagné ou manqué
         - Retourne un dictionnaire de résultat pour l’UI/backend
+        Le tir est ajouté à `coups` (un tir hors grille y vaut l'indice taille * taille).
         """
-        if not (0 <= x < TAILLE_GRILLE and 0 <= y < TAILLE_GRILLE):
+        taille = self.taille
+        if self.coups is None:
+            self.coups = array("H" if taille * taille < 2 ** 15 else "I")
+        indice = x * taille + y if 0 <= x < taille and 0 <= y < taille else taille * taille
+        self.coups.append((indice << 1) | (1 - id_cible))
+        code, indice_navire = self.plateaux[id_cible].tirer(x, y)
+        if code == INVALIDE:
             return {"resultat": "invalide", "peut_rejouer": False}
-        cellule = self.grilles[id_cible][x][y]
-        if isinstance(cellule, list):
-            id_navire, etat, nom_navire = cellule
-            if etat == 'S':
-                self.grilles[id_cible][x][y] = [id_navire, 'X', nom_navire]
-                # Vérifie si le navire est coulé
-                positions = self._positions_navire_sur_grille(self.grilles[id_cible], id_navire)
-                navire_coule = all(self.grilles[id_cible][i][j][1] != 'S' for (i, j) in positions)
-                if navire_coule:
-                    for (i, j) in positions:
-                        self.grilles[id_cible][i][j] = [id_navire, 'C', nom_navire]
-                    nom_navire_reel = id_navire.split("_", 2)[2]
-                    taille_navire = next(n['taille'] for n in NAVIRES if n['nom'] == nom_navire_reel)
-                    tous_coules = not any(
-                        isinstance(self.grilles[id_cible][i][j], list) and self.grilles[id_cible][i][j][1] == 'S'
-                        for i in range(TAILLE_GRILLE) for j in range(TAILLE_GRILLE)
-                    )
-                    resultat = "gagne" if tous_coules else "coule"
-                    return {
-                        "resultat": resultat,
-                        "peut_rejouer": (resultat == "coule"),
-                        "taille_navire": taille_navire,
-                        "nom_navire": nom_navire_reel,
-                        "positions_coule": positions,
-                        "partie_finie": (resultat == "gagne"),
-                        "coordonnees": (x, y)
-                    }
-                else:
-                    return {"resultat": "touche", "peut_rejouer": True, "coordonnees": (x, y)}
-            else:
-                return {"resultat": "deja_attaque", "peut_rejouer": False, "coordonnees": (x, y)}
-        elif cellule == '~':
-            self.grilles[id_cible][x][y] = 'O'
-            return {"resultat": "manque", "peut_rejouer": False, "coordonnees": (x, y)}
-        else:
+        if code == DEJA_ATTAQUE:
             return {"resultat": "deja_attaque", "peut_rejouer": False, "coordonnees": (x, y)}
+        if code == MANQUE:
+            self._ecrire_case(id_cible, x, y)
+            return {"resultat": "manque", "peut_rejouer": False, "coordonnees": (x, y)}
+        navire = self.navires[id_cible][indice_navire]
+        if code == TOUCHE:
+            self._ecrire_case(id_cible, x, y)
+            return {"resultat": "touche", "peut_rejouer": True, "coordonnees": (x, y)}
+        # Navire coulé : seules ses propres cases sont mises à jour
+        positions = self.plateaux[id_cible].cases[indice_navire]
+        for (i, j) in positions:
+            self._ecrire_case(id_cible, i, j)
+        resultat = "coule" if code == COULE else "gagne"
+        return {
+            "resultat": resultat,
+            "peut_rejouer": (resultat == "coule"),
+            "taille_navire": navire.taille,
+            "nom_navire": navire.nom,
+            "positions_coule": list(positions),
+            "partie_finie": (resultat == "gagne"),
+            "coordonnees": (x, y)
+        }
 
     def reinitialiser_partie(self):
         """
         Réinitialise l’état complet du jeu pour les deux joueurs (début d’une nouvelle partie).
+        La taille de grille et la flotte sont conservées.
         """
         for id_joueur in [0, 1]:
             self.reset_etats_joueur(id_joueur)
         self.pret = [False, False]
-        self.tour_actuel = None
\ No newline at end of file
+        self.tour_actuel = None
+        # Le client repart lui aussi d'une grille vide en version 0
+        self.versions_grilles = [0, 0]
+        self.cases_modifiees = [set(), set()]
+        self.coups = None
\ No newline at end of file
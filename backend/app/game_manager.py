@@ -6,30 +6,52 @@
 # Licence ..... : Réalisé dans le cadre du cours de Réseaux
 # Description . : Contient les classes permettant de créer et suivre les salles de jeu,
 #                 d’y ajouter ou retirer les joueurs, de gérer leurs statuts (prêt, websocket),
-#                 et de réinitialiser les parties si besoin.
+#                 et de réinitialiser les parties si besoin. Les salles incomplètes sont
+#                 indexées (ordre d'attente) pour apparier un joueur en O(1).
+#                 Une salle créée avec un identifiant peut choisir sa taille de grille
+#                 et sa flotte ; l'appariement n'ouvre que des salles par défaut.
+#                 Une salle d'appariement quittée par un joueur repart d'une partie neuve
+#                 avant de reprendre place dans la file.
 #
 # Technologies  : Python
-# Dépendances . : uuid, typing
+# Dépendances . : time, uuid, typing, collections, app.acteur, app.config, app.limiteur,
+#                 app.journal_parties, app.spectateurs
 # Usage ....... : Importé par le backend pour gérer dynamiquement les parties multijoueurs
 # *******************************************************
 
+import time
 import uuid
+from collections import OrderedDict
 from typing import Dict, Optional
+from .config import MODE_APPARIEMENT, TAILLE_GRILLE, FLOTTE_PAR_DEFAUT
 from .game_logic import LogiqueJeu
+from .acteur import ActeurSalle
+from .limiteur import limiteur
+from .journal_parties import journal_parties, FERMETURE, REDEMARRAGE
+from .spectateurs import tribunes
 
 class SalleDeJeu:
     """
     Représente une salle de jeu avec sa logique de jeu et ses joueurs.
     Gère les connexions, les statuts de préparation et la communication par websocket.
+    Attributs fixes (__slots__) : une salle ne porte aucun dictionnaire d'attributs.
     """
 
-    def __init__(self):
+    __slots__ = ("id", "logique", "joueurs", "ws", "pret", "rejouer_pret", "acteur",
+                 "appariement", "spectateurs", "sieges_reserves", "derniere_activite")
+
+    def __init__(self, taille=TAILLE_GRILLE, flotte=FLOTTE_PAR_DEFAUT, spectateurs=True):
         self.id = str(uuid.uuid4())
-        self.logique = LogiqueJeu()  # Logique de jeu spécifique à cette salle
+        self.logique = LogiqueJeu(taille, flotte)  # Logique de jeu spécifique à cette salle
         self.joueurs = {}  # player_id -> index (0 ou 1)
         self.ws = {}       # player_id -> websocket (ou None)
         self.pret = {}     # player_id -> bool (prêt à jouer)
         self.rejouer_pret = {}  # player_id -> bool (prêt pour rejouer)
+        self.acteur = ActeurSalle()  # Exécute les actions de la salle une par une
+        self.appariement = False  # True si la salle a été créée par la file d'appariement
+        self.spectateurs = spectateurs  # False : la salle refuse les spectateurs (?spectateurs=0)
+        self.sieges_reserves = {}  # player_id -> tâche qui libère la place d'un joueur coupé
+        self.derniere_activite = time.monotonic()  # Dernière arrivée ou action (voir balayeur.py)
 
     def ajouter_joueur(self, id_joueur, ws=None):
         """
@@ -42,6 +64,7 @@ class SalleDeJeu:
         self.joueurs[id_joueur] = idx
         self.ws[id_joueur] = ws
         self.pret[id_joueur] = False
+        self.derniere_activite = time.monotonic()
         return idx
 
     def retirer_joueur(self, id_joueur):
@@ -54,6 +77,7 @@ class SalleDeJeu:
             del self.joueurs[id_joueur]
             if id_joueur in self.ws: del self.ws[id_joueur]
             if id_joueur in self.pret: del self.pret[id_joueur]
+            self.rejouer_pret.pop(id_joueur, None)
             return idx
         return None
 
@@ -80,11 +104,12 @@ class SalleDeJeu:
 
     def reinitialiser(self):
         """
-        Réinitialise la logique de jeu et remet tous les statuts à "non prêt".
+        Réinitialise la logique de jeu (même grille, même flotte) et remet tous les statuts à "non prêt".
         """
-        self.logique = LogiqueJeu()
+        self.logique = LogiqueJeu(self.logique.taille, self.logique.flotte)
         for pid in self.pret:
             self.pret[pid] = False
+        self.rejouer_pret = {}
 
 class GestionnaireParties:
     """
@@ -92,39 +117,101 @@ class GestionnaireParties:
     Permet de créer, rejoindre, quitter et retrouver une salle.
     """
 
-    def __init__(self):
+    def __init__(self, mode_appariement: str = MODE_APPARIEMENT):
         self.salles: Dict[str, SalleDeJeu] = {}  # id_salle -> SalleDeJeu
         self.joueur_vers_salle: Dict[str, str] = {}  # id_joueur -> id_salle
+        self.mode_appariement = mode_appariement
+        # Index des salles incomplètes, dans l'ordre où elles se sont mises en attente
+        self.salles_en_attente: "OrderedDict[str, None]" = OrderedDict()
+        # Sous-ensemble créé par l'appariement FIFO (salles avec un joueur qui attend)
+        self.file_appariement: "OrderedDict[str, None]" = OrderedDict()
 
-    def creer_salle(self, id_salle: Optional[str] = None) -> SalleDeJeu:
+    def _indexer(self, salle: SalleDeJeu):
+        """
+        Met à jour les index d'attente après un changement de joueurs dans une salle.
+        Une salle qui repasse en attente prend place en fin de file.
         """
-        Crée une nouvelle salle (avec identifiant optionnel).
+        if salle.id not in self.salles or len(salle.joueurs) >= 2:
+            self.salles_en_attente.pop(salle.id, None)
+            self.file_appariement.pop(salle.id, None)
+            return
+        if salle.id not in self.salles_en_attente:
+            self.salles_en_attente[salle.id] = None
+        if salle.appariement and salle.joueurs and salle.id not in self.file_appariement:
+            self.file_appariement[salle.id] = None
+
+    def creer_salle(self, id_salle: Optional[str] = None, taille: int = TAILLE_GRILLE,
+                    flotte: str = FLOTTE_PAR_DEFAUT, spectateurs: bool = True) -> SalleDeJeu:
         """
-        salle = SalleDeJeu()
+        Crée une nouvelle salle (avec identifiant, taille de grille, flotte et accueil
+        des spectateurs optionnels).
+        Lève ValueError si la taille ou la flotte n'est pas jouable.
+        """
+        salle = SalleDeJeu(taille, flotte, spectateurs)
         if id_salle:
             salle.id = id_salle
         self.salles[salle.id] = salle
+        self._indexer(salle)
+        journal_parties.noter_ouverture(salle.id)
+        if (taille, flotte) != (TAILLE_GRILLE, FLOTTE_PAR_DEFAUT):
+            journal_parties.noter_configuration(salle.id, taille, flotte)
         return salle
 
-    def rejoindre_salle(self, id_joueur, ws=None, id_salle: Optional[str]=None) -> SalleDeJeu:
+    def supprimer_salle(self, id_salle: str):
+        """
+        Supprime une salle, la retire des index d'attente, arrête son acteur,
+        libère ses seaux anti-spam, ferme ses spectateurs et clôt son journal.
+        Ses joueurs éventuels (salle fermée par le balayeur) sont détachés.
+        """
+        salle = self.salles.pop(id_salle, None)
+        limiteur.oublier_salle(id_salle)
+        tribunes.fermer_salle(id_salle)
+        self.salles_en_attente.pop(id_salle, None)
+        self.file_appariement.pop(id_salle, None)
+        if salle:
+            for tache in salle.sieges_reserves.values():
+                tache.cancel()
+            for id_joueur in salle.joueurs:
+                if self.joueur_vers_salle.get(id_joueur) == id_salle:
+                    del self.joueur_vers_salle[id_joueur]
+            salle.acteur.arreter()
+            journal_parties.noter(id_salle, FERMETURE)
+
+    def _salle_sans_identifiant(self) -> SalleDeJeu:
+        """
+        Choisit la salle d'un joueur arrivé sans identifiant de salle, en O(1) :
+        - mode "fifo" : le plus ancien joueur en attente de l'appariement, sinon une nouvelle salle ;
+        - sinon : la plus ancienne salle incomplète, quelle qu'elle soit.
+        """
+        file = self.file_appariement if self.mode_appariement == "fifo" else self.salles_en_attente
+        if file:
+            return self.salles[next(iter(file))]
+        salle = self.creer_salle()
+        salle.appariement = True
+        return salle
+
+    def rejoindre_salle(self, id_joueur, ws=None, id_salle: Optional[str]=None,
+                        taille: int = TAILLE_GRILLE, flotte: str = FLOTTE_PAR_DEFAUT,
+                        spectateurs: bool = True) -> SalleDeJeu:
         """
         Permet à un joueur de rejoindre une salle existante (ou en crée une nouvelle si besoin).
+        `taille`, `flotte` et `spectateurs` ne servent qu'à la création d'une salle nommée ; sans identifiant,
+        le joueur est apparié via l'index des salles en attente.
         Retourne la salle rejointe.
-        Lève une Exception si la salle est pleine.
+        Lève une Exception si la salle est pleine (ValueError si la configuration est refusée).
         """
         if id_salle:
             if id_salle in self.salles:
                 salle = self.salles[id_salle]
             else:
-                salle = self.creer_salle(id_salle)
+                salle = self.creer_salle(id_salle, taille, flotte, spectateurs)
         else:
-            salle = next((r for r in self.salles.values() if len(r.joueurs) < 2), None)
-            if not salle:
-                salle = self.creer_salle()
+            salle = self._salle_sans_identifiant()
         idx = salle.ajouter_joueur(id_joueur, ws)
         if idx is False:
             raise Exception("Salle pleine")
         self.joueur_vers_salle[id_joueur] = salle.id
+        self._indexer(salle)
         return salle
 
     def quitter_salle(self, id_joueur):
@@ -139,9 +226,17 @@ class GestionnaireParties:
         salle = self.salles[id_salle]
         idx = salle.retirer_joueur(id_joueur)
         del self.joueur_vers_salle[id_joueur]
+        limiteur.oublier_joueur(id_salle, id_joueur)
         # Supprimer la salle si plus de joueurs
         if not salle.joueurs:
-            del self.salles[id_salle]
+            self.supprimer_salle(id_salle)
+            return idx
+        if salle.appariement:
+            # Le prochain joueur apparié doit trouver une partie neuve, pas celle abandonnée
+            salle.reinitialiser()
+            journal_parties.noter(id_salle, REDEMARRAGE)
+            tribunes.diffuser(id_salle, {"action": "restart"})
+        self._indexer(salle)
         return idx
 
     def salle_par_joueur(self, id_joueur) -> Optional[SalleDeJeu]:
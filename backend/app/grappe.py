@@ -0,0 +1,120 @@
+# *******************************************************
+# Nom ......... : grappe.py
+# Rôle ........ : Lancement de N workers uvicorn partageant un port, une partition chacun
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Ouvre la socket d'écoute une seule fois puis démarre N processus qui
+#                 l'acceptent tous (le noyau répartit les connexions entrantes). Chaque
+#                 processus reçoit sa partition (BATTLESHIP_SHARD) et le backend d'état
+#                 partagé (BATTLESHIP_STATE_BACKEND) ; relais.py route ensuite chaque
+#                 WebSocket vers le worker propriétaire de sa salle. Sans --backend,
+#                 courtier.py est démarré sur une socket Unix pour servir de backend,
+#                 et redémarré s'il s'arrête (les workers se réabonnent d'eux-mêmes).
+#                 Sans BATTLESHIP_SECRET, une clé aléatoire est tirée et donnée à tous les
+#                 workers : un jeton de reprise est vérifié par n'importe lequel.
+#                 Les statistiques et /metrics restent propres à chaque worker.
+#
+# Technologies  : Python, multiprocessing, uvicorn
+# Dépendances . : argparse, asyncio, multiprocessing, os, secrets, socket, time, uvicorn, app.courtier (fils)
+# Usage ....... : cd backend && python -m app.grappe --workers 4 --port 8000
+# *******************************************************
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import secrets
+import socket
+import time
+
+import uvicorn
+
+# Les modules de l'application ne sont importés que dans les processus fils :
+# app.config lit ses variables d'environnement une fois pour toutes, à l'import.
+
+def lancer_courtier(chemin_socket):
+    from .courtier import servir
+    asyncio.run(servir(chemin_socket))
+
+def lancer_worker(sock, partition, nb_partitions, backend):
+    """
+    Processus worker : les variables de configuration doivent précéder l'import de l'application.
+    """
+    os.environ["BATTLESHIP_SHARD"] = str(partition)
+    os.environ["BATTLESHIP_SHARDS"] = str(nb_partitions)
+    os.environ["BATTLESHIP_STATE_BACKEND"] = backend
+    serveur = uvicorn.Server(uvicorn.Config("app.main:app", log_level="warning"))
+    serveur.run(sockets=[sock])
+
+def attendre_socket(chemin, delai=5.0):
+    fin = time.monotonic() + delai
+    while not os.path.exists(chemin):
+        if time.monotonic() > fin:
+            raise RuntimeError(f"Le courtier n'a pas ouvert {chemin}")
+        time.sleep(0.05)
+
+def demarrer_courtier(contexte, chemin_socket):
+    """
+    Démarre le courtier local et attend qu'il écoute sur sa socket.
+    """
+    if os.path.exists(chemin_socket):
+        os.unlink(chemin_socket)
+    courtier = contexte.Process(target=lancer_courtier, args=(chemin_socket,), name="courtier")
+    courtier.start()
+    attendre_socket(chemin_socket)
+    return courtier
+
+def main():
+    parser = argparse.ArgumentParser(description="Grappe de workers de la bataille navale")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Nombre de processus")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--backend", default=None,
+                        help="URL du backend d'état (redis://hôte:port) ; sinon courtier local")
+    parser.add_argument("--socket-courtier", default="/tmp/bataille.sock",
+                        help="Socket Unix du courtier local")
+    args = parser.parse_args()
+
+    # Clé commune des jetons de reprise, héritée par les workers (démarrés avec cet environnement)
+    os.environ.setdefault("BATTLESHIP_SECRET", secrets.token_hex(32))
+    contexte = multiprocessing.get_context("spawn")
+    workers = []
+    courtier = None
+    backend = args.backend
+    if backend is None:
+        courtier = demarrer_courtier(contexte, args.socket_courtier)
+        backend = f"unix://{args.socket_courtier}"
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.hote, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    for partition in range(args.workers):
+        worker = contexte.Process(target=lancer_worker, name=f"worker-{partition}",
+                                  args=(sock, partition, args.workers, backend))
+        worker.start()
+        workers.append(worker)
+    print(f"{args.workers} workers sur http://{args.hote}:{args.port} (backend : {backend})")
+
+    try:
+        # Surveillance : le courtier local est relancé tant qu'un worker tourne
+        while any(worker.is_alive() for worker in workers):
+            if courtier is not None and not courtier.is_alive():
+                print(f"Courtier arrêté (code {courtier.exitcode}) : redémarrage")
+                courtier = demarrer_courtier(contexte, args.socket_courtier)
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        processus = workers + ([courtier] if courtier is not None else [])
+        for p in processus:
+            p.terminate()
+        for p in processus:
+            p.join()
+        sock.close()
+
+if __name__ == "__main__":
+    main()
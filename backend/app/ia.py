@@ -0,0 +1,363 @@
+# *******************************************************
+# Nom ......... : ia.py
+# Rôle ........ : Adversaire artificiel : carte de densité de probabilité et joueur serveur
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Le cerveau ne connaît que ce qu'un humain voit (tirs manqués, touchés,
+#                 navires coulés) et compte, pour chaque case, les placements encore
+#                 possibles des navires non coulés qui la couvrent. Le calcul est
+#                 vectorisé avec NumPy (sommes glissantes par cumul) : aucun parcours
+#                 des placements en Python. La règle de non-contact s'applique comme
+#                 dans _positions_sont_valides : les voisins d'un navire coulé et les
+#                 diagonales d'une case touchée ne peuvent pas contenir de navire.
+#                 JoueurIA rejoint une salle comme un humain : il reçoit les mêmes
+#                 messages et envoie ses actions par le même chemin de validation.
+#                 Ses cartes sont denses (taille x taille) : les salles de plus de
+#                 TAILLE_MAX_IA cases de côté n'acceptent pas de joueur IA.
+#                 Le choix d'un tir s'exécute dans un thread, borné par un budget de
+#                 temps, pour ne jamais bloquer la boucle d'événements ; un calcul abandonné
+#                 est attendu avant le suivant, et le tir de secours a son propre générateur.
+#                 Une action refusée par le serveur ("erreur", anti-spam) est renvoyée après
+#                 une attente croissante, ESSAIS_IA fois au plus.
+#
+# Technologies  : Python, NumPy, asyncio
+# Dépendances . : asyncio, time, logging, numpy, app.config, app.codec, app.acteur,
+#                 app.journalisation
+# Usage ....... : cerveau = CerveauIA(10, [5, 4, 3, 3, 2], "difficile"); x, y = cerveau.choisir()
+# *******************************************************
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from .config import (TAILLE_GRILLE, NAVIRES, INTERVALLES_ANTI_SPAM, DIFFICULTE_IA,
+                     BUDGET_COUP_IA, DELAI_COUP_IA)
+from .codec import decoder
+from .acteur import SalleFermee
+from .journalisation import journaliser
+
+# Poids multiplicatif d'un placement par case touchée qu'il recouvre (mode "cible")
+POIDS_TOUCHE = 30.0
+
+# Niveaux de difficulté : façon de choisir une case à partir de la carte de densité
+NIVEAUX_IA = {
+    "facile": "chasse",         # au hasard, puis autour des cases touchées
+    "moyen": "proportionnel",   # tirage au sort pondéré par la densité
+    "difficile": "maximum",     # case la plus probable (égalités départagées au hasard)
+}
+
+# Renvois d'une action refusée par le serveur avant d'y renoncer
+ESSAIS_IA = 5
+
+def _sommes_glissantes(valeurs, k, axe):
+    """
+    Somme de chaque fenêtre de k cases consécutives le long d'un axe (n - k + 1 fenêtres),
+    calculée par différence de sommes cumulées.
+    """
+    bordure = [(0, 0), (0, 0)]
+    bordure[axe] = (1, 0)
+    cumul = np.pad(np.cumsum(valeurs, axis=axe, dtype=np.float64), bordure)
+    fin = [slice(None), slice(None)]
+    debut = [slice(None), slice(None)]
+    fin[axe] = slice(k, None)
+    debut[axe] = slice(None, -k)
+    return cumul[tuple(fin)] - cumul[tuple(debut)]
+
+def _couverture(poids, k, axe):
+    """
+    Convolution par une fenêtre de k cases : pour chaque case, somme des poids
+    des placements (débutant dans l'une des k - 1 cases précédentes ou sur elle) qui la couvrent.
+    """
+    bordure = [(0, 0), (0, 0)]
+    bordure[axe] = (k - 1, k - 1)
+    return _sommes_glissantes(np.pad(poids, bordure), k, axe)
+
+def dilater(masque):
+    """
+    Masque étendu à ses 8 voisins (zone de non-contact).
+    """
+    n, m = masque.shape
+    etendu = np.pad(masque, 1)
+    resultat = np.zeros_like(masque)
+    for dx in (0, 1, 2):
+        for dy in (0, 1, 2):
+            resultat |= etendu[dx:dx + n, dy:dy + m]
+    return resultat
+
+def diagonales(masque):
+    """
+    Cases en diagonale d'une case du masque.
+    """
+    n, m = masque.shape
+    etendu = np.pad(masque, 1)
+    resultat = np.zeros_like(masque)
+    for dx, dy in ((0, 0), (0, 2), (2, 0), (2, 2)):
+        resultat |= etendu[dx:dx + n, dy:dy + m]
+    return resultat
+
+def carte_densite(bloquees, touchees, tailles_restantes, poids_touche=POIDS_TOUCHE):
+    """
+    Densité de chaque case : somme, sur les placements légaux des navires restants,
+    du poids du placement (poids_touche ** nombre de touchés non coulés recouverts).
+    `bloquees` : cases qui ne peuvent pas contenir de navire ; `touchees` : touchés non coulés.
+    """
+    densite = np.zeros(bloquees.shape, dtype=np.float64)
+    bloquees = bloquees.astype(np.float64)
+    touchees = touchees.astype(np.float64)
+    for k in sorted(set(tailles_restantes)):
+        multiplicite = tailles_restantes.count(k)
+        for axe in ((1,) if k == 1 else (0, 1)):
+            if k > bloquees.shape[axe]:
+                continue
+            libres = _sommes_glissantes(bloquees, k, axe) == 0
+            poids = np.where(libres, np.power(poids_touche, _sommes_glissantes(touchees, k, axe)), 0.0)
+            densite += multiplicite * _couverture(poids, k, axe)
+    return densite
+
+class CerveauIA:
+    """
+    Connaissance d'un tireur sur la grille adverse et choix du prochain tir.
+    """
+
+    def __init__(self, taille=TAILLE_GRILLE, tailles_navires=None, difficulte=DIFFICULTE_IA, graine=None):
+        if difficulte not in NIVEAUX_IA:
+            raise ValueError(f"Difficulté inconnue : {difficulte}")
+        self.taille = taille
+        self.tailles_navires = list(tailles_navires or [n["taille"] for n in NAVIRES])
+        self.difficulte = difficulte
+        self.rng = np.random.default_rng(graine)
+        # Tir de secours sur la boucle pendant qu'un calcul abandonné utilise encore self.rng
+        self.rng_secours = np.random.default_rng(None if graine is None else graine + 1)
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        """
+        Oublie la partie précédente.
+        """
+        forme = (self.taille, self.taille)
+        self.tirees = np.zeros(forme, dtype=bool)
+        self.touchees = np.zeros(forme, dtype=bool)   # touchés dont le navire n'est pas coulé
+        self.bloquees = np.zeros(forme, dtype=bool)   # cases exclues pour tout navire restant
+        self.tailles_restantes = list(self.tailles_navires)
+
+    def noter_resultat(self, x, y, resultat, positions_coule=None):
+        """
+        Met à jour la connaissance après le résultat d'un tir.
+        """
+        self.tirees[x, y] = True
+        if resultat == "manque":
+            self.bloquees[x, y] = True
+        elif resultat == "touche":
+            self.touchees[x, y] = True
+            point = np.zeros_like(self.touchees)
+            point[x, y] = True
+            self.bloquees |= diagonales(point)
+        elif resultat in ("coule", "gagne") and positions_coule:
+            navire = np.zeros_like(self.touchees)
+            for i, j in positions_coule:
+                navire[i, j] = True
+            self.tirees |= navire
+            self.touchees &= ~navire
+            self.bloquees |= dilater(navire)
+            if len(positions_coule) in self.tailles_restantes:
+                self.tailles_restantes.remove(len(positions_coule))
+
+    def densite(self):
+        """
+        Carte de densité courante (nulle sur les cases déjà tirées).
+        """
+        carte = carte_densite(self.bloquees, self.touchees, self.tailles_restantes)
+        carte[self.tirees] = 0.0
+        return carte
+
+    def tir_secours(self, rng=None):
+        """
+        Choix instantané (budget dépassé ou carte vide) : voisin d'un touché, sinon case au hasard.
+        """
+        if rng is None:
+            rng = self.rng
+        candidats = dilater(self.touchees) & ~self.tirees & ~self.bloquees
+        if not candidats.any():
+            candidats = ~self.tirees
+        cases = np.argwhere(candidats)
+        x, y = cases[rng.integers(len(cases))]
+        return int(x), int(y)
+
+    def choisir(self):
+        """
+        Prochain tir (x, y) selon la difficulté.
+        """
+        mode = NIVEAUX_IA[self.difficulte]
+        if mode == "chasse":
+            return self.tir_secours()
+        carte = self.densite()
+        total = carte.sum()
+        if total <= 0:
+            return self.tir_secours()
+        if mode == "proportionnel":
+            indice = self.rng.choice(carte.size, p=(carte / total).ravel())
+        else:
+            maximums = np.flatnonzero(carte == carte.max())
+            indice = maximums[self.rng.integers(len(maximums))]
+        x, y = divmod(int(indice), self.taille)
+        return x, y
+
+class JoueurIA:
+    """
+    Joueur serveur : occupe une place dans la salle, reçoit les messages comme une
+    WebSocket (send_json/send_text) et répond par les actions d'un client humain.
+    `envoyer(joueur, donnees)` valide et exécute une action ; `quitter(joueur)` le retire de la salle.
+    """
+
+    binaire = False
+
+    def __init__(self, id_joueur, envoyer, quitter, difficulte=DIFFICULTE_IA,
+                 budget=BUDGET_COUP_IA, delai=DELAI_COUP_IA, graine=None):
+        self.id_joueur = id_joueur
+        self.envoyer = envoyer
+        self.quitter = quitter
+        self.difficulte = difficulte
+        self.budget = budget
+        self.delai = delai
+        self.graine = graine
+        self.cerveau = None  # Créé par demarrer() à la taille de grille et à la flotte de la salle
+        self.boite = asyncio.Queue()
+        self.tache = None
+        self.salle = None
+        self.index = None
+        self.derniers_envois = {}   # action -> instant du dernier envoi (respect de l'anti-spam)
+        self.pret_envoye = False
+        self.placement_confirme = False
+        self.rejouer_envoye = False
+        self.dernier_tir = None
+        self.calcul = None          # Choix de tir en cours dans un thread
+        self.derniere_action = None  # (action, champs) à renvoyer si le serveur la refuse
+        self.essais = 0
+
+    # -- Interface WebSocket utilisée par le serveur --
+
+    async def send_json(self, message):
+        self.boite.put_nowait(message)
+
+    async def send_text(self, texte):
+        self.boite.put_nowait(decoder(texte))
+
+    async def send_bytes(self, donnees):
+        pass  # Le joueur IA n'annonce pas le sous-protocole binaire
+
+    # -- Cycle de vie --
+
+    def demarrer(self, salle, index):
+        self.salle = salle
+        self.index = index
+        logique = salle.logique
+        self.cerveau = CerveauIA(logique.taille, [n["taille"] for n in logique.composition],
+                                 self.difficulte, self.graine)
+        self.tache = asyncio.create_task(self._boucle())
+
+    def arreter(self):
+        self.boite.put_nowait(None)
+
+    async def _agir(self, action, relance=False, **champs):
+        """
+        Envoie une action après un délai de réflexion, sans jamais dépasser l'anti-spam du serveur.
+        """
+        if not relance:
+            self.derniere_action = (action, champs)
+            self.essais = 0
+        attente = self.delai
+        intervalle = INTERVALLES_ANTI_SPAM.get(action)
+        if intervalle and action in self.derniers_envois:
+            attente = max(attente, self.derniers_envois[action] + intervalle - time.monotonic() + 0.01)
+        if attente > 0:
+            await asyncio.sleep(attente)
+        self.derniers_envois[action] = time.monotonic()
+        await self.envoyer(self, {"action": action, **champs})
+
+    async def _relancer(self):
+        """
+        Renvoie la dernière action refusée par le serveur, après une attente qui double à chaque essai.
+        """
+        if self.derniere_action is None or self.essais >= ESSAIS_IA:
+            return
+        self.essais += 1
+        action, champs = self.derniere_action
+        await asyncio.sleep(max(INTERVALLES_ANTI_SPAM.get(action) or 0, 0.1) * 2 ** self.essais)
+        await self._agir(action, relance=True, **champs)
+
+    async def _tirer(self):
+        """
+        Choisit un tir dans un thread, borné par le budget de temps du coup.
+        """
+        if self.calcul is not None and not self.calcul.done():
+            # Un calcul abandonné tourne encore sur le cerveau : il ne doit pas y en avoir deux
+            await asyncio.wait([self.calcul])
+        self.calcul = asyncio.ensure_future(asyncio.to_thread(self.cerveau.choisir))
+        try:
+            x, y = await asyncio.wait_for(asyncio.shield(self.calcul), self.budget)
+        except asyncio.TimeoutError:
+            journaliser(logging.DEBUG, "ia_budget_depasse", joueur=self.id_joueur)
+            x, y = self.cerveau.tir_secours(self.cerveau.rng_secours)
+        self.dernier_tir = (x, y)
+        await self._agir("attaque", coordonnees=[x, y])
+
+    async def _boucle(self):
+        while True:
+            message = await self.boite.get()
+            if message is None:
+                return
+            messages = message["messages"] if message.get("action") == "lot" else [message]
+            try:
+                if not await self._traiter(messages):
+                    await self.quitter(self)
+                    return
+            except SalleFermee:
+                return
+            except Exception:
+                journaliser(logging.ERROR, "ia_erreur", joueur=self.id_joueur, exc_info=True)
+
+    async def _traiter(self, messages) -> bool:
+        """
+        Réagit aux messages d'une trame ; retourne False quand le joueur IA doit quitter la salle.
+        """
+        doit_tirer = False
+        fin = False
+        refusee = False
+        for message in messages:
+            action = message.get("action")
+            if action == "erreur":
+                refusee = True
+            elif action in ("ready", "restart") and not self.pret_envoye:
+                self.pret_envoye = True
+                await self._agir("joueur_pret")
+            elif action == "debut_placement":
+                self.placement_confirme = False
+                await self._agir("demande_placement_auto")
+            elif action in ("delta_grille", "mise_a_jour_grille") and not self.placement_confirme:
+                self.placement_confirme = True
+                await self._agir("confirmation_placement")
+            elif action in ("debut_tour", "changement_tour"):
+                doit_tirer = message.get("tour_joueur") == self.index
+            elif action == "resultat_attaque" and message.get("type_joueur") == "attaquant":
+                x, y = message["coordonnees"]
+                self.cerveau.noter_resultat(x, y, message["resultat"], message.get("positions_coule"))
+                doit_tirer = message.get("peut_rejouer", False)
+            elif action == "fin_partie":
+                fin = True
+            elif action == "attente_rejouer" and not self.rejouer_envoye:
+                self.rejouer_envoye = True
+                await self._agir("rejouer")
+            elif action == "adversaire_deconnecte":
+                return False
+        if fin:
+            self.cerveau.reinitialiser()
+            self.pret_envoye = False
+            self.rejouer_envoye = False
+        elif doit_tirer:
+            await self._tirer()
+        elif refusee:
+            await self._relancer()
+        return True
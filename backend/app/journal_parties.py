@@ -0,0 +1,239 @@
+# *******************************************************
+# Nom ......... : journal_parties.py
+# Rôle ........ : Journal binaire des actions acceptées, par salle, en ajout seul
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Chaque action qui modifie une partie (placement, attaque et son
+#                 résultat, changement de tour, redémarrage...) est ajoutée au
+#                 fichier de sa salle sous forme d'un enregistrement compact : un
+#                 octet de type suivi de champs en varints (un tir tient en 5 octets).
+#                 Les gestionnaires ne font qu'encoder quelques octets et les déposer
+#                 dans une file ; le thread de lots.py les regroupe et les écrit par lots,
+#                 salle par salle. reconstruire() rejoue un journal sur un LogiqueJeu neuf
+#                 et retrouve l'état de la partie en cours.
+#                 Une erreur d'écriture (disque plein, droits...) ne perd que le lot de la
+#                 salle concernée : elle est comptée et journalisée, le thread continue.
+#                 Désactivé par défaut (BATTLESHIP_JOURNAL_DIR vide) : les fichiers ne sont
+#                 jamais purgés.
+#
+#                 Fichier : ENTETE puis enregistrements bout à bout.
+#                   OUVERTURE horodatage         PLACEMENT joueur taille x y orientation nom
+#                   REINITIALISATION joueur      CONFIRMATION joueur
+#                   ATTAQUE attaquant x y code   TOUR joueur
+#                   REDEMARRAGE                  FERMETURE
+#                   CONFIGURATION taille flotte  (après OUVERTURE, absent pour une partie par défaut)
+#                 Entiers en LEB128 « zigzag » (signés), chaîne = longueur + UTF-8.
+#
+# Technologies  : Python, threading
+# Dépendances . : hashlib, logging, os, time, app.config, app.game_logic, app.journalisation, app.lots
+# Usage ....... : journal_parties.noter_attaque(salle.id, 0, 3, 4, "touche")
+#                 logique = reconstruire(lire_journal(id_salle))
+# *******************************************************
+
+import hashlib
+import logging
+import os
+import time
+
+from .config import DOSSIER_JOURNAUX, INTERVALLE_JOURNAUX
+from .game_logic import LogiqueJeu
+from .journalisation import journaliser
+from .lots import TravailleurLots
+
+ENTETE = b"BNJ1"
+EXTENSION = ".bnj"
+
+# Types d'enregistrement et schéma de leurs champs ("i" entier, "s" chaîne)
+OUVERTURE, PLACEMENT, REINITIALISATION, CONFIRMATION, ATTAQUE, TOUR, REDEMARRAGE, FERMETURE = range(1, 9)
+CONFIGURATION = 9
+SCHEMAS = {
+    OUVERTURE: "i",
+    PLACEMENT: "iiiiis",
+    REINITIALISATION: "i",
+    CONFIRMATION: "i",
+    ATTAQUE: "iiii",
+    TOUR: "i",
+    REDEMARRAGE: "",
+    FERMETURE: "",
+    CONFIGURATION: "is",
+}
+
+# Codage des valeurs textuelles (ordre figé : il fait partie du format)
+ORIENTATIONS = ("HR", "HL", "VD", "VU")
+RESULTATS = ("manque", "touche", "coule", "gagne", "deja_attaque", "invalide")  # = codes de plateau.py
+
+class JournalCorrompu(ValueError):
+    """
+    Levée quand un journal lu est tronqué ou mal formé.
+    """
+
+def _varint(n: int, sortie: bytearray):
+    """
+    Écrit un entier signé en LEB128 après codage zigzag (petits négatifs sur un octet).
+    """
+    n = (~n << 1) | 1 if n < 0 else n << 1
+    while n > 0x7F:
+        sortie.append((n & 0x7F) | 0x80)
+        n >>= 7
+    sortie.append(n)
+
+def _lire_varint(donnees, pos: int):
+    n = decalage = 0
+    while True:
+        if pos >= len(donnees):
+            raise JournalCorrompu("Varint tronqué")
+        octet = donnees[pos]
+        pos += 1
+        n |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return (n >> 1) ^ -(n & 1), pos
+        decalage += 7
+
+def encoder_enregistrement(type_enregistrement: int, *champs) -> bytes:
+    """
+    Encode un enregistrement : type sur un octet, puis les champs selon son schéma.
+    """
+    sortie = bytearray((type_enregistrement,))
+    for genre, valeur in zip(SCHEMAS[type_enregistrement], champs):
+        if genre == "s":
+            brut = valeur.encode("utf-8")
+            _varint(len(brut), sortie)
+            sortie += brut
+        else:
+            _varint(valeur, sortie)
+    return bytes(sortie)
+
+def decoder_journal(donnees):
+    """
+    Parcourt un journal et produit (type, champs) pour chaque enregistrement.
+    """
+    if donnees[:len(ENTETE)] != ENTETE:
+        raise JournalCorrompu("En-tête de journal absent")
+    pos = len(ENTETE)
+    while pos < len(donnees):
+        type_enregistrement = donnees[pos]
+        schema = SCHEMAS.get(type_enregistrement)
+        if schema is None:
+            raise JournalCorrompu(f"Type d'enregistrement inconnu : {type_enregistrement}")
+        pos += 1
+        champs = []
+        for genre in schema:
+            valeur, pos = _lire_varint(donnees, pos)
+            if genre == "s":
+                if pos + valeur > len(donnees):
+                    raise JournalCorrompu("Chaîne tronquée")
+                valeur, pos = bytes(donnees[pos:pos + valeur]).decode("utf-8"), pos + valeur
+            champs.append(valeur)
+        yield type_enregistrement, champs
+
+def reconstruire(donnees) -> LogiqueJeu:
+    """
+    Rejoue un journal sur un LogiqueJeu neuf et le retourne dans l'état de la dernière
+    partie de la salle (une OUVERTURE ou un REDEMARRAGE repart de zéro).
+    """
+    logique = LogiqueJeu()
+    for type_enregistrement, champs in decoder_journal(donnees):
+        if type_enregistrement == OUVERTURE:
+            logique = LogiqueJeu()
+        elif type_enregistrement == CONFIGURATION:
+            logique = LogiqueJeu(*champs)
+        elif type_enregistrement == PLACEMENT:
+            joueur, taille, x, y, orientation, nom = champs
+            logique.placer_navire(joueur, taille, (x, y), ORIENTATIONS[orientation], nom)
+        elif type_enregistrement == REINITIALISATION:
+            logique.reset_etats_joueur(champs[0])
+        elif type_enregistrement == CONFIRMATION:
+            logique.pret[champs[0]] = True
+        elif type_enregistrement == ATTAQUE:
+            attaquant, x, y, _code = champs
+            logique.traiter_attaque(1 - attaquant, x, y)
+        elif type_enregistrement == TOUR:
+            logique.tour_actuel = champs[0]
+        elif type_enregistrement == REDEMARRAGE:
+            logique.reinitialiser_partie()
+    return logique
+
+def chemin_journal(id_salle: str, dossier: str = DOSSIER_JOURNAUX) -> str:
+    """
+    Fichier du journal d'une salle : nommé par une empreinte de l'identifiant, choisi par
+    le client (longueur fixe, aucun caractère spécial).
+    """
+    return os.path.join(dossier, hashlib.sha256(id_salle.encode("utf-8")).hexdigest()[:32] + EXTENSION)
+
+def lire_journal(id_salle: str, dossier: str = DOSSIER_JOURNAUX) -> bytes:
+    """
+    Contenu du journal d'une salle (les enregistrements encore en file n'y sont pas).
+    """
+    with open(chemin_journal(id_salle, dossier), "rb") as fichier:
+        return fichier.read()
+
+class JournalParties(TravailleurLots):
+    """
+    Journal de toutes les salles. Les méthodes noter_* sont appelées depuis la
+    boucle d'événements et ne font qu'encoder et déposer ; le thread de lots.py écrit.
+    Une sous-classe peut redéfinir _traiter() pour écrire ailleurs (archive.py).
+    """
+
+    def __init__(self, dossier: str = DOSSIER_JOURNAUX, intervalle: float = INTERVALLE_JOURNAUX,
+                 nom_thread: str = "journal-parties"):
+        super().__init__(intervalle, nom_thread)
+        self.dossier = dossier
+        self.octets_ecrits = 0
+
+    def ajouter(self, id_salle: str, donnees: bytes):
+        """
+        Dépose des enregistrements déjà encodés pour la salle donnée.
+        """
+        if self.dossier:
+            self.deposer(id_salle, donnees)
+
+    def noter(self, id_salle: str, type_enregistrement: int, *champs):
+        self.ajouter(id_salle, encoder_enregistrement(type_enregistrement, *champs))
+
+    def noter_ouverture(self, id_salle):
+        self.noter(id_salle, OUVERTURE, int(time.time()))
+
+    def noter_configuration(self, id_salle, taille, flotte):
+        self.noter(id_salle, CONFIGURATION, taille, flotte)
+
+    def noter_placement(self, id_salle, joueur, taille, x, y, orientation, nom):
+        self.noter(id_salle, PLACEMENT, joueur, taille, x, y, ORIENTATIONS.index(orientation), nom)
+
+    def noter_flotte(self, id_salle, joueur, navires):
+        """
+        Flotte complète d'un placement automatique : réinitialisation puis un placement par navire.
+        """
+        self.ajouter(id_salle, encoder_enregistrement(REINITIALISATION, joueur) + b"".join(
+            encoder_enregistrement(PLACEMENT, joueur, n.taille, *n.coordonnees,
+                                   ORIENTATIONS.index(n.orientation), n.nom)
+            for n in navires
+        ))
+
+    def noter_attaque(self, id_salle, attaquant, x, y, resultat):
+        self.noter(id_salle, ATTAQUE, attaquant, x, y, RESULTATS.index(resultat))
+
+    def demarrer(self):
+        os.makedirs(self.dossier, exist_ok=True)
+        super().demarrer()
+
+    def _traiter(self, par_salle):
+        """
+        Thread d'écriture : ajoute le lot de chaque salle à son fichier.
+        """
+        for id_salle, donnees in par_salle.items():
+            try:
+                with open(chemin_journal(id_salle, self.dossier), "ab") as fichier:
+                    if fichier.tell() == 0:
+                        fichier.write(ENTETE)
+                    fichier.write(donnees)
+            except OSError as erreur:
+                self.erreurs += 1
+                journaliser(logging.ERROR, "journal_parties_erreur", salle=id_salle, erreur=str(erreur))
+                continue
+            self.octets_ecrits += len(donnees)
+        if par_salle:
+            self.lots += 1
+
+# Journal partagé par le serveur
+journal_parties = JournalParties()
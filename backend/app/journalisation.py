@@ -0,0 +1,126 @@
+# *******************************************************
+# Nom ......... : journalisation.py
+# Rôle ........ : Journalisation structurée, par niveaux et hors de la boucle asyncio
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Remplace les print() du serveur. Chaque entrée est un événement
+#                 nommé accompagné de champs (salle, joueur, action...). Le logger
+#                 "bataille" ne fait que déposer les entrées dans une file ; un
+#                 QueueListener les formate et les écrit depuis son propre thread.
+#                 Les événements très fréquents sont échantillonnés, et un niveau
+#                 désactivé ne coûte qu'un test : aucune écriture bloquante dans
+#                 la boucle d'événements.
+#
+# Technologies  : Python, logging
+# Dépendances . : atexit, contextvars, copy, json, logging, logging.handlers, queue, app.config
+# Usage ....... : journaliser(logging.INFO, "partie_redemarree", salle=salle.id)
+# *******************************************************
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+
+from .config import NIVEAU_JOURNAL, FORMAT_JOURNAL, ECHANTILLONNAGE_JOURNAL
+
+journal = logging.getLogger("bataille")
+
+# Champs ajoutés à toutes les entrées émises depuis la tâche courante (ex. salle et joueur d'une WebSocket)
+CONTEXTE = contextvars.ContextVar("contexte_journal", default={})
+
+_ecouteur = None
+_compteurs_echantillons = {}
+
+class FormateurStructure(logging.Formatter):
+    """
+    Formate une entrée en "clé=valeur" (lisible) ou en une ligne JSON.
+    """
+
+    def __init__(self, format_json=False):
+        super().__init__()
+        self.format_json = format_json
+
+    def format(self, record) -> str:
+        champs = {
+            "horodatage": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "niveau": record.levelname,
+            "evenement": record.getMessage(),
+            **getattr(record, "champs", {}),
+        }
+        if record.exc_text:
+            champs["trace"] = record.exc_text
+        if self.format_json:
+            return json.dumps(champs, ensure_ascii=False, default=str)
+        entete = f'{champs.pop("horodatage")} {champs.pop("niveau"):<7} {champs.pop("evenement")}'
+        return " ".join([entete] + [f"{cle}={valeur!r}" if isinstance(valeur, str) and " " in valeur
+                                    else f"{cle}={valeur}" for cle, valeur in champs.items()])
+
+class DepotFile(logging.handlers.QueueHandler):
+    """
+    Dépose l'entrée dans la file sans la formater : seule la trace d'exception,
+    qui ne survivrait pas à la copie, est convertie en texte ici.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def configurer_journalisation(niveau=NIVEAU_JOURNAL, format_journal=FORMAT_JOURNAL, sortie=None):
+    """
+    Branche le logger "bataille" sur une file et démarre le thread d'écriture (idempotent).
+    """
+    global _ecouteur
+    if _ecouteur is not None:
+        return
+    file = queue.SimpleQueue()
+    ecriture = logging.StreamHandler(sortie)
+    ecriture.setFormatter(FormateurStructure(format_journal == "json"))
+    _ecouteur = logging.handlers.QueueListener(file, ecriture)
+    journal.handlers[:] = [DepotFile(file)]
+    journal.setLevel(niveau)
+    journal.propagate = False
+    _ecouteur.start()
+    atexit.register(arreter_journalisation)
+
+def arreter_journalisation():
+    """
+    Écrit les entrées encore en file puis arrête le thread d'écriture.
+    """
+    global _ecouteur
+    if _ecouteur is not None:
+        _ecouteur.stop()
+        _ecouteur = None
+
+def definir_contexte(**champs):
+    """
+    Ajoute des champs au contexte de la tâche courante ; retourne le jeton pour le restaurer.
+    """
+    return CONTEXTE.set({**CONTEXTE.get(), **champs})
+
+def journaliser(niveau: int, evenement: str, exc_info=None, **champs):
+    """
+    Émet un événement structuré si le niveau est actif (sinon, aucun travail).
+    """
+    if journal.isEnabledFor(niveau):
+        journal.log(niveau, evenement, exc_info=exc_info, extra={"champs": {**CONTEXTE.get(), **champs}})
+
+def journaliser_echantillon(niveau: int, evenement: str, taux=ECHANTILLONNAGE_JOURNAL, **champs):
+    """
+    Comme journaliser, pour les événements fréquents : seul un sur `taux` est émis
+    (le champ "echantillon" rappelle combien d'occurrences chaque entrée représente).
+    """
+    if not journal.isEnabledFor(niveau):
+        return
+    compte = _compteurs_echantillons.get(evenement, 0)
+    _compteurs_echantillons[evenement] = compte + 1
+    if taux <= 1 or compte % taux == 0:
+        journaliser(niveau, evenement, echantillon=taux, **champs)
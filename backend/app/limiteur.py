@@ -0,0 +1,108 @@
+# *******************************************************
+# Nom ......... : limiteur.py
+# Rôle ........ : Limitation de débit (anti-spam) par joueur, par action et par IP
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Seaux à jetons implémentés sous forme GCRA : chaque seau tient en
+#                 un seul flottant (instant d'arrivée théorique), ce qui rend la
+#                 vérification O(1) et le stockage minimal. Les seaux des joueurs
+#                 sont rangés par salle et supprimés à la fermeture de la salle ;
+#                 une limite globale par adresse IP protège la boucle de réception.
+#                 Les rejets sont comptés par action.
+#
+# Technologies  : Python
+# Dépendances . : time, typing, app.config
+# Usage ....... : if not limiteur.autoriser(salle.id, id_joueur, "attaque"): ...
+# *******************************************************
+
+import time
+from typing import Dict, Tuple
+
+from .config import INTERVALLES_ANTI_SPAM, RAFALE_ANTI_SPAM, LIMITE_MESSAGES_PAR_IP, RAFALE_IP
+
+# Au-delà de ce nombre d'adresses suivies, les seaux IP redevenus pleins sont purgés ;
+# après chaque purge, le seuil passe au double des seaux restants (coût amorti O(1) par message)
+SEUIL_PURGE_IP = 10000
+
+class LimiteurDebit:
+    """
+    Seaux à jetons par (salle, joueur, action) et par adresse IP.
+    Un seau de capacité `rafale` se remplit d'un jeton toutes les `intervalle` secondes.
+    """
+
+    def __init__(self, intervalles=INTERVALLES_ANTI_SPAM, rafale=RAFALE_ANTI_SPAM,
+                 limite_ip=LIMITE_MESSAGES_PAR_IP, rafale_ip=RAFALE_IP):
+        self.intervalles = dict(intervalles)
+        self.rafale = rafale
+        self.intervalle_ip = 1.0 / limite_ip if limite_ip > 0 else 0.0
+        self.rafale_ip = rafale_ip
+        self.seaux: Dict[str, Dict[Tuple[str, str], float]] = {}  # id_salle -> (joueur, action) -> TAT
+        self.seaux_ip: Dict[str, float] = {}                      # ip -> TAT
+        self.seuil_purge_ip = SEUIL_PURGE_IP
+        self.rejets: Dict[str, int] = {}                          # action (ou "ip") -> nombre de rejets
+
+    @staticmethod
+    def _consommer(seaux, cle, intervalle, rafale, maintenant) -> bool:
+        """
+        Algorithme GCRA : consomme un jeton si le seau n'est pas vide.
+        """
+        tat = seaux.get(cle, maintenant)
+        if tat - maintenant > (rafale - 1) * intervalle:
+            return False
+        seaux[cle] = (tat if tat > maintenant else maintenant) + intervalle
+        return True
+
+    def autoriser(self, id_salle: str, id_joueur: str, action: str) -> bool:
+        """
+        Indique si le joueur peut effectuer l'action maintenant (et consomme un jeton si oui).
+        """
+        intervalle = self.intervalles.get(action)
+        if not intervalle:
+            return True
+        seaux = self.seaux.get(id_salle)
+        if seaux is None:
+            seaux = self.seaux[id_salle] = {}
+        if self._consommer(seaux, (id_joueur, action), intervalle, self.rafale, time.monotonic()):
+            return True
+        self.rejets[action] = self.rejets.get(action, 0) + 1
+        return False
+
+    def autoriser_ip(self, ip: str) -> bool:
+        """
+        Limite globale du nombre de messages reçus par adresse IP.
+        """
+        if not self.intervalle_ip or not ip:
+            return True
+        maintenant = time.monotonic()
+        if len(self.seaux_ip) > self.seuil_purge_ip:
+            self._purger_ip(maintenant)
+        if self._consommer(self.seaux_ip, ip, self.intervalle_ip, self.rafale_ip, maintenant):
+            return True
+        self.rejets["ip"] = self.rejets.get("ip", 0) + 1
+        return False
+
+    def _purger_ip(self, maintenant: float):
+        """
+        Supprime les seaux IP redevenus pleins (équivalents à un seau absent).
+        """
+        self.seaux_ip = {ip: tat for ip, tat in self.seaux_ip.items() if tat > maintenant}
+        self.seuil_purge_ip = max(SEUIL_PURGE_IP, 2 * len(self.seaux_ip))
+
+    def oublier_joueur(self, id_salle: str, id_joueur: str):
+        """
+        Supprime les seaux d'un joueur qui quitte sa salle.
+        """
+        seaux = self.seaux.get(id_salle)
+        if seaux:
+            for cle in [cle for cle in seaux if cle[0] == id_joueur]:
+                del seaux[cle]
+
+    def oublier_salle(self, id_salle: str):
+        """
+        Supprime tous les seaux d'une salle fermée.
+        """
+        self.seaux.pop(id_salle, None)
+
+# Instance partagée par le serveur
+limiteur = LimiteurDebit()
@@ -0,0 +1,112 @@
+# *******************************************************
+# Nom ......... : lots.py
+# Rôle ........ : Thread de traitement par lots, alimenté sans verrou depuis la boucle d'événements
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Base commune du journal des parties (journal_parties.py, archive.py) et
+#                 des cartes de chaleur (cartes_chaleur.py). Les gestionnaires déposent des
+#                 éléments (clé, octets) dans une file, en O(1) ; un thread attend un premier
+#                 élément, laisse le lot se remplir pendant `intervalle`, regroupe les octets
+#                 par clé puis appelle _traiter() une fois par lot. Une exception dans
+#                 _traiter() est comptée et journalisée : le thread ne meurt jamais (la file
+#                 grandirait sans fin) et vider() rend toujours la main.
+#
+# Technologies  : Python, threading
+# Dépendances . : atexit, logging, queue, threading, time, app.journalisation
+# Usage ....... : class Journal(TravailleurLots): def _traiter(self, par_cle): ...
+#                 journal.deposer(cle, b"..."); journal.vider(); journal.arreter()
+# *******************************************************
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from .journalisation import journaliser
+
+class TravailleurLots:
+    """
+    File d'éléments (clé, octets) vidée par lots dans un thread. Les sous-classes
+    définissent _traiter(par_cle), appelé dans le thread avec {clé: bytearray}.
+    """
+
+    def __init__(self, intervalle: float, nom_thread: str):
+        self.intervalle = intervalle
+        self.nom_thread = nom_thread  # Journal : événement "<nom_thread>_erreur" ("-" devient "_")
+        self.file = queue.SimpleQueue()
+        self.thread = None
+        # Compteurs lus par /metrics et /statistiques
+        self.recus = 0      # Éléments retirés de la file par le thread
+        self.lots = 0       # Lots menés à bien (tenus par _traiter)
+        self.erreurs = 0
+
+    def deposer(self, cle, donnees: bytes):
+        """
+        Dépose un élément (sans attendre) ; le thread démarre au premier dépôt.
+        """
+        if self.thread is None:
+            self.demarrer()
+        self.file.put_nowait((cle, donnees))
+
+    def demarrer(self):
+        self.thread = threading.Thread(target=self._boucle, name=self.nom_thread, daemon=True)
+        self.thread.start()
+        atexit.register(self.arreter)
+
+    def _boucle(self):
+        """
+        Thread : attend un premier élément, laisse le lot se remplir pendant `intervalle`,
+        puis traite tout ce qui est en file, regroupé par clé.
+        """
+        continuer = True
+        while continuer:
+            lot = [self.file.get()]
+            if lot[0] is not None and self.intervalle > 0:
+                time.sleep(self.intervalle)
+            while True:
+                try:
+                    lot.append(self.file.get_nowait())
+                except queue.Empty:
+                    break
+            par_cle = {}
+            signaux = []
+            for element in lot:
+                if element is None:
+                    continuer = False
+                elif isinstance(element, threading.Event):
+                    signaux.append(element)
+                else:
+                    par_cle.setdefault(element[0], bytearray()).extend(element[1])
+                    self.recus += 1
+            try:
+                self._traiter(par_cle)
+            except Exception:
+                self.erreurs += 1
+                journaliser(logging.ERROR, self.nom_thread.replace("-", "_") + "_erreur",
+                            exc_info=True, lot=len(par_cle))
+            for signal in signaux:
+                signal.set()
+
+    def _traiter(self, par_cle):
+        raise NotImplementedError
+
+    def vider(self, delai: float = 5.0) -> bool:
+        """
+        Attend que tout ce qui a été déposé jusqu'ici soit traité.
+        """
+        if self.thread is None:
+            return True
+        signal = threading.Event()
+        self.file.put_nowait(signal)
+        return signal.wait(delai)
+
+    def arreter(self):
+        """
+        Traite les éléments encore en file puis arrête le thread.
+        """
+        if self.thread is not None:
+            self.file.put_nowait(None)
+            self.thread.join()
+            self.thread = None
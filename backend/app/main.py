@@ -9,30 +9,69 @@
 #                 placement, etc.), la validation des messages et la protection anti-spam.
 #
 # Technologies  : Python, FastAPI, WebSocket
-# Dépendances . : fastapi, pydantic, uuid, time, traceback
+# Dépendances . : fastapi, pydantic, uuid, logging, app.diffusion, app.connexion,
+#                 time, app.acteur, app.limiteur, app.codec, app.protocole_binaire,
+#                 app.metriques, app.journalisation, app.ia, app.journal_parties, app.reprise, asyncio,
+#                 contextlib, app.relais, app.balayeur, app.spectateurs, app.rediffusions,
+#                 app.cartes_chaleur
 # Usage ....... : Lancer avec uvicorn pour démarrer le backend : uvicorn app.main:app --reload
 # *******************************************************
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import contextlib
 import uuid
-import traceback
 import time
+import logging
+from typing import Optional
 
+from .config import (TAILLE_GRILLE, FLOTTE_PAR_DEFAUT, ID_SALLE_APPARIEMENT, DIFFICULTE_IA, DELAI_REPRISE,
+                     TAILLE_MAX_IA, DELAI_PLACEMENT_AUTO)
+from .placement import PlacementImpossible
 from .game_manager import gestionnaire_parties
-from .utils import grille_vide
+from .diffusion import diffuser
+from .connexion import Connexion, STATISTIQUES_ENVOI
+from .acteur import SalleFermee
+from .limiteur import limiteur
+from .codec import decoder, ValidateurActions, ActionInconnue
+from .protocole_binaire import SOUS_PROTOCOLE_BINAIRE, decoder_binaire
+from .metriques import registre, Collecteur, DUREE_ACTIONS, MESSAGES_RECUS, OCTETS_RECUS, ECHECS_VALIDATION
+from .journalisation import journal, configurer_journalisation, definir_contexte, journaliser, journaliser_echantillon
+from .ia import JoueurIA, NIVEAUX_IA
+from .journal_parties import journal_parties, CONFIRMATION, REINITIALISATION, TOUR, REDEMARRAGE
+from .reprise import creer_jeton, verifier_jeton
+from .relais import relais
+from .balayeur import balayeur, memoire_processus
+from .spectateurs import tribunes
+from .rediffusions import rediffusions
+from .cartes_chaleur import cartes_chaleur
 from .models import (
     SimpleActionPayload,
     PlacementNavirePayload,
     ConfirmationPlacementPayload,
     ReinitialisationPlacementPayload,
+    DemandeGrillePayload,
     AttaquePayload,
 )
 from pydantic import ValidationError
 
+@contextlib.asynccontextmanager
+async def cycle_de_vie(app):
+    """
+    Tâches de fond du processus : balayeur des salles et, avec plusieurs partitions,
+    écoute du canal de la partition de ce processus.
+    """
+    await relais.demarrer(websocket_jeu, lancer_ia)
+    balayeur.demarrer()
+    yield
+    balayeur.arreter()
+    await relais.arreter()
+
 # --- Initialisation de l'application FastAPI ---
-app = FastAPI()
+app = FastAPI(lifespan=cycle_de_vie)
+configurer_journalisation()
 
 # --- Configuration CORS (Cross-Origin Resource Sharing) ---
 app.add_middleware(
@@ -50,32 +89,244 @@ async def racine():
     """
     return HTMLResponse("<h1>Le backend Bataille Navale fonctionne !</h1>")
 
-# ---- Anti-spam : limitation d'actions trop fréquentes par joueur ----
-INTERVALLES_ANTI_SPAM = {
-    "attaque": 0.4,
-    "placer_navire": 0.4,
-    "confirmation_placement": 0.7,
-    "rejouer": 1.2,
-    "demande_placement_auto": 0.4,
-    "reinitialisation_placement": 0.7,
-    "joueur_pret": 0.8,
-}
+def connexions_actives():
+    """
+    Connexions WebSocket de tous les joueurs présents dans une salle.
+    """
+    return [
+        ws for salle in gestionnaire_parties.salles.values()
+        for ws in salle.ws.values() if isinstance(ws, Connexion)
+    ]
+
+@app.get("/statistiques/envois")
+async def statistiques_envois():
+    """
+    Compteurs des files d'envoi : messages envoyés, perdus, fusionnés et profondeur actuelle.
+    """
+    connexions = connexions_actives()
+    return {
+        **STATISTIQUES_ENVOI,
+        "connexions": len(connexions),
+        "profondeur_totale": sum(c.profondeur for c in connexions),
+        "profondeur_max": max((c.profondeur_max for c in connexions), default=0),
+    }
+
+@app.get("/statistiques/salles")
+async def statistiques_salles():
+    """
+    Latence et profondeur de boîte aux lettres de l'acteur de chaque salle.
+    """
+    return {
+        "salles": len(gestionnaire_parties.salles),
+        "acteurs": {
+            id_salle: salle.acteur.statistiques()
+            for id_salle, salle in gestionnaire_parties.salles.items()
+        },
+    }
+
+@app.get("/statistiques/partitions")
+async def statistiques_partitions():
+    """
+    Partition de ce worker et connexions relayées vers (ou servies pour) les autres workers.
+    """
+    return relais.statistiques()
+
+@app.get("/statistiques/memoire")
+async def statistiques_memoire():
+    """
+    Salles ouvertes, taille approximative d'une salle, mémoire du processus et bilan du balayeur.
+    """
+    return balayeur.statistiques()
+
+@app.get("/statistiques/spectateurs")
+async def statistiques_spectateurs():
+    """
+    Spectateurs connectés, événements publics diffusés et trames sérialisées pour eux.
+    """
+    return tribunes.statistiques()
+
+@app.get("/statistiques/rediffusions")
+async def statistiques_rediffusions():
+    """
+    Parties exportées, taille moyenne d'un enregistrement et coût des consultations.
+    """
+    return rediffusions.statistiques()
+
+@app.get("/statistiques/cartes")
+async def statistiques_cartes():
+    """
+    Tailles de grille suivies par les cartes de chaleur et avancement de l'agrégation.
+    """
+    return cartes_chaleur.statistiques()
 
-def est_spam(salle, id_joueur, action):
+@app.get("/statistiques/cartes/{taille}")
+async def cartes_taille(taille: int):
     """
-    Détecte si un joueur tente une action trop rapidement (anti-spam).
+    Cartes de chaleur d'une taille de grille : tirs, taux de touche, premiers tirs et
+    cases occupées par les flottes confirmées (dernière réponse publiée, voir cartes_chaleur.py).
     """
-    maintenant = time.time()
-    if not hasattr(salle, "dernieres_actions"):
-        salle.dernieres_actions = {}
-    if id_joueur not in salle.dernieres_actions:
-        salle.dernieres_actions[id_joueur] = {}
-    intervalle = INTERVALLES_ANTI_SPAM.get(action)
-    dernier_temps = salle.dernieres_actions[id_joueur].get(action)
-    if intervalle and dernier_temps and (maintenant - dernier_temps < intervalle):
-        return True
-    salle.dernieres_actions[id_joueur][action] = maintenant
-    return False
+    reponse = cartes_chaleur.reponse(taille)
+    if reponse is None:
+        raise HTTPException(status_code=404, detail="Aucune partie sur cette taille de grille")
+    return Response(reponse, media_type="application/json")
+
+@app.get("/statistiques/anti-spam")
+async def statistiques_anti_spam():
+    """
+    Nombre de rejets du limiteur de débit, par action (et "ip" pour la limite globale).
+    """
+    return {
+        "rejets": limiteur.rejets,
+        "salles_suivies": len(limiteur.seaux),
+        "ip_suivies": len(limiteur.seaux_ip),
+    }
+
+# ---- Métriques Prometheus : valeurs lues à la demande dans les structures existantes ----
+
+registre.enregistrer(Collecteur(
+    "bataille_salles_actives", "Salles ouvertes.", "gauge",
+    lambda: [((), len(gestionnaire_parties.salles))],
+))
+registre.enregistrer(Collecteur(
+    "bataille_salles_en_attente", "Salles ouvertes attendant un second joueur.", "gauge",
+    lambda: [((), len(gestionnaire_parties.salles_en_attente))],
+))
+registre.enregistrer(Collecteur(
+    "bataille_sockets_actives", "WebSockets de joueurs connectées.", "gauge",
+    lambda: [((), len(connexions_actives()))],
+))
+registre.enregistrer(Collecteur(
+    "bataille_spectateurs_actifs", "WebSockets de spectateurs connectées.", "gauge",
+    lambda: [((), sum(len(s) for s in tribunes.par_salle.values()))],
+))
+registre.enregistrer(Collecteur(
+    "bataille_spectateurs_trames_total",
+    "Trames d'événements publics : sérialisées (une par format et par événement) et déposées (une par spectateur).",
+    "counter",
+    lambda: [(("serialisee",), tribunes.serialisations), (("deposee",), tribunes.trames_deposees)],
+    ("etape",),
+))
+registre.enregistrer(Collecteur(
+    "bataille_file_envoi_profondeur", "Messages en attente dans les files d'envoi.", "gauge",
+    lambda: [((), sum(c.profondeur for c in connexions_actives()))],
+))
+registre.enregistrer(Collecteur(
+    "bataille_messages_envoyes_total", "Messages écrits sur les WebSockets.", "counter",
+    lambda: [((), STATISTIQUES_ENVOI["envoyes"])],
+))
+registre.enregistrer(Collecteur(
+    "bataille_octets_envoyes_total", "Octets écrits sur les WebSockets (charge utile des trames).", "counter",
+    lambda: [((), STATISTIQUES_ENVOI["octets"])],
+))
+registre.enregistrer(Collecteur(
+    "bataille_messages_perdus_total", "Messages perdus ou remplacés par la politique de débordement.", "counter",
+    lambda: [(("abandon",), STATISTIQUES_ENVOI["abandonnes"]), (("fusion",), STATISTIQUES_ENVOI["fusionnes"])],
+    ("raison",),
+))
+registre.enregistrer(Collecteur(
+    "bataille_rejets_anti_spam_total", "Actions refusées par le limiteur de débit (\"ip\" : limite globale).", "counter",
+    lambda: [((action,), n) for action, n in limiteur.rejets.items()],
+    ("action",),
+))
+registre.enregistrer(Collecteur(
+    "bataille_journal_enregistrements_total", "Enregistrements écrits dans les journaux de parties.", "counter",
+    lambda: [((), journal_parties.recus)],
+))
+registre.enregistrer(Collecteur(
+    "bataille_journal_octets_total", "Octets écrits dans les journaux de parties.", "counter",
+    lambda: [((), journal_parties.octets_ecrits)],
+))
+registre.enregistrer(Collecteur(
+    "bataille_journal_erreurs_total", "Lots de journal perdus sur une erreur d'écriture.", "counter",
+    lambda: [((), journal_parties.erreurs)],
+))
+
+registre.enregistrer(Collecteur(
+    "bataille_archive_erreurs_total", "Lots de parties perdus sur une erreur d'écriture de l'archive.", "counter",
+    lambda: [((), rediffusions.archive.erreurs)],
+))
+registre.enregistrer(Collecteur(
+    "bataille_rediffusions_exportees_total", "Parties terminées exportées en rediffusion.", "counter",
+    lambda: [((), rediffusions.exportees)],
+))
+registre.enregistrer(Collecteur(
+    "bataille_rediffusions_coups_rejoues_total", "Coups rejoués depuis une image clé pour servir une rediffusion.", "counter",
+    lambda: [((), rediffusions.coups_rejoues)],
+))
+
+registre.enregistrer(Collecteur(
+    "bataille_cartes_evenements_total",
+    "Événements des cartes de chaleur : déposés par les gestionnaires, agrégés par le thread, ignorés (grande grille).",
+    "counter",
+    lambda: [(("depose",), cartes_chaleur.deposes), (("agrege",), cartes_chaleur.recus),
+             (("ignore",), cartes_chaleur.ignores)],
+    ("etape",),
+))
+
+registre.enregistrer(Collecteur(
+    "bataille_salles_balayees_total", "Salles supprimées par le balayeur.", "counter",
+    lambda: [((raison,), n) for raison, n in balayeur.salles_supprimees.items()],
+    ("raison",),
+))
+registre.enregistrer(Collecteur(
+    "bataille_connexions_muettes_total", "Connexions fermées faute de réponse au ping.", "counter",
+    lambda: [((), balayeur.connexions_muettes)],
+))
+registre.enregistrer(Collecteur(
+    "bataille_memoire_processus_octets", "Mémoire résidente du processus.", "gauge",
+    lambda: [((), memoire_processus())],
+))
+
+@app.get("/metrics")
+async def metriques():
+    """
+    Métriques au format d'exposition Prometheus.
+    """
+    return PlainTextResponse(registre.exposer(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ---- Rediffusions des parties terminées ----
+
+@app.get("/rediffusions")
+async def liste_rediffusions(nombre: int = 50, depuis: Optional[int] = None, jusqua: Optional[int] = None):
+    """
+    Dernières parties terminées sur ce worker, de la plus récente à la plus ancienne ;
+    avec ?depuis=&jusqua= (secondes), parties archivées terminées dans cette période.
+    """
+    return rediffusions.lister(max(0, min(nombre, 1000)), depuis, jusqua)
+
+def charger_rediffusion(id_partie: str):
+    rediffusion = rediffusions.charger(id_partie)
+    if rediffusion is None:
+        raise HTTPException(status_code=404, detail="Rediffusion introuvable")
+    return rediffusion
+
+@app.get("/rediffusions/{id_partie}")
+async def resume_rediffusion(id_partie: str):
+    """
+    Configuration, nombre de coups et gagnant d'une partie terminée.
+    """
+    return {"id": id_partie, **charger_rediffusion(id_partie).resume()}
+
+@app.get("/rediffusions/{id_partie}/brut")
+async def rediffusion_brute(id_partie: str):
+    """
+    Enregistrement compact de la partie (format décrit dans rediffusions.py).
+    """
+    donnees = rediffusions.donnees(id_partie)
+    if donnees is None:
+        raise HTTPException(status_code=404, detail="Rediffusion introuvable")
+    return Response(bytes(donnees), media_type="application/octet-stream")
+
+@app.get("/rediffusions/{id_partie}/coups/{coup}")
+async def etat_rediffusion(id_partie: str, coup: int):
+    """
+    Grilles des deux joueurs après `coup` tirs (0 = flottes placées), avec le dernier tir joué.
+    """
+    charger_rediffusion(id_partie)
+    try:
+        return rediffusions.etat(id_partie, coup)
+    except IndexError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 # ---- Mapping : actions vers modèles Pydantic (validation entrée) ----
 MODELES_ACTIONS = {
@@ -83,6 +334,7 @@ MODELES_ACTIONS = {
     "confirmation_placement": ConfirmationPlacementPayload,
     "reinitialisation_placement": ReinitialisationPlacementPayload,
     "attaque": AttaquePayload,
+    "demande_grille": DemandeGrillePayload,
     "join": SimpleActionPayload,
     "joueur_pret": SimpleActionPayload,
     "demande_placement_auto": SimpleActionPayload,
@@ -90,6 +342,145 @@ MODELES_ACTIONS = {
     "rejouer": SimpleActionPayload,
     # Ajouter ici d'autres actions si besoin...
 }
+validateur_actions = ValidateurActions(MODELES_ACTIONS)
+
+async def recevoir_message(websocket):
+    """
+    Reçoit et décode le prochain message du client : trame texte JSON,
+    ou trame binaire du sous-protocole compact.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    MESSAGES_RECUS.inc()
+    if message.get("bytes") is not None:
+        OCTETS_RECUS.inc(n=len(message["bytes"]))
+        return decoder_binaire(message["bytes"])
+    texte = message["text"]
+    # Octets UTF-8 reçus, pas caractères (comme l'envoi, voir connexion.py)
+    OCTETS_RECUS.inc(n=len(texte) if texte.isascii() else len(texte.encode()))
+    return decoder(texte)
+
+# ---- Envoi des grilles : deltas versionnés, instantané complet si nécessaire ----
+
+async def envoyer_instantane_grille(ws, logique, index_joueur):
+    """
+    Envoie la grille complète du joueur avec son numéro de version
+    (ses seules cases non vides pour une grande grille).
+    """
+    version, contenu = logique.instantane_grille(index_joueur)
+    await ws.send_json({"action": "mise_a_jour_grille", "version": version, **contenu})
+
+async def envoyer_delta_grille(ws, logique, index_joueur):
+    """
+    Envoie uniquement les cases modifiées depuis la dernière version connue du client.
+    Si le delta couvre plus de la moitié de la grille, l'instantané complet est plus court.
+    """
+    if len(logique.cases_modifiees[index_joueur]) * 2 > logique.taille * logique.taille:
+        await envoyer_instantane_grille(ws, logique, index_joueur)
+        return
+    version_base, version, cases = logique.extraire_delta(index_joueur)
+    await ws.send_json({
+        "action": "delta_grille",
+        "version_base": version_base,
+        "version": version,
+        "cases": cases
+    })
+
+# ---- Messages personnalisés par destinataire (utilisés avec diffuser) ----
+
+def message_ready(pid, idx):
+    """
+    Annonce à chaque joueur que la salle est complète.
+    """
+    return {
+        "action": "ready",
+        "message": f"Joueur {idx} connecté, la partie peut commencer !"
+    }
+
+def message_tour(action, logique):
+    """
+    Construit le message de tour (debut_tour / changement_tour) propre à chaque joueur.
+    """
+    def construire(pid, idx):
+        return {
+            "action": action,
+            "tour_joueur": logique.tour_actuel,
+            "player_index": idx,
+            "message": "C'est votre tour !" if idx == logique.tour_actuel else "Tour de l'adversaire."
+        }
+    return construire
+
+def phase_joueur(salle, id_joueur):
+    """
+    Étape de la partie où se trouve un joueur (envoyée dans l'instantané de reprise).
+    """
+    logique = salle.logique
+    index = salle.joueurs[id_joueur]
+    if any(plateau.flotte_coulee() for plateau in logique.plateaux):
+        return "fin"
+    if logique.tour_actuel is not None:
+        return "bataille"
+    if logique.pret[index]:
+        return "attente_placement"
+    if salle.tous_prets():
+        return "placement"
+    if salle.pret.get(id_joueur):
+        return "attente_adversaire"
+    return "menu" if len(salle.joueurs) == 2 else "attente"
+
+def phase_salle(salle):
+    """
+    Étape de la partie vue des tribunes (envoyée dans l'instantané d'un spectateur).
+    """
+    logique = salle.logique
+    if any(plateau.flotte_coulee() for plateau in logique.plateaux):
+        return "fin"
+    if logique.tour_actuel is not None:
+        return "bataille"
+    return "placement" if len(salle.joueurs) == 2 else "attente"
+
+def message_spectateur(salle):
+    """
+    Instantané public de la partie pour un spectateur qui arrive : les cases visées
+    des deux grilles (brouillard de guerre, aucun navire intact) et le tour en cours.
+    """
+    logique = salle.logique
+    return {
+        "action": "spectateur",
+        "phase": phase_salle(salle),
+        "joueurs": len(salle.joueurs),
+        "tour_joueur": logique.tour_actuel,
+        "taille_grille": logique.taille,
+        "navires": list(logique.composition),
+        "tirs": [logique.vue_publique(0), logique.vue_publique(1)],
+        "spectateurs": tribunes.nombre(salle.id),
+    }
+
+def message_reprise(salle, id_joueur):
+    """
+    Instantané compact de la partie pour un joueur qui reprend sa place :
+    sa grille complète et les seules cases visées de la grille adverse.
+    """
+    logique = salle.logique
+    index = salle.joueurs[id_joueur]
+    adversaire_id = salle.id_adversaire(id_joueur)
+    version, contenu = logique.instantane_grille(index)
+    return {
+        "action": "reprise",
+        "player_id": id_joueur,
+        "player_index": index,
+        "jeton_reprise": creer_jeton(salle.id, id_joueur),
+        "phase": phase_joueur(salle, id_joueur),
+        "tour_joueur": logique.tour_actuel,
+        "victoire": logique.plateaux[1 - index].flotte_coulee(),
+        "taille_grille": logique.taille,
+        "navires": list(logique.composition),
+        "version": version,
+        **contenu,
+        "tirs": logique.vue_publique(1 - index),
+        "adversaire_present": adversaire_id is not None and salle.ws.get(adversaire_id) is not None,
+    }
 
 # ---- Handlers pour chaque action de jeu (via WebSocket) ----
 
@@ -100,22 +491,20 @@ async def gerer_join(ws, salle, id_joueur, index_joueur, donnees, **ctx):
     await ws.send_json({
         "action": "player_joined",
         "player_index": index_joueur,
-        "player_id": id_joueur
+        "player_id": id_joueur,
+        "jeton_reprise": creer_jeton(salle.id, id_joueur),
+        "taille_grille": salle.logique.taille,
+        "navires": list(salle.logique.composition),
     })
     # Notifie les 2 joueurs si prêts
     if len(salle.joueurs) == 2:
-        for pid, ws2 in salle.ws.items():
-            idx = salle.joueurs[pid]
-            await ws2.send_json({
-                "action": "ready",
-                "message": f"Joueur {idx} connecté, la partie peut commencer !"
-            })
+        await diffuser(salle, message_ready)
 
 async def gerer_joueur_pret(ws, salle, id_joueur, index_joueur, donnees, **ctx):
     """
     Gère l'action de déclaration "prêt" d'un joueur.
     """
-    if est_spam(salle, id_joueur, "joueur_pret"):
+    if not limiteur.autoriser(salle.id, id_joueur, "joueur_pret"):
         await ws.send_json({
             "action": "erreur",
             "message": "Action trop rapide : attendez avant de refaire prêt."
@@ -123,11 +512,10 @@ async def gerer_joueur_pret(ws, salle, id_joueur, index_joueur, donnees, **ctx):
         return
     salle.definir_pret(id_joueur, True)
     if salle.tous_prets():
-        for pid, ws2 in salle.ws.items():
-            await ws2.send_json({
-                "action": "debut_placement",
-                "message": "Tous les joueurs sont prêts ! Place tes navires."
-            })
+        await diffuser(salle, {
+            "action": "debut_placement",
+            "message": "Tous les joueurs sont prêts ! Place tes navires."
+        })
     else:
         await ws.send_json({
             "action": "attente_adversaire",
@@ -138,7 +526,7 @@ async def gerer_placer_navire(ws, salle, id_joueur, index_joueur, donnees, **ctx
     """
     Gère le placement manuel d'un navire sur la grille d'un joueur.
     """
-    if est_spam(salle, id_joueur, "placer_navire"):
+    if not limiteur.autoriser(salle.id, id_joueur, "placer_navire"):
         await ws.send_json({
             "action": "erreur",
             "message": "Action trop rapide : merci d’attendre un peu avant de placer un autre navire."
@@ -151,7 +539,8 @@ async def gerer_placer_navire(ws, salle, id_joueur, index_joueur, donnees, **ctx
     nom = donnees.nom_navire
     success = logique.placer_navire(index_joueur, taille, coords, orientation, nom)
     if success:
-        await ws.send_json({"action": "mise_a_jour_grille", "grille": logique.grilles[index_joueur]})
+        journal_parties.noter_placement(salle.id, index_joueur, taille, *coords, orientation, nom)
+        await envoyer_delta_grille(ws, logique, index_joueur)
     else:
         await ws.send_json({"action": "erreur_placement", "message": "Placement invalide."})
 
@@ -159,144 +548,278 @@ async def gerer_demande_placement_auto(ws, salle, id_joueur, index_joueur, donne
     """
     Gère le placement automatique de tous les navires.
     """
-    if est_spam(salle, id_joueur, "demande_placement_auto"):
+    if not limiteur.autoriser(salle.id, id_joueur, "demande_placement_auto"):
         await ws.send_json({
             "action": "erreur",
             "message": "Action trop rapide : merci d’attendre un peu avant de demander un placement auto."
         })
         return
     logique = salle.logique
-    logique.placement_automatique(index_joueur)
-    await ws.send_json({"action": "mise_a_jour_grille", "grille": logique.grilles[index_joueur]})
+    # Tirage hors de la boucle d'événements, borné ; la partie n'est modifiée qu'ensuite
+    try:
+        flotte = await asyncio.to_thread(logique.tirer_flotte, delai=DELAI_PLACEMENT_AUTO)
+    except PlacementImpossible:
+        await ws.send_json({"action": "erreur_placement", "message": "Placement automatique impossible, placez vos navires."})
+        return
+    logique.placer_flotte(index_joueur, flotte)
+    journal_parties.noter_flotte(salle.id, index_joueur, logique.navires[index_joueur])
+    await envoyer_delta_grille(ws, logique, index_joueur)
 
 async def gerer_reinitialisation_placement(ws, salle, id_joueur, index_joueur, donnees, **ctx):
     """
     Gère la réinitialisation de la grille de placement.
     """
-    if est_spam(salle, id_joueur, "reinitialisation_placement"):
+    if not limiteur.autoriser(salle.id, id_joueur, "reinitialisation_placement"):
         await ws.send_json({
             "action": "erreur",
             "message": "Action trop rapide : merci d’attendre un peu avant de réinitialiser."
         })
         return
     logique = salle.logique
-    logique.grilles[index_joueur] = grille_vide()
-    logique.navires[index_joueur] = []
-    logique.types_navires_places[index_joueur] = {}
-    await ws.send_json({"action": "mise_a_jour_grille", "grille": logique.grilles[index_joueur]})
+    logique.reset_etats_joueur(index_joueur)
+    journal_parties.noter(salle.id, REINITIALISATION, index_joueur)
+    await envoyer_delta_grille(ws, logique, index_joueur)
+
+async def gerer_demande_grille(ws, salle, id_joueur, index_joueur, donnees, **ctx):
+    """
+    Renvoie la grille complète au client qui a détecté un écart de version.
+    """
+    await envoyer_instantane_grille(ws, salle.logique, index_joueur)
 
 async def gerer_confirmation_placement(ws, salle, id_joueur, index_joueur, donnees, **ctx):
     """
     Gère la confirmation de placement des navires.
     """
-    if est_spam(salle, id_joueur, "confirmation_placement"):
+    if not limiteur.autoriser(salle.id, id_joueur, "confirmation_placement"):
         await ws.send_json({
             "action": "erreur",
             "message": "Action trop rapide : merci d’attendre un peu avant de confirmer."
         })
         return
     logique = salle.logique
+    if not logique.pret[index_joueur] and logique.tous_navires_places(index_joueur):
+        cartes_chaleur.noter_flotte(logique.plateaux[index_joueur])
     logique.pret[index_joueur] = True
+    journal_parties.noter(salle.id, CONFIRMATION, index_joueur)
     await ws.send_json({"action": "placement_confirme", "message": "Placement confirmé."})
     if all(logique.pret):
         logique.tour_actuel = 0
-        for pid, ws2 in salle.ws.items():
-            idx = salle.joueurs[pid]
-            await ws2.send_json({
-                "action": "tous_navires_prets",
-                "message": "La bataille commence !"
-            })
-            await ws2.send_json({
-                "action": "debut_tour",
-                "tour_joueur": logique.tour_actuel,
-                "player_index": idx,
-                "message": "C'est votre tour !" if idx == logique.tour_actuel else "Tour de l'adversaire."
-            })
+        journal_parties.noter(salle.id, TOUR, 0)
+        await diffuser(
+            salle,
+            {"action": "tous_navires_prets", "message": "La bataille commence !"},
+            message_tour("debut_tour", logique),
+        )
+        tribunes.diffuser(salle.id, {"action": "debut_tour", "tour_joueur": 0})
 
 async def gerer_attaque(ws, salle, id_joueur, index_joueur, donnees, **ctx):
     """
     Gère une attaque sur la grille de l’adversaire.
     """
-    if est_spam(salle, id_joueur, "attaque"):
+    if not limiteur.autoriser(salle.id, id_joueur, "attaque"):
         await ws.send_json({
             "action": "erreur",
             "message": "Action trop rapide : merci d’attendre un peu avant d’attaquer à nouveau."
         })
         return
     logique = salle.logique
+    if logique.tour_actuel is None:
+        # Bataille pas encore commencée, ou finie jusqu'au redémarrage de la partie
+        await ws.send_json({
+            "action": "erreur",
+            "message": "Aucune bataille en cours."
+        })
+        return
+    if logique.tour_actuel != index_joueur:
+        await ws.send_json({
+            "action": "erreur",
+            "message": "Ce n'est pas votre tour."
+        })
+        return
     adversaire_id = salle.id_adversaire(id_joueur)
     adversaire_index = salle.joueurs[adversaire_id] if adversaire_id else None
     x, y = donnees.coordonnees
     resultat = logique.traiter_attaque(adversaire_index, x, y)
-    for pid, ws2 in salle.ws.items():
-        idx = salle.joueurs[pid]
-        await ws2.send_json({
+    journal_parties.noter_attaque(salle.id, index_joueur, x, y, resultat["resultat"])
+    # Tous les événements de ce tir partent dans une seule trame par joueur
+    evenements = [lambda pid, idx: {
+        "action": "resultat_attaque",
+        "resultat": resultat["resultat"],
+        "coordonnees": [x, y],
+        "type_joueur": "attaquant" if idx == index_joueur else "defenseur",
+        "peut_rejouer": resultat.get("peut_rejouer", False),
+        "nom_navire": resultat.get("nom_navire", ""),
+        "positions_coule": resultat.get("positions_coule", [])
+    }]
+    # Vue publique du même tir pour les spectateurs : rien d'un navire non coulé
+    publics = []
+    if resultat["resultat"] in ("manque", "touche", "coule", "gagne"):
+        cartes_chaleur.noter_tir(logique.plateaux[adversaire_index], x, y, resultat["resultat"] != "manque")
+        publics.append({
             "action": "resultat_attaque",
+            "attaquant_index": index_joueur,
             "resultat": resultat["resultat"],
             "coordonnees": [x, y],
-            "type_joueur": "attaquant" if idx == index_joueur else "defenseur",
-            "peut_rejouer": resultat.get("peut_rejouer", False),
             "nom_navire": resultat.get("nom_navire", ""),
-            "positions_coule": resultat.get("positions_coule", [])
+            "positions_coule": resultat.get("positions_coule", []),
         })
-    if not resultat.get("peut_rejouer", False):
+    if resultat.get("partie_finie"):
+        # Plus personne ne tire avant reinitialiser_partie()
+        logique.tour_actuel = None
+    elif not resultat.get("peut_rejouer", False):
         logique.changer_tour()
-        for pid, ws2 in salle.ws.items():
-            idx = salle.joueurs[pid]
-            await ws2.send_json({
-                "action": "changement_tour",
-                "tour_joueur": logique.tour_actuel,
-                "player_index": idx,
-                "message": "C'est votre tour !" if idx == logique.tour_actuel else "Tour de l'adversaire."
-            })
+        journal_parties.noter(salle.id, TOUR, logique.tour_actuel)
+        evenements.append(message_tour("changement_tour", logique))
+        publics.append({"action": "changement_tour", "tour_joueur": logique.tour_actuel})
     if resultat.get("partie_finie"):
         gagnant_id = id_joueur
-        for pid, ws2 in salle.ws.items():
-            victoire = (pid == gagnant_id)
-            await ws2.send_json({
-                "action": "fin_partie",
-                "gagnant_id": gagnant_id,
-                "victoire": victoire
-            })
+        # La partie disparaîtra au redémarrage ou à la suppression de la salle
+        id_rediffusion = rediffusions.exporter(salle.id, logique)
+        evenements.append(lambda pid, idx: {
+            "action": "fin_partie",
+            "gagnant_id": gagnant_id,
+            "victoire": (pid == gagnant_id),
+            "rediffusion": id_rediffusion,
+        })
+        publics.append({"action": "fin_partie", "gagnant_index": index_joueur, "rediffusion": id_rediffusion})
+    await diffuser(salle, *evenements)
+    tribunes.diffuser(salle.id, *publics)
 
 async def gerer_rejouer(ws, salle, id_joueur, index_joueur, donnees, **ctx):
     """
     Gère la demande de rejouer une partie.
     """
-    if est_spam(salle, id_joueur, "rejouer"):
+    if not limiteur.autoriser(salle.id, id_joueur, "rejouer"):
         await ws.send_json({
             "action": "erreur",
             "message": "Action trop rapide : merci d’attendre un peu avant de demander une revanche."
         })
         return
-    if not hasattr(salle, "rejouer_pret"):
-        salle.rejouer_pret = {}
     salle.rejouer_pret[id_joueur] = True
 
-    for pid, ws2 in salle.ws.items():
-        await ws2.send_json({
-            "action": "attente_rejouer",
-            "message": "En attente que l'adversaire accepte le redémarrage..." if pid == id_joueur else "L'adversaire veut rejouer. Voulez-vous aussi ?",
-            "waiting_player": id_joueur,
-        })
+    await diffuser(salle, lambda pid, idx: {
+        "action": "attente_rejouer",
+        "message": "En attente que l'adversaire accepte le redémarrage..." if pid == id_joueur else "L'adversaire veut rejouer. Voulez-vous aussi ?",
+        "waiting_player": id_joueur,
+    })
     if len(salle.rejouer_pret) == 2 and all(salle.rejouer_pret.get(pid, False) for pid in salle.joueurs):
-        print("[WS] Redémarrage effectif de la partie !")
+        journaliser(logging.INFO, "partie_redemarree", salle=salle.id)
         logique = salle.logique
         logique.reinitialiser_partie()
+        journal_parties.noter(salle.id, REDEMARRAGE)
         salle.pret = {pid: False for pid in salle.joueurs}
         salle.rejouer_pret = {}
-        for pid, ws2 in salle.ws.items():
-            await ws2.send_json({
-                "action": "restart",
-            })
+        await diffuser(salle, {"action": "restart"})
+        tribunes.diffuser(salle.id, {"action": "restart"})
 
 async def gerer_deconnexion(ws, salle, id_joueur, index_joueur, donnees, **ctx):
     """
     Gère la déconnexion volontaire d'un joueur.
     """
-    print(f"[WS] Déconnexion volontaire du client {id_joueur}")
-    if hasattr(salle, "rejouer_pret") and id_joueur in salle.rejouer_pret:
+    journaliser(logging.INFO, "deconnexion_volontaire", salle=salle.id, joueur=id_joueur)
+    if id_joueur in salle.rejouer_pret:
         salle.rejouer_pret[id_joueur] = False
+    # Départ volontaire : la place n'est pas gardée pour une reprise
+    await gerer_depart(salle, id_joueur)
+
+async def gerer_depart(salle, id_joueur):
+    """
+    Retire un joueur déconnecté de sa salle et prévient l'adversaire encore présent.
+    """
+    adversaire_id = salle.id_adversaire(id_joueur)
+    gestionnaire_parties.quitter_salle(id_joueur)
+    # Grappe : la salle d'appariement redevient disponible pour les autres workers
+    if relais.actif and salle.appariement and len(salle.joueurs) == 1:
+        await relais.proposer_salle(salle.id)
+    # Si l'adversaire est encore connecté, notifie-le
+    if adversaire_id and salle.ws.get(adversaire_id) is not None:
+        await salle.ws[adversaire_id].send_json({
+            "action": "adversaire_deconnecte",
+            "message": "L'adversaire s'est déconnecté."
+        })
+
+async def gerer_coupure(salle, id_joueur, connexion):
+    """
+    Fin de la session WebSocket d'un joueur. Face à un adversaire, sa place est gardée
+    DELAI_REPRISE secondes pour une reprise avec son jeton ; sinon il quitte la salle.
+    """
+    if salle.ws.get(id_joueur) is not connexion:
+        return  # Place déjà libérée, ou reprise par une nouvelle connexion
+    adversaire_id = salle.id_adversaire(id_joueur)
+    if DELAI_REPRISE <= 0 or adversaire_id is None:
+        await gerer_depart(salle, id_joueur)
+        return
+    salle.ws[id_joueur] = None
+    salle.sieges_reserves[id_joueur] = asyncio.create_task(liberer_place(salle, id_joueur))
+    journaliser(logging.INFO, "place_gardee", salle=salle.id, joueur=id_joueur, delai=DELAI_REPRISE)
+    if salle.ws.get(adversaire_id) is not None:
+        await salle.ws[adversaire_id].send_json({
+            "action": "adversaire_deconnexion_temporaire",
+            "delai": DELAI_REPRISE,
+            "message": "L'adversaire a perdu la connexion, sa place est gardée quelques instants."
+        })
+
+async def liberer_place(salle, id_joueur):
+    """
+    Tâche lancée à la coupure : libère la place si le joueur n'est pas revenu à temps.
+    """
+    await asyncio.sleep(DELAI_REPRISE)
+    try:
+        await salle.acteur.soumettre(expirer_place, salle, id_joueur)
+    except SalleFermee:
+        pass
+
+async def expirer_place(salle, id_joueur):
+    """
+    Délai de grâce écoulé : le joueur toujours absent quitte la salle.
+    """
+    salle.sieges_reserves.pop(id_joueur, None)
+    if id_joueur in salle.joueurs and salle.ws.get(id_joueur) is None:
+        journaliser(logging.INFO, "place_liberee", salle=salle.id, joueur=id_joueur)
+        await gerer_depart(salle, id_joueur)
+
+async def reprendre_place(salle, id_joueur, connexion):
+    """
+    Rattache une nouvelle connexion à la place d'un joueur et lui envoie l'instantané de la partie.
+    Une ancienne connexion encore ouverte (socket à demi fermée) est remplacée.
+    Retourne False si la place n'existe plus (ou appartient à un joueur IA).
+    """
+    ancienne = salle.ws.get(id_joueur)
+    if id_joueur not in salle.joueurs or not (ancienne is None or isinstance(ancienne, Connexion)):
+        return False
+    tache = salle.sieges_reserves.pop(id_joueur, None)
+    if tache is not None:
+        tache.cancel()
+    salle.ws[id_joueur] = connexion
+    if isinstance(ancienne, Connexion):
+        asyncio.ensure_future(ancienne.fermer())
+    await connexion.send_json(message_reprise(salle, id_joueur))
+    adversaire_id = salle.id_adversaire(id_joueur)
+    if adversaire_id and salle.ws.get(adversaire_id) is not None:
+        await salle.ws[adversaire_id].send_json({
+            "action": "adversaire_reconnecte",
+            "message": "L'adversaire est de retour."
+        })
+    return True
+
+async def reprendre_session(jeton, connexion):
+    """
+    Reprend la place désignée par un jeton de reprise.
+    Retourne (salle, id_joueur), ou None si le jeton est faux ou la place déjà libérée.
+    """
+    identite = verifier_jeton(jeton)
+    if identite is None:
+        return None
+    id_salle, id_joueur = identite
+    salle = gestionnaire_parties.salle_par_id(id_salle)
+    if salle is None:
+        return None
+    try:
+        if not await salle.acteur.soumettre(reprendre_place, salle, id_joueur, connexion):
+            return None
+    except SalleFermee:
+        return None
+    return salle, id_joueur
 
 # ----- Dispatcher principal pour chaque action -----
 GESTIONNAIRES_ACTIONS = {
@@ -305,6 +828,7 @@ GESTIONNAIRES_ACTIONS = {
     "placer_navire": gerer_placer_navire,
     "demande_placement_auto": gerer_demande_placement_auto,
     "reinitialisation_placement": gerer_reinitialisation_placement,
+    "demande_grille": gerer_demande_grille,
     "confirmation_placement": gerer_confirmation_placement,
     "attaque": gerer_attaque,
     "rejouer": gerer_rejouer,
@@ -312,98 +836,314 @@ GESTIONNAIRES_ACTIONS = {
     # Ajouter toutes les autres actions ici !
 }
 
+async def traiter_action(connexion, salle, id_joueur, index_joueur, donnees):
+    """
+    Valide un message décodé puis l'exécute par l'acteur de la salle.
+    Chemin commun aux clients WebSocket et aux joueurs IA.
+    """
+    salle.derniere_activite = time.monotonic()
+    action = donnees.get("action") if isinstance(donnees, dict) else None
+    if not action:
+        ECHECS_VALIDATION.inc("action_manquante")
+        await connexion.send_json({
+            "action": "erreur",
+            "message": "Champ 'action' manquant."
+        })
+        return
+
+    # -- Validation via les validateurs Pydantic précompilés --
+    try:
+        payload = validateur_actions.valider(donnees)
+    except ActionInconnue:
+        ECHECS_VALIDATION.inc("action_inconnue")
+        await connexion.send_json({
+            "action": "erreur",
+            "message": f"Action inconnue : {action}"
+        })
+        return
+    except ValidationError as ve:
+        ECHECS_VALIDATION.inc("invalide")
+        await connexion.send_json({
+            "action": "erreur",
+            "message": f"Message invalide pour l'action {action} : {ve.errors()}"
+        })
+        return
+
+    # -- Dispatch vers le bon gestionnaire, exécuté par l'acteur de la salle --
+    gestionnaire = GESTIONNAIRES_ACTIONS.get(action)
+    if gestionnaire:
+        debut = time.perf_counter()
+        try:
+            await salle.acteur.soumettre(gestionnaire, connexion, salle, id_joueur, index_joueur, payload)
+        except SalleFermee:
+            raise
+        except Exception:
+            journaliser(logging.ERROR, "erreur_action", action=action, exc_info=True)
+            raise
+        DUREE_ACTIONS.observer(action, time.perf_counter() - debut)
+    else:
+        ECHECS_VALIDATION.inc("non_supportee")
+        await connexion.send_json({
+            "action": "erreur",
+            "message": f"Action non supportée côté serveur : {action}"
+        })
+
+# ---- Adversaire IA : un joueur serveur qui passe par le même chemin que les clients ----
+
+async def envoyer_action_ia(joueur, donnees):
+    """
+    Exécute une action du joueur IA tant qu'il est encore dans sa salle.
+    """
+    if joueur.id_joueur in joueur.salle.joueurs:
+        await traiter_action(joueur, joueur.salle, joueur.id_joueur, joueur.index, donnees)
+
+async def quitter_ia(joueur):
+    """
+    Retire le joueur IA de sa salle (son adversaire est parti).
+    """
+    joueur.arreter()
+    try:
+        await joueur.salle.acteur.soumettre(gerer_depart, joueur.salle, joueur.id_joueur)
+    except SalleFermee:
+        pass
+
+async def lancer_ia(id_salle=None, difficulte=DIFFICULTE_IA, appariement=False, demandeur=None):
+    """
+    Fait rejoindre une salle à un joueur IA, exactement comme un client humain.
+    Sans identifiant, le joueur IA passe par l'appariement.
+    `appariement` : salle choisie par l'appariement partagé d'une grappe (voir relais.py).
+    `demandeur` : joueur à l'origine de la demande, qui doit attendre seul dans la salle.
+    """
+    if difficulte not in NIVEAUX_IA:
+        raise ValueError(f"Difficulté inconnue : {difficulte}")
+    existante = gestionnaire_parties.salle_par_id(id_salle) if id_salle else None
+    if demandeur is not None and (existante is None or list(existante.joueurs) != [demandeur]):
+        raise ValueError("Seul un joueur attendant seul dans sa salle peut y ajouter une IA")
+    if existante is not None and existante.logique.taille > TAILLE_MAX_IA:
+        raise ValueError(f"Pas d'adversaire IA au-delà d'une grille {TAILLE_MAX_IA}x{TAILLE_MAX_IA}")
+    joueur = JoueurIA(f"ia-{uuid.uuid4()}", envoyer_action_ia, quitter_ia, difficulte)
+    salle = gestionnaire_parties.rejoindre_salle(joueur.id_joueur, ws=joueur, id_salle=id_salle)
+    joueur.demarrer(salle, salle.joueurs[joueur.id_joueur])
+    journaliser(logging.INFO, "ia_connectee", salle=salle.id, joueur=joueur.id_joueur, difficulte=difficulte)
+    if appariement:
+        salle.appariement = True
+        if len(salle.joueurs) == 1:
+            await relais.proposer_salle(salle.id)
+    if len(salle.joueurs) == 2:
+        await salle.acteur.soumettre(diffuser, salle, message_ready)
+    return joueur
+
+@app.post("/ia/{id_salle}")
+async def ajouter_ia(id_salle: str, request: Request, jeton: str = "", difficulte: str = DIFFICULTE_IA):
+    """
+    Ajoute un adversaire IA dans une salle, à la demande du joueur qui y attend seul (comme ?ia=) :
+    `jeton` est son jeton de reprise (champ "jeton_reprise" des messages player_joined et reprise).
+    Soumis à la limite par adresse IP.
+    Dans une grappe, la demande est transmise à la partition propriétaire de la salle.
+    """
+    if not limiteur.autoriser_ip(request.client.host if request.client else None):
+        raise HTTPException(status_code=429, detail="Trop de requêtes : ralentissez.")
+    identite = verifier_jeton(jeton) if jeton else None
+    if identite is None or identite[0] != id_salle:
+        raise HTTPException(status_code=403, detail="Jeton de reprise de cette salle requis")
+    id_joueur = identite[1]
+    if difficulte not in NIVEAUX_IA:
+        raise HTTPException(status_code=400, detail=f"Difficulté inconnue : {difficulte}")
+    if relais.actif and not relais.est_locale(id_salle):
+        await relais.demander_ia(id_salle, difficulte, {"demandeur": id_joueur})
+        return {"salle": id_salle, "joueur": None, "difficulte": difficulte}
+    try:
+        joueur = await lancer_ia(id_salle, difficulte, demandeur=id_joueur)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"salle": joueur.salle.id, "joueur": joueur.id_joueur, "difficulte": difficulte}
+
+def options_salle(params):
+    """
+    Taille de grille, flotte et accueil des spectateurs demandés pour la création
+    d'une salle (défauts sinon ; ?spectateurs=0 ferme la salle aux spectateurs).
+    """
+    try:
+        taille = int(params.get("taille") or TAILLE_GRILLE)
+    except ValueError:
+        raise ValueError("Taille de grille invalide") from None
+    return taille, params.get("flotte") or FLOTTE_PAR_DEFAUT, params.get("spectateurs") != "0"
+
+async def accueillir_spectateur(salle, connexion):
+    """
+    Exécuté par l'acteur de la salle : inscrit le spectateur et lui envoie l'instantané
+    public, sans événement intercalé entre les deux. Retourne False si c'est impossible.
+    """
+    if gestionnaire_parties.salle_par_id(salle.id) is not salle:
+        return False
+    if not salle.spectateurs:
+        await connexion.send_json({"action": "erreur", "message": "Cette salle n'accepte pas de spectateurs."})
+        return False
+    if not tribunes.ajouter(salle.id, connexion):
+        await connexion.send_json({"action": "erreur", "message": "Trop de spectateurs dans cette salle."})
+        return False
+    await connexion.send_json(message_spectateur(salle))
+    return True
+
+async def servir_spectateur(websocket, connexion, id_salle):
+    """
+    Session d'un spectateur : lecture seule, seules les réponses au battement de cœur sont lues.
+    L'arrivée compte comme un message pour la limite par adresse IP (ouvertures en rafale).
+    """
+    salle = gestionnaire_parties.salle_par_id(id_salle)
+    try:
+        if not limiteur.autoriser_ip(websocket.client.host if websocket.client else None):
+            await connexion.send_json({"action": "erreur", "message": "Trop de connexions : ralentissez."})
+            await connexion.vider()
+            return
+        if salle is None or not await salle.acteur.soumettre(accueillir_spectateur, salle, connexion):
+            if salle is None:
+                await connexion.send_json({"action": "erreur", "message": "Salle introuvable."})
+            await connexion.vider()
+            return
+        definir_contexte(salle=salle.id)
+        journaliser(logging.INFO, "spectateur_connecte", spectateurs=tribunes.nombre(salle.id))
+        while True:
+            try:
+                await recevoir_message(websocket)
+            except WebSocketDisconnect:
+                raise
+            except Exception:
+                break
+            connexion.noter_reception()
+    except (WebSocketDisconnect, SalleFermee):
+        pass
+    finally:
+        if salle is not None:
+            tribunes.retirer(salle.id, connexion)
+        await connexion.fermer()
+
 @app.websocket("/ws/game/{id_salle}")
 async def websocket_jeu(websocket: WebSocket, id_salle: str):
     """
     Endpoint WebSocket principal du jeu.
     Gère la session temps réel entre serveur et client.
+    L'identifiant réservé ID_SALLE_APPARIEMENT ("auto") place le joueur dans la file d'appariement.
+    Un client qui propose SOUS_PROTOCOLE_BINAIRE échange des trames binaires compactes (JSON sinon).
+    Le paramètre ?ia=<difficulté> ajoute un adversaire IA si le joueur est seul dans sa salle.
+    Les paramètres ?taille=<n>&flotte=<nom ou tailles> configurent une salle nommée à sa création.
+    Le paramètre ?reprise=<jeton> reprend une place gardée après une coupure (instantané immédiat) ;
+    un jeton périmé est signalé par "reprise_refusee" et la connexion rejoint la salle normalement.
+    Le paramètre ?spectateur=1 suit une salle existante en lecture seule (voir spectateurs.py) ;
+    une salle créée avec ?spectateurs=0 les refuse.
+    Dans une grappe, une salle d'une autre partition est servie par relais (voir relais.py).
     """
-    await websocket.accept()
+    params = dict(websocket.query_params)
+    if relais.actif:
+        id_salle, params = await relais.router(id_salle, params)
+        if not relais.est_locale(id_salle):
+            await relais.relayer(websocket, id_salle, params)
+            return
+    binaire = SOUS_PROTOCOLE_BINAIRE in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=SOUS_PROTOCOLE_BINAIRE if binaire else None)
+    # Toutes les écritures passent par la file d'envoi de la connexion
+    connexion = Connexion(websocket, binaire=binaire)
+    connexion.demarrer()
+    if params.get("spectateur"):
+        await servir_spectateur(websocket, connexion, id_salle)
+        return
     id_joueur = str(uuid.uuid4())
+    ip_client = websocket.client.host if websocket.client else None
     salle = None
+    reprise = None
+    jeton = params.get("reprise")
 
     try:
-        try:
-            salle = gestionnaire_parties.rejoindre_salle(id_joueur, ws=websocket, id_salle=id_salle)
+        if jeton:
+            reprise = await reprendre_session(jeton, connexion)
+            if reprise is None:
+                await connexion.send_json({
+                    "action": "reprise_refusee",
+                    "message": "Session expirée : vous rejoignez une nouvelle partie."
+                })
+        if reprise:
+            salle, id_joueur = reprise
             index_joueur = salle.joueurs[id_joueur]
-        except Exception as e:
-            await websocket.send_json({"action": "erreur", "message": str(e)})
-            await websocket.close()
-            return
+        else:
+            try:
+                taille, flotte, spectateurs = options_salle(params)
+                salle = gestionnaire_parties.rejoindre_salle(
+                    id_joueur,
+                    ws=connexion,
+                    id_salle=None if id_salle == ID_SALLE_APPARIEMENT else id_salle,
+                    taille=taille,
+                    flotte=flotte,
+                    spectateurs=spectateurs,
+                )
+                index_joueur = salle.joueurs[id_joueur]
+                if params.get("appariement"):
+                    salle.appariement = True
+            except Exception as e:
+                journaliser(logging.INFO, "connexion_refusee", salle=id_salle, erreur=str(e))
+                await connexion.send_json({"action": "erreur", "message": str(e)})
+                await connexion.vider_et_fermer()
+                return
 
-        if len(salle.joueurs) == 2:
-            for pid, ws2 in salle.ws.items():
-                idx = salle.joueurs[pid]
-                await ws2.send_json({
-                    "action": "ready",
-                    "message": f"Joueur {idx} connecté, la partie peut commencer !"
-                })
+        # Salle et joueur accompagnent toutes les entrées émises par cette connexion
+        definir_contexte(salle=salle.id, joueur=id_joueur)
+        journaliser(logging.INFO, "connexion", index=index_joueur, binaire=binaire, reprise=bool(reprise))
+
+        if not reprise:
+            if len(salle.joueurs) == 2:
+                await salle.acteur.soumettre(diffuser, salle, message_ready)
+            elif salle.appariement and relais.actif:
+                await relais.proposer_salle(salle.id)
+
+            # Partie solo : un joueur IA rejoint la salle (il annonce lui-même que la salle est complète)
+            difficulte_ia = params.get("ia")
+            if difficulte_ia is not None and len(salle.joueurs) == 1:
+                try:
+                    await lancer_ia(salle.id, difficulte_ia or DIFFICULTE_IA)
+                except ValueError as e:
+                    await connexion.send_json({"action": "erreur", "message": str(e)})
 
         while True:
             try:
-                donnees = await websocket.receive_json()
-                print(f"Message reçu: {donnees}")
+                donnees = await recevoir_message(websocket)
+                connexion.noter_reception()
+                journaliser_echantillon(logging.DEBUG, "message_recu", donnees=donnees)
+            except WebSocketDisconnect:
+                raise
             except Exception as e:
-                print(f"Erreur pendant receive_json: {e}")
-                traceback.print_exc()
+                ECHECS_VALIDATION.inc("decodage")
+                # La trace complète n'est utile (et calculée) qu'en mode debug
+                journaliser(logging.WARNING, "message_illisible", erreur=repr(e),
+                            exc_info=journal.isEnabledFor(logging.DEBUG))
                 break
 
+            # Réponse au battement de cœur : déjà prise en compte par noter_reception
+            if isinstance(donnees, dict) and donnees.get("action") == "pong":
+                continue
+
             # Vérifie que le joueur est toujours bien dans la salle
-            if id_joueur not in salle.joueurs or salle.ws[id_joueur] != websocket:
+            if id_joueur not in salle.joueurs or salle.ws[id_joueur] is not connexion:
                 break
 
-            action = donnees.get("action")
-            if not action:
-                await websocket.send_json({
+            # Limite globale par adresse IP, avant toute validation
+            if not limiteur.autoriser_ip(ip_client):
+                await connexion.send_json({
                     "action": "erreur",
-                    "message": "Champ 'action' manquant."
+                    "message": "Trop de messages : ralentissez."
                 })
                 continue
 
-            # -- Validation via Pydantic --
-            Modele = MODELES_ACTIONS.get(action)
-            if not Modele:
-                await websocket.send_json({
-                    "action": "erreur",
-                    "message": f"Action inconnue : {action}"
-                })
-                continue
-            try:
-                payload = Modele(**donnees)
-            except ValidationError as ve:
-                await websocket.send_json({
-                    "action": "erreur",
-                    "message": f"Message invalide pour l'action {action} : {ve.errors()}"
-                })
-                continue
-
-            # -- Dispatch automatique vers le bon gestionnaire --
-            gestionnaire = GESTIONNAIRES_ACTIONS.get(action)
-            if gestionnaire:
-                await gestionnaire(websocket, salle, id_joueur, index_joueur, payload)
-            else:
-                await websocket.send_json({
-                    "action": "erreur",
-                    "message": f"Action non supportée côté serveur : {action}"
-                })
+            await traiter_action(connexion, salle, id_joueur, index_joueur, donnees)
 
     except WebSocketDisconnect:
-        print(f"[WS] Déconnexion du client {id_joueur}")
+        journaliser(logging.INFO, "deconnexion")
+
+    except SalleFermee:
+        pass  # La salle a été supprimée pendant la session
 
     finally:
         if salle:
             try:
-                adversaire_id = salle.id_adversaire(id_joueur)
-                salle.retirer_joueur(id_joueur)
-                gestionnaire_parties.quitter_salle(id_joueur)
-                # Si l'adversaire est encore connecté, notifie-le
-                if adversaire_id and adversaire_id in salle.ws:
-                    try:
-                        await salle.ws[adversaire_id].send_json({
-                            "action": "adversaire_deconnecte",
-                            "message": "L'adversaire s'est déconnecté."
-                        })
-                    except:
-                        pass
+                await salle.acteur.soumettre(gerer_coupure, salle, id_joueur, connexion)
             except Exception:
-                pass  # La salle peut déjà être supprimée si vide
\ No newline at end of file
+                pass  # La salle peut déjà être supprimée si vide
+        await connexion.fermer()
\ No newline at end of file
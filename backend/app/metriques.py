@@ -0,0 +1,147 @@
+# *******************************************************
+# Nom ......... : metriques.py
+# Rôle ........ : Métriques du serveur au format texte Prometheus
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Petit registre de compteurs et d'histogrammes sans dépendance.
+#                 Tout le serveur tourne sur une seule boucle asyncio : un incrément
+#                 est une simple écriture dans un dict, sans verrou. Les valeurs déjà
+#                 tenues ailleurs (salles, sockets, rejets anti-spam, octets envoyés)
+#                 ne sont pas dupliquées : des collecteurs les lisent au moment où
+#                 /metrics est interrogé.
+#
+# Technologies  : Python
+# Dépendances . : bisect, typing
+# Usage ....... : DUREE_ACTIONS.observer("attaque", 0.0012); registre.exposer()
+# *******************************************************
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Seuils (secondes) des histogrammes de latence, du dixième de milliseconde à la seconde
+SEUILS_LATENCE = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+def _echapper(valeur) -> str:
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _etiquettes(noms, valeurs) -> str:
+    if not noms:
+        return ""
+    return "{" + ",".join(f'{nom}="{_echapper(valeur)}"' for nom, valeur in zip(noms, valeurs)) + "}"
+
+def _nombre(valeur) -> str:
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+class Compteur:
+    """
+    Compteur monotone, éventuellement étiqueté (une valeur par combinaison d'étiquettes).
+    """
+
+    def __init__(self, nom: str, aide: str, etiquettes: Tuple[str, ...] = ()):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = etiquettes
+        self.valeurs: Dict[tuple, float] = {}
+
+    def inc(self, *valeurs_etiquettes, n=1):
+        self.valeurs[valeurs_etiquettes] = self.valeurs.get(valeurs_etiquettes, 0) + n
+
+    def exposer(self) -> Iterable[str]:
+        yield f"# HELP {self.nom} {self.aide}"
+        yield f"# TYPE {self.nom} counter"
+        for valeurs, total in self.valeurs.items():
+            yield f"{self.nom}{_etiquettes(self.etiquettes, valeurs)} {_nombre(total)}"
+
+class Histogramme:
+    """
+    Histogramme à seuils fixes, étiqueté par une seule dimension (ex. l'action).
+    Une observation coûte une recherche dichotomique et deux additions.
+    """
+
+    def __init__(self, nom: str, aide: str, etiquette: str, seuils=SEUILS_LATENCE):
+        self.nom = nom
+        self.aide = aide
+        self.etiquette = etiquette
+        self.seuils = tuple(seuils)
+        self.series: Dict[str, list] = {}  # valeur d'étiquette -> [compte par seuil..., +Inf, somme]
+
+    def observer(self, valeur_etiquette: str, valeur: float):
+        serie = self.series.get(valeur_etiquette)
+        if serie is None:
+            serie = self.series[valeur_etiquette] = [0] * (len(self.seuils) + 1) + [0.0]
+        serie[bisect_left(self.seuils, valeur)] += 1
+        serie[-1] += valeur
+
+    def exposer(self) -> Iterable[str]:
+        yield f"# HELP {self.nom} {self.aide}"
+        yield f"# TYPE {self.nom} histogram"
+        for valeur_etiquette, serie in self.series.items():
+            cumul = 0
+            for seuil, compte in zip(self.seuils + ("+Inf",), serie):
+                cumul += compte
+                etiquettes = _etiquettes((self.etiquette, "le"), (valeur_etiquette, seuil))
+                yield f"{self.nom}_bucket{etiquettes} {cumul}"
+            etiquettes = _etiquettes((self.etiquette,), (valeur_etiquette,))
+            yield f"{self.nom}_sum{etiquettes} {_nombre(serie[-1])}"
+            yield f"{self.nom}_count{etiquettes} {cumul}"
+
+class Collecteur:
+    """
+    Métrique lue à la demande : `lire()` retourne [(valeurs_etiquettes, valeur), ...].
+    Sert pour les jauges (salles actives...) et les compteurs tenus par d'autres modules.
+    """
+
+    def __init__(self, nom: str, aide: str, type_: str, lire: Callable[[], List[Tuple[tuple, float]]],
+                 etiquettes: Tuple[str, ...] = ()):
+        self.nom = nom
+        self.aide = aide
+        self.type = type_
+        self.lire = lire
+        self.etiquettes = etiquettes
+
+    def exposer(self) -> Iterable[str]:
+        yield f"# HELP {self.nom} {self.aide}"
+        yield f"# TYPE {self.nom} {self.type}"
+        for valeurs, valeur in self.lire():
+            yield f"{self.nom}{_etiquettes(self.etiquettes, valeurs)} {_nombre(valeur)}"
+
+class Registre:
+    """
+    Ensemble des métriques exposées sur /metrics.
+    """
+
+    def __init__(self):
+        self.metriques = []
+
+    def enregistrer(self, metrique):
+        self.metriques.append(metrique)
+        return metrique
+
+    def exposer(self) -> str:
+        """
+        Texte au format d'exposition Prometheus (version 0.0.4).
+        """
+        return "\n".join(ligne for m in self.metriques for ligne in m.exposer()) + "\n"
+
+# Registre et métriques partagés par le serveur
+registre = Registre()
+
+DUREE_ACTIONS = registre.enregistrer(Histogramme(
+    "bataille_action_duree_secondes",
+    "Durée de traitement d'une action (attente dans la boîte de la salle comprise).",
+    "action",
+))
+MESSAGES_RECUS = registre.enregistrer(Compteur(
+    "bataille_messages_recus_total",
+    "Messages WebSocket reçus des clients.",
+))
+OCTETS_RECUS = registre.enregistrer(Compteur(
+    "bataille_octets_recus_total",
+    "Octets reçus des clients (charge utile des trames).",
+))
+ECHECS_VALIDATION = registre.enregistrer(Compteur(
+    "bataille_echecs_validation_total",
+    "Messages rejetés avant traitement, par raison.",
+    ("raison",),
+))
@@ -73,6 +73,13 @@ class ReinitialisationPlacementPayload(BaseModel):
     """
     action: Literal["reinitialisation_placement"]
 
+class DemandeGrillePayload(BaseModel):
+    """
+    Demande d'un envoi complet de sa grille par le client (versions désynchronisées).
+    """
+    action: Literal["demande_grille"]
+    version: Optional[int] = None
+
 class AttaquePayload(BaseModel):
     """
     Données pour l'action d'attaque sur la grille adverse.
@@ -94,6 +101,15 @@ class ResultatAttaquePayload(BaseModel):
     positions_coule: Optional[List[Coordonnee]] = None
     symbole_cle: Optional[str] = None
 
+class DeltaGrillePayload(BaseModel):
+    """
+    Cases modifiées d'une grille entre deux versions ([x, y, état] par case).
+    """
+    action: Literal["delta_grille"]
+    version_base: int
+    version: int
+    cases: List[Tuple[int, int, EtatCellule]]
+
 class FinPartiePayload(BaseModel):
     """
     Données envoyées à la fin de la partie.
@@ -117,8 +133,10 @@ TousPayloads = Union[
     PlacementNavirePayload,
     ConfirmationPlacementPayload,
     ReinitialisationPlacementPayload,
+    DemandeGrillePayload,
     AttaquePayload,
     ResultatAttaquePayload,
+    DeltaGrillePayload,
     FinPartiePayload,
     MessageGeneriquePayload,
     SimpleActionPayload,
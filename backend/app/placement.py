@@ -0,0 +1,291 @@
+# *******************************************************
+# Nom ......... : placement.py
+# Rôle ........ : Génération aléatoire de flottes via un index des placements légaux
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Maintient, pour chaque taille de navire, l'ensemble des placements
+#                 encore légaux (règle de non-contact comprise). Chaque navire posé
+#                 retire uniquement les placements qui touchent sa zone d'exclusion,
+#                 et le tirage se fait uniformément dans cet ensemble. Un retour
+#                 arrière garantit de trouver une flotte dès qu'une solution existe.
+#                 Pour les flottes peu denses, un tirage par rejet (même loi
+#                 uniforme sur les placements légaux) évite de construire l'index :
+#                 son coût ne dépend que de la flotte, pas de la surface de la grille
+#                 (l'index, lui, énumère toute la grille : réservé aux flottes denses
+#                 sur des grilles de moins de CASES_INDEX_MAX placements).
+#                 Le tirage est borné par une échéance : au-delà, PlacementImpossible est
+#                 levée au lieu de chercher indéfiniment. flotte_placable() vérifie à la
+#                 création d'une salle, en O(navires), qu'une disposition existe.
+#
+# Technologies  : Python
+# Dépendances . : random, time, functools, typing
+# Usage ....... : Utilisé par LogiqueJeu.placement_automatique
+# *******************************************************
+
+import random
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Sens canoniques d'un placement : les orientations HL et VU couvrent les mêmes
+# cases que HR et VD depuis une autre origine, elles ne sont donc pas dupliquées.
+HORIZONTAL = 0
+VERTICAL = 1
+ORIENTATIONS = ("HR", "VD")
+
+# Nombre de rejets consécutifs tolérés avant de basculer sur l'index exact
+ESSAIS_REJET = 32
+# Au-delà de ce nombre de placements à indexer (cases x tailles de navires), pas de recherche exacte
+CASES_INDEX_MAX = 200_000
+
+class PlacementImpossible(Exception):
+    """
+    Levée quand aucune flotte n'a pu être tirée (aucune disposition, ou échéance dépassée).
+    """
+
+def emprise_flotte(tailles_navires: Sequence[int]) -> int:
+    """
+    Cases couvertes par les navires et leur marge de non-contact : (L + 2) x 3 par navire.
+    """
+    return sum((taille_navire + 2) * 3 for taille_navire in tailles_navires)
+
+def flotte_placable(taille_grille: int, tailles_navires: Sequence[int]) -> bool:
+    """
+    Indique si la flotte tient largement dans la grille : emprise inférieure à la grille
+    bordée de sa marge, et disposition constructive dans la moitié des rangées (navires
+    horizontaux, une rangée sur deux, les plus grands d'abord dans la première rangée où
+    ils tiennent), un huitième sur une grille trop grande pour la recherche exacte.
+    Une flotte acceptée existe toujours, avec assez de place libre pour que le tirage
+    aléatoire la trouve vite ; les flottes plus serrées sont refusées.
+    """
+    if max(tailles_navires) > taille_grille or emprise_flotte(tailles_navires) > (taille_grille + 2) ** 2:
+        return False
+    rangees = (taille_grille + 1) // 2
+    part = 2 if taille_grille * taille_grille * len(set(tailles_navires)) <= CASES_INDEX_MAX else 8
+    libres = [taille_grille + 1] * -(-rangees // part)  # Place restante par rangée, marge comprise
+    for taille_navire in sorted(tailles_navires, reverse=True):
+        for rangee, libre in enumerate(libres):
+            if libre >= taille_navire + 1:
+                libres[rangee] = libre - taille_navire - 1
+                break
+        else:
+            return False
+    return True
+
+@lru_cache(maxsize=64)
+def _candidats(taille_grille: int, taille_navire: int) -> Tuple[int, ...]:
+    """
+    Énumère tous les placements d'un navire dans une grille vide.
+    Un placement est codé par l'entier indice_depart * 2 + sens.
+    """
+    codes = []
+    sens_possibles = (HORIZONTAL,) if taille_navire == 1 else (HORIZONTAL, VERTICAL)
+    for x in range(taille_grille):
+        for y in range(taille_grille):
+            for sens in sens_possibles:
+                fin_x = x + (taille_navire - 1 if sens == VERTICAL else 0)
+                fin_y = y + (taille_navire - 1 if sens == HORIZONTAL else 0)
+                if fin_x < taille_grille and fin_y < taille_grille:
+                    codes.append((x * taille_grille + y) * 2 + sens)
+    return tuple(codes)
+
+def tirer_placement(taille_grille: int, taille_navire: int, rng=random) -> Optional[int]:
+    """
+    Tire uniformément un placement dans une grille vide, sans les énumérer :
+    les deux sens comptent autant de placements (grille carrée). None si le navire ne tient pas.
+    """
+    departs = taille_grille - taille_navire + 1  # Départs possibles dans le sens du navire
+    if departs <= 0:
+        return None
+    sens = HORIZONTAL if taille_navire == 1 else rng.randrange(2)
+    if sens == HORIZONTAL:
+        x, y = rng.randrange(taille_grille), rng.randrange(departs)
+    else:
+        x, y = rng.randrange(departs), rng.randrange(taille_grille)
+    return (x * taille_grille + y) * 2 + sens
+
+def cases_placement(taille_grille: int, taille_navire: int, code: int) -> List[Tuple[int, int]]:
+    """
+    Renvoie les coordonnées couvertes par un placement codé.
+    """
+    x, y = divmod(code >> 1, taille_grille)
+    if code & 1 == VERTICAL:
+        return [(x + i, y) for i in range(taille_navire)]
+    return [(x, y + i) for i in range(taille_navire)]
+
+class IndexPlacements:
+    """
+    Ensemble indexé des placements encore légaux, par taille de navire.
+    Retrait, réinsertion et tirage uniforme se font en O(1) (liste + position).
+    """
+
+    def __init__(self, taille_grille: int, tailles_navires: Sequence[int]):
+        self.taille = taille_grille
+        self.legaux: Dict[int, List[int]] = {}
+        self.positions: Dict[int, Dict[int, int]] = {}
+        for taille_navire in set(tailles_navires):
+            codes = _candidats(taille_grille, taille_navire)
+            self.legaux[taille_navire] = list(codes)
+            self.positions[taille_navire] = {code: i for i, code in enumerate(codes)}
+
+    def nombre(self, taille_navire: int) -> int:
+        """
+        Nombre de placements encore légaux pour une taille de navire.
+        """
+        return len(self.legaux[taille_navire])
+
+    def tirer(self, taille_navire: int, rng=random) -> int:
+        """
+        Tire uniformément un placement légal (l'ensemble ne doit pas être vide).
+        """
+        legaux = self.legaux[taille_navire]
+        return legaux[rng.randrange(len(legaux))]
+
+    def retirer(self, taille_navire: int, code: int) -> bool:
+        """
+        Retire un placement de l'ensemble. Retourne False s'il n'y était pas.
+        """
+        positions = self.positions[taille_navire]
+        i = positions.pop(code, None)
+        if i is None:
+            return False
+        legaux = self.legaux[taille_navire]
+        dernier = legaux.pop()
+        if dernier != code:
+            legaux[i] = dernier
+            positions[dernier] = i
+        return True
+
+    def ajouter(self, taille_navire: int, code: int):
+        """
+        Réinsère un placement précédemment retiré.
+        """
+        self.positions[taille_navire][code] = len(self.legaux[taille_navire])
+        self.legaux[taille_navire].append(code)
+
+    def exclure_zone(self, cases) -> List[Tuple[int, int]]:
+        """
+        Retire tous les placements qui couvrent l'une des cases données.
+        Retourne la liste des (taille, code) retirés, pour pouvoir les restaurer.
+        """
+        n = self.taille
+        retires = []
+        for taille_navire in self.legaux:
+            for x, y in cases:
+                for k in range(taille_navire):
+                    if y - k >= 0 and self.retirer(taille_navire, (x * n + y - k) * 2 + HORIZONTAL):
+                        retires.append((taille_navire, (x * n + y - k) * 2 + HORIZONTAL))
+                    if x - k >= 0 and self.retirer(taille_navire, ((x - k) * n + y) * 2 + VERTICAL):
+                        retires.append((taille_navire, ((x - k) * n + y) * 2 + VERTICAL))
+        return retires
+
+    def restaurer(self, retires):
+        """
+        Réinsère des placements retirés par exclure_zone (ordre inverse).
+        """
+        for taille_navire, code in reversed(retires):
+            self.ajouter(taille_navire, code)
+
+def _zone(taille_grille: int, positions) -> List[Tuple[int, int]]:
+    """
+    Renvoie les cases d'un navire et de leur voisinage (8-connexité), sans doublon.
+    """
+    zone = set()
+    for x, y in positions:
+        for xj in range(max(0, x - 1), min(taille_grille, x + 2)):
+            for yj in range(max(0, y - 1), min(taille_grille, y + 2)):
+                zone.add((xj, yj))
+    return list(zone)
+
+def _depassee(echeance: Optional[float]) -> bool:
+    return echeance is not None and time.monotonic() > echeance
+
+def _tirage_par_rejet(taille_grille: int, tailles_navires: Sequence[int], ordre, rng,
+                      echeance: Optional[float] = None) -> Optional[Dict[int, int]]:
+    """
+    Tire chaque navire uniformément parmi tous ses placements et rejette ceux qui
+    touchent la zone interdite : conditionné à l'acceptation, le tirage reste
+    uniforme sur les placements légaux. Retourne None si un navire dépasse ESSAIS_REJET
+    ou si l'échéance est dépassée.
+    """
+    interdites = set()
+    choix = {}
+    for i in ordre:
+        taille_navire = tailles_navires[i]
+        if taille_navire > taille_grille or _depassee(echeance):
+            return None
+        for _ in range(ESSAIS_REJET):
+            code = tirer_placement(taille_grille, taille_navire, rng)
+            positions = cases_placement(taille_grille, taille_navire, code)
+            if not any(case in interdites for case in positions):
+                choix[i] = code
+                interdites.update(_zone(taille_grille, positions))
+                break
+        else:
+            return None
+    return choix
+
+def _recherche_exacte(taille_grille: int, tailles_navires: Sequence[int], ordre, rng,
+                      echeance: Optional[float] = None) -> Optional[Dict[int, int]]:
+    """
+    Recherche avec retour arrière sur l'index des placements légaux.
+    Retourne None si aucune disposition n'existe ; lève PlacementImpossible à l'échéance.
+    """
+    index = IndexPlacements(taille_grille, tailles_navires)
+    choix: Dict[int, int] = {}
+
+    def placer(rang: int) -> bool:
+        if rang == len(ordre):
+            return True
+        taille_navire = tailles_navires[ordre[rang]]
+        essayes = []
+        trouve = False
+        while index.nombre(taille_navire):
+            if _depassee(echeance):
+                raise PlacementImpossible("Placement automatique trop long pour cette flotte")
+            code = index.tirer(taille_navire, rng)
+            index.retirer(taille_navire, code)
+            essayes.append(code)
+            retires = index.exclure_zone(_zone(taille_grille, cases_placement(taille_grille, taille_navire, code)))
+            # Élagage : chaque navire restant doit conserver au moins un placement légal
+            restants_possibles = all(index.nombre(tailles_navires[i]) for i in ordre[rang + 1:])
+            if restants_possibles and placer(rang + 1):
+                choix[ordre[rang]] = code
+                trouve = True
+                break
+            index.restaurer(retires)
+        if not trouve:
+            for code in essayes:
+                index.ajouter(taille_navire, code)
+        return trouve
+
+    return choix if placer(0) else None
+
+def generer_flotte(taille_grille: int, tailles_navires: Sequence[int], rng=random,
+                   delai: Optional[float] = None) -> List[Tuple[int, int, str]]:
+    """
+    Tire une flotte complète respectant la règle de non-contact.
+    Retourne un triplet (x, y, orientation) par navire, dans l'ordre de `tailles_navires`.
+    Avec une échéance (`delai` secondes), une grande grille (index trop coûteux) ne
+    recommence que le tirage par rejet, et la recherche exacte s'arrête à l'échéance. Lève PlacementImpossible si aucune disposition
+    n'existe ou si l'échéance est dépassée.
+    """
+    echeance = time.monotonic() + delai if delai is not None else None
+    # Les plus grands navires d'abord : l'espace de recherche se réduit plus vite
+    ordre = sorted(range(len(tailles_navires)), key=lambda i: -tailles_navires[i])
+    choix = _tirage_par_rejet(taille_grille, tailles_navires, ordre, rng, echeance)
+    indexable = taille_grille * taille_grille * len(set(tailles_navires)) <= CASES_INDEX_MAX
+    while choix is None and not indexable and echeance is not None:
+        if _depassee(echeance):
+            raise PlacementImpossible("Placement automatique trop long pour cette flotte")
+        choix = _tirage_par_rejet(taille_grille, tailles_navires, ordre, rng, echeance)
+    if choix is None:
+        choix = _recherche_exacte(taille_grille, tailles_navires, ordre, rng, echeance)
+    if choix is None:
+        raise PlacementImpossible("Impossible de placer la flotte sur cette grille")
+    flotte = []
+    for i in range(len(tailles_navires)):
+        x, y = divmod(choix[i] >> 1, taille_grille)
+        flotte.append((x, y, ORIENTATIONS[choix[i] & 1]))
+    return flotte
@@ -0,0 +1,194 @@
+# *******************************************************
+# Nom ......... : plateau.py
+# Rôle ........ : Représentation creuse du plateau d'un joueur
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Ne stocke que les cases de navires (indice de case -> navire) et
+#                 les cases visées : la mémoire et le coût d'un tir sont proportionnels
+#                 aux navires et aux tirs, jamais à la surface de la grille (une grille
+#                 1000x1000 coûte autant qu'une 10x10). Les tirs sont un ensemble
+#                 d'indices, ou un masque de bits jusqu'à TAILLE_MAX_MASQUE (au plus
+#                 512 octets, bien plus compact qu'un ensemble). Les touches,
+#                 les navires coulés et la victoire sont détectés en O(1) ou en
+#                 O(taille du navire), sans parcourir toute la grille.
+#
+# Technologies  : Python
+# Dépendances . : typing
+# Usage ....... : Utilisé par game_logic.py comme moteur interne de LogiqueJeu
+# *******************************************************
+
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+# Codes de résultat d'un tir (renvoyés par Plateau.tirer)
+MANQUE = 0
+TOUCHE = 1
+COULE = 2
+GAGNE = 3
+DEJA_ATTAQUE = 4
+INVALIDE = 5
+
+# Jusqu'à cette taille de grille, les tirs tiennent dans un masque de bits
+TAILLE_MAX_MASQUE = 64
+
+class Plateau:
+    """
+    Plateau creux d'un joueur.
+    La case (x, y) a pour indice x * taille + y.
+    """
+
+    __slots__ = ("taille", "tirs", "cases", "touches", "case_vers_navire", "cases_intactes")
+
+    def __init__(self, taille: int):
+        self.taille = taille
+        # Cases déjà visées : masque de bits (petite grille) ou ensemble d'indices
+        self.tirs: Union[int, Set[int]] = 0 if taille <= TAILLE_MAX_MASQUE else set()
+        self.cases: List[Tuple[Tuple[int, int], ...]] = []  # Coordonnées de chaque navire
+        self.touches: List[int] = []                        # Nombre de cases touchées par navire
+        self.case_vers_navire: Dict[int, int] = {}          # indice de case -> indice du navire
+        self.cases_intactes = 0     # Cases de navires encore non touchées (0 = flotte coulée)
+
+    def indice(self, x: int, y: int) -> int:
+        """
+        Renvoie l'indice associé à la case (x, y).
+        """
+        return x * self.taille + y
+
+    def dans_grille(self, x: int, y: int) -> bool:
+        """
+        Indique si la case (x, y) est dans les limites du plateau.
+        """
+        return 0 <= x < self.taille and 0 <= y < self.taille
+
+    def est_vise(self, indice: int) -> bool:
+        """
+        Indique si la case d'indice donné a déjà été visée.
+        """
+        if isinstance(self.tirs, int):
+            return (self.tirs >> indice) & 1 == 1
+        return indice in self.tirs
+
+    def un_seul_tir(self) -> bool:
+        """
+        Indique si le plateau a reçu exactement un tir (masque : une puissance de deux).
+        """
+        if isinstance(self.tirs, int):
+            return self.tirs != 0 and self.tirs & (self.tirs - 1) == 0
+        return len(self.tirs) == 1
+
+    def indices_vises(self) -> Iterable[int]:
+        """
+        Indices des cases déjà visées (dans l'ordre croissant pour un masque).
+        """
+        if not isinstance(self.tirs, int):
+            return self.tirs
+        indices = []
+        masque = self.tirs
+        while masque:
+            bit = masque & -masque
+            indices.append(bit.bit_length() - 1)
+            masque ^= bit
+        return indices
+
+    def peut_placer(self, positions) -> bool:
+        """
+        Vérifie qu'un navire peut occuper les positions données :
+        dans la grille, sur des cases libres et sans contact avec un autre navire
+        (aucun navire sur les cases ni sur leurs 8 voisines).
+        """
+        taille = self.taille
+        for x, y in positions:
+            if not (0 <= x < taille and 0 <= y < taille):
+                return False
+        occupees = self.case_vers_navire
+        if not occupees:
+            return True
+        for x, y in positions:
+            for xj in range(max(0, x - 1), min(taille, x + 2)):
+                for yj in range(max(0, y - 1), min(taille, y + 2)):
+                    if xj * taille + yj in occupees:
+                        return False
+        return True
+
+    def placer(self, positions) -> int:
+        """
+        Ajoute un navire sur le plateau (positions supposées valides).
+        Retourne l'indice du navire.
+        """
+        indice_navire = len(self.cases)
+        self.cases.append(tuple(positions))
+        self.touches.append(0)
+        for x, y in positions:
+            self.case_vers_navire[x * self.taille + y] = indice_navire
+        self.cases_intactes += len(positions)
+        return indice_navire
+
+    def tirer(self, x: int, y: int) -> Tuple[int, int]:
+        """
+        Applique un tir sur la case (x, y).
+        Retourne (code_resultat, indice_navire) ; indice_navire vaut -1 si aucun navire n'est touché.
+        """
+        if not (0 <= x < self.taille and 0 <= y < self.taille):
+            return INVALIDE, -1
+        indice = x * self.taille + y
+        if self.est_vise(indice):
+            return DEJA_ATTAQUE, self.case_vers_navire.get(indice, -1)
+        if isinstance(self.tirs, int):
+            self.tirs |= 1 << indice
+        else:
+            self.tirs.add(indice)
+        indice_navire = self.case_vers_navire.get(indice)
+        if indice_navire is None:
+            return MANQUE, -1
+        self.touches[indice_navire] += 1
+        self.cases_intactes -= 1
+        if self.touches[indice_navire] < len(self.cases[indice_navire]):
+            return TOUCHE, indice_navire
+        if self.cases_intactes == 0:
+            return GAGNE, indice_navire
+        return COULE, indice_navire
+
+    def figer(self):
+        """
+        Image des tirs reçus (tirs, touches par navire, cases intactes), à redonner à restaurer().
+        """
+        tirs = self.tirs if isinstance(self.tirs, int) else frozenset(self.tirs)
+        return tirs, tuple(self.touches), self.cases_intactes
+
+    def restaurer(self, image):
+        """
+        Remet les tirs reçus dans l'état d'une image de figer() (mêmes navires supposés placés).
+        """
+        tirs, touches, self.cases_intactes = image
+        self.tirs = tirs if isinstance(tirs, int) else set(tirs)
+        self.touches = list(touches)
+
+    def est_coule(self, indice_navire: int) -> bool:
+        """
+        Indique si le navire donné est entièrement touché.
+        """
+        return self.touches[indice_navire] == len(self.cases[indice_navire])
+
+    def flotte_coulee(self) -> bool:
+        """
+        Indique si tous les navires du plateau sont coulés (faux si aucun navire).
+        """
+        return bool(self.cases) and self.cases_intactes == 0
+
+    def cases_non_vides(self) -> List[Tuple[int, int]]:
+        """
+        Renvoie, dans l'ordre des indices, les coordonnées des cases occupées par un navire ou déjà visées.
+        """
+        return self.coordonnees(set(self.indices_vises()).union(self.case_vers_navire))
+
+    def cases_visees(self) -> List[Tuple[int, int]]:
+        """
+        Renvoie, dans l'ordre des indices, les coordonnées des cases déjà visées par l'adversaire.
+        """
+        return self.coordonnees(self.indices_vises())
+
+    def coordonnees(self, indices) -> List[Tuple[int, int]]:
+        """
+        Convertit des indices de cases en coordonnées, triées par indice.
+        """
+        return [divmod(indice, self.taille) for indice in sorted(indices)]
@@ -0,0 +1,232 @@
+# *******************************************************
+# Nom ......... : protocole_binaire.py
+# Rôle ........ : Sous-protocole WebSocket binaire compact (optionnel, JSON par défaut)
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Encode les messages du jeu (mêmes dicts que le protocole JSON) dans
+#                 des trames binaires auto-délimitées, inspirées de MessagePack :
+#                 petits entiers sur un octet, et un dictionnaire partagé qui remplace
+#                 les clés, noms d'actions et valeurs fréquentes par un seul octet.
+#                 Un tir ("attaque") tient en 9 octets au lieu de 40 en JSON.
+#                 Le client choisit ce format en proposant SOUS_PROTOCOLE_BINAIRE
+#                 à l'ouverture de la WebSocket.
+#
+#                 Étiquettes (un octet, suivi éventuellement d'une charge) :
+#                   0x00-0x7F  entier 0..127
+#                   0x80-0xBF  entrée 0..63 du dictionnaire
+#                   0xC0 None, 0xC1 False, 0xC2 True
+#                   0xC3 entier signé 64 bits, 0xC4 flottant 64 bits (petit-boutiste)
+#                   0xC5 chaîne  : longueur (varint) + UTF-8
+#                   0xC6 liste   : nombre (varint) + éléments
+#                   0xC7 objet   : nombre (varint) + paires clé/valeur
+#                   0xC8 entrée 64..319 du dictionnaire (un octet d'indice - 64)
+#                 Le dictionnaire ne fait que s'allonger : une entrée n'est jamais
+#                 déplacée ni retirée sans changer le nom du sous-protocole.
+#
+# Technologies  : Python
+# Dépendances . : struct
+# Usage ....... : trame = encoder_binaire(message); message = decoder_binaire(trame)
+# *******************************************************
+
+import struct
+
+# Nom négocié via l'en-tête Sec-WebSocket-Protocol
+SOUS_PROTOCOLE_BINAIRE = "bataille-navale.bin.v1"
+
+# Chaînes remplacées par leur indice (ordre figé, identique dans frontend/src/utils/binaire.js)
+DICTIONNAIRE = (
+    # Clés
+    "action", "message", "coordonnees", "resultat", "type_joueur", "peut_rejouer",
+    "nom_navire", "positions_coule", "taille_navire", "orientation", "version",
+    "version_base", "cases", "grille", "tour_joueur", "player_index", "player_id",
+    "gagnant_id", "victoire", "waiting_player", "messages", "symbole_cle",
+    # Actions du client
+    "join", "joueur_pret", "demande_placement_auto", "confirmation_placement",
+    "reinitialisation_placement", "placer_navire", "attaque", "demande_grille",
+    "rejouer", "deconnexion",
+    # Actions du serveur
+    "lot", "player_joined", "ready", "debut_placement", "attente_adversaire", "erreur",
+    "erreur_placement", "mise_a_jour_grille", "delta_grille", "placement_confirme",
+    "tous_navires_prets", "debut_tour", "changement_tour", "resultat_attaque",
+    "fin_partie", "attente_rejouer", "restart", "adversaire_deconnecte",
+    # Valeurs fréquentes
+    "touche", "manque", "coule", "gagne", "deja_attaque", "attaquant", "defenseur",
+    "~", "O", "X", "HR", "VD", "HL", "VU",
+    # Entrées étendues (étiquette 0xC8)
+    "S", "Porte-avions", "Croiseur", "Contre-torpilleur", "Sous-marin", "Torpilleur",
+    "C'est votre tour !", "Tour de l'adversaire.",
+    "ping", "pong",
+    "taille_grille", "navires", "taille", "nom",
+    "spectateur", "attaquant_index", "gagnant_index", "tirs", "joueurs", "phase", "spectateurs",
+    "rediffusion",
+)
+INDICES_DICTIONNAIRE = {chaine: i for i, chaine in enumerate(DICTIONNAIRE)}
+
+NONE, FAUX, VRAI = 0xC0, 0xC1, 0xC2
+ENTIER, FLOTTANT, CHAINE, LISTE, OBJET, DICTIONNAIRE_ETENDU = 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8
+
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+
+class TrameInvalide(ValueError):
+    """
+    Levée quand une trame binaire reçue est tronquée ou mal formée.
+    """
+
+def _varint(n: int, sortie: bytearray):
+    """
+    Écrit un entier positif en LEB128 (7 bits par octet).
+    """
+    while n > 0x7F:
+        sortie.append((n & 0x7F) | 0x80)
+        n >>= 7
+    sortie.append(n)
+
+def _encoder_chaine(chaine: str, sortie: bytearray):
+    indice = INDICES_DICTIONNAIRE.get(chaine)
+    if indice is not None:
+        if indice < 64:
+            sortie.append(0x80 | indice)
+        else:
+            sortie.append(DICTIONNAIRE_ETENDU)
+            sortie.append(indice - 64)
+        return
+    donnees = chaine.encode()
+    sortie.append(CHAINE)
+    _varint(len(donnees), sortie)
+    sortie += donnees
+
+def _encoder_valeur(valeur, sortie: bytearray):
+    # Ordre des tests : les types les plus fréquents d'abord (bool avant int)
+    if valeur.__class__ is str:
+        _encoder_chaine(valeur, sortie)
+    elif valeur is True:
+        sortie.append(VRAI)
+    elif valeur is False:
+        sortie.append(FAUX)
+    elif valeur is None:
+        sortie.append(NONE)
+    elif isinstance(valeur, int):
+        if 0 <= valeur <= 0x7F:
+            sortie.append(valeur)
+        else:
+            sortie.append(ENTIER)
+            sortie += _INT64.pack(valeur)
+    elif isinstance(valeur, (list, tuple)):
+        sortie.append(LISTE)
+        _varint(len(valeur), sortie)
+        for element in valeur:
+            _encoder_valeur(element, sortie)
+    elif isinstance(valeur, dict):
+        sortie.append(OBJET)
+        _varint(len(valeur), sortie)
+        for cle, element in valeur.items():
+            _encoder_chaine(cle, sortie)
+            _encoder_valeur(element, sortie)
+    elif isinstance(valeur, float):
+        sortie.append(FLOTTANT)
+        sortie += _FLOAT64.pack(valeur)
+    elif isinstance(valeur, str):
+        _encoder_chaine(str(valeur), sortie)
+    else:
+        raise TypeError(f"Type non encodable : {type(valeur).__name__}")
+
+def encoder_binaire(message) -> bytes:
+    """
+    Encode un message (dict JSON-compatible) en trame binaire.
+    """
+    sortie = bytearray()
+    _encoder_valeur(message, sortie)
+    return bytes(sortie)
+
+def encoder_lot_binaire(trames) -> bytes:
+    """
+    Équivalent binaire de diffusion.encoder_lot : les trames étant auto-délimitées,
+    le lot est un objet {"action": "lot", "messages": [...]} dont la liste est une simple concaténation.
+    """
+    if len(trames) == 1:
+        return trames[0]
+    entete = bytearray((OBJET, 2, 0x80 | INDICES_DICTIONNAIRE["action"], 0x80 | INDICES_DICTIONNAIRE["lot"],
+                        0x80 | INDICES_DICTIONNAIRE["messages"], LISTE))
+    _varint(len(trames), entete)
+    return bytes(entete) + b"".join(trames)
+
+def _lire_varint(trame, pos):
+    n = decalage = 0
+    while True:
+        if pos >= len(trame):
+            raise TrameInvalide("Trame tronquée")
+        octet = trame[pos]
+        pos += 1
+        n |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return n, pos
+        decalage += 7
+        if decalage > 63:
+            raise TrameInvalide("Longueur invalide")
+
+def _decoder_valeur(trame, pos, profondeur):
+    if pos >= len(trame):
+        raise TrameInvalide("Trame tronquée")
+    if profondeur > 32:
+        raise TrameInvalide("Imbrication trop profonde")
+    etiquette = trame[pos]
+    pos += 1
+    if etiquette < 0x80:
+        return etiquette, pos
+    if etiquette < 0xC0:
+        return DICTIONNAIRE[etiquette & 0x3F], pos
+    if etiquette == NONE:
+        return None, pos
+    if etiquette == FAUX:
+        return False, pos
+    if etiquette == VRAI:
+        return True, pos
+    if etiquette == DICTIONNAIRE_ETENDU:
+        if pos >= len(trame) or trame[pos] + 64 >= len(DICTIONNAIRE):
+            raise TrameInvalide("Entrée de dictionnaire inconnue")
+        return DICTIONNAIRE[trame[pos] + 64], pos + 1
+    if etiquette in (ENTIER, FLOTTANT):
+        if pos + 8 > len(trame):
+            raise TrameInvalide("Trame tronquée")
+        format_ = _INT64 if etiquette == ENTIER else _FLOAT64
+        return format_.unpack_from(trame, pos)[0], pos + 8
+    if etiquette == CHAINE:
+        longueur, pos = _lire_varint(trame, pos)
+        if pos + longueur > len(trame):
+            raise TrameInvalide("Trame tronquée")
+        try:
+            return bytes(trame[pos:pos + longueur]).decode(), pos + longueur
+        except UnicodeDecodeError:
+            raise TrameInvalide("Chaîne UTF-8 invalide")
+    if etiquette == LISTE:
+        nombre, pos = _lire_varint(trame, pos)
+        if nombre > len(trame) - pos:
+            raise TrameInvalide("Trame tronquée")
+        liste = []
+        for _ in range(nombre):
+            element, pos = _decoder_valeur(trame, pos, profondeur + 1)
+            liste.append(element)
+        return liste, pos
+    if etiquette == OBJET:
+        nombre, pos = _lire_varint(trame, pos)
+        if nombre > len(trame) - pos:
+            raise TrameInvalide("Trame tronquée")
+        objet = {}
+        for _ in range(nombre):
+            cle, pos = _decoder_valeur(trame, pos, profondeur + 1)
+            if not isinstance(cle, str):
+                raise TrameInvalide("Clé d'objet non textuelle")
+            objet[cle], pos = _decoder_valeur(trame, pos, profondeur + 1)
+        return objet, pos
+    raise TrameInvalide(f"Étiquette inconnue : {etiquette:#x}")
+
+def decoder_binaire(trame: bytes):
+    """
+    Décode une trame binaire complète ; lève TrameInvalide si elle est mal formée.
+    """
+    valeur, pos = _decoder_valeur(trame, 0, 0)
+    if pos != len(trame):
+        raise TrameInvalide("Octets en trop après le message")
+    return valeur
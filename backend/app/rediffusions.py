@@ -0,0 +1,378 @@
+# *******************************************************
+# Nom ......... : rediffusions.py
+# Rôle ........ : Export compact des parties terminées et lecture à n'importe quel coup
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : À la fin d'une partie, ses flottes et la liste ordonnée de ses tirs
+#                 sont encodées en un enregistrement de quelques centaines d'octets
+#                 (un tir = un octet en 10x10), gardé en mémoire pour les dernières
+#                 parties et ajouté à l'archive des parties (archive.py, DOSSIER_REDIFFUSIONS),
+#                 où les parties plus anciennes sont retrouvées par son index.
+#                 etat() rend les deux grilles après n'importe quel coup : une image
+#                 clé des plateaux est prise tous les INTERVALLE_IMAGES_CLES coups au
+#                 premier accès, puis chaque consultation repart de l'image précédente
+#                 et ne rejoue que les derniers coups (jamais depuis le coup zéro).
+#
+#                 Enregistrement (entiers en LEB128 zigzag, comme journal_parties.py) :
+#                   horodatage, salle, taille, flotte, gagnant (-1 : aucun)
+#                   pour chaque joueur : nombre de navires, puis par navire
+#                     indice dans la flotte (-1 : suivi de sa taille et de son nom)
+#                     et (indice de case << 2) | orientation
+#                   nombre de tirs, puis les tirs à largeur fixe (1 à 3 octets, petit-boutiste) :
+#                     (indice de case << 1) | attaquant, taille * taille pour un tir hors grille
+#
+# Technologies  : Python
+# Dépendances . : collections, time, uuid, app.config, app.game_logic, app.journal_parties, app.archive
+# Usage ....... : id_partie = rediffusions.exporter(salle.id, logique)
+#                 rediffusions.etat(id_partie, 42)
+# *******************************************************
+
+import time
+import uuid
+from collections import OrderedDict
+
+from .config import REDIFFUSIONS_EN_MEMOIRE, INTERVALLE_IMAGES_CLES
+from .game_logic import LogiqueJeu, composer_flotte
+from .journal_parties import JournalCorrompu, ORIENTATIONS, _varint, _lire_varint
+from .archive import archive_parties, ouvrir_archives
+
+DECODEES_MAX = 64  # Rediffusions gardées décodées, avec leurs images clés
+
+def largeur_coups(taille: int) -> int:
+    """
+    Octets d'un tir pour une grille de cette taille (indice hors grille et bit d'attaquant compris).
+    """
+    return ((taille * taille * 2 + 1).bit_length() + 7) // 8
+
+def _chaine(texte: str, sortie: bytearray):
+    brut = texte.encode("utf-8")
+    _varint(len(brut), sortie)
+    sortie += brut
+
+def _lire_chaine(donnees, pos: int):
+    longueur, pos = _lire_varint(donnees, pos)
+    if pos + longueur > len(donnees):
+        raise JournalCorrompu("Chaîne tronquée")
+    return bytes(donnees[pos:pos + longueur]).decode("utf-8"), pos + longueur
+
+def gagnant_partie(logique: LogiqueJeu) -> int:
+    """
+    Index du joueur qui a coulé toute la flotte adverse, -1 si la partie n'est pas finie.
+    """
+    return next((j for j in (0, 1) if logique.plateaux[1 - j].flotte_coulee()), -1)
+
+def encoder_rediffusion(logique: LogiqueJeu, id_salle: str = "", horodatage: int = 0) -> bytes:
+    """
+    Encode une partie (flottes placées et tirs joués) en un enregistrement de rediffusion.
+    """
+    taille = logique.taille
+    sortie = bytearray()
+    _varint(horodatage, sortie)
+    _chaine(id_salle, sortie)
+    _varint(taille, sortie)
+    _chaine(logique.flotte, sortie)
+    _varint(gagnant_partie(logique), sortie)
+    indices_flotte = {(n["nom"], n["taille"]): k for k, n in enumerate(logique.composition)}
+    for navires in logique.navires:
+        _varint(len(navires), sortie)
+        for navire in navires:
+            k = indices_flotte.get((navire.nom, navire.taille), -1)
+            _varint(k, sortie)
+            if k < 0:
+                _varint(navire.taille, sortie)
+                _chaine(navire.nom, sortie)
+            x, y = navire.coordonnees
+            _varint(((x * taille + y) << 2) | ORIENTATIONS.index(navire.orientation), sortie)
+    coups = logique.coups or ()
+    _varint(len(coups), sortie)
+    largeur = largeur_coups(taille)
+    if largeur == 1:
+        sortie += bytes(iter(coups))
+    else:
+        for coup in coups:
+            sortie += coup.to_bytes(largeur, "little")
+    return bytes(sortie)
+
+class Rediffusion:
+    """
+    Partie décodée : flottes, tirs et images clés des plateaux (construites au premier accès).
+    """
+
+    __slots__ = ("horodatage", "id_salle", "taille", "flotte", "gagnant", "flottes", "coups",
+                 "octets", "intervalle", "images")
+
+    def __init__(self, horodatage, id_salle, taille, flotte, gagnant, flottes, coups, octets,
+                 intervalle=INTERVALLE_IMAGES_CLES):
+        self.horodatage = horodatage
+        self.id_salle = id_salle
+        self.taille = taille
+        self.flotte = flotte
+        self.gagnant = gagnant
+        self.flottes = flottes    # Par joueur : [(taille, nom, x, y, orientation), ...]
+        self.coups = coups        # Tirs encodés, dans l'ordre
+        self.octets = octets
+        self.intervalle = max(1, intervalle)
+        self.images = None        # images[i] : plateaux avant le coup i * intervalle
+
+    def resume(self) -> dict:
+        return {
+            "salle": self.id_salle,
+            "date": self.horodatage,
+            "taille_grille": self.taille,
+            "flotte": self.flotte,
+            "navires": list(composer_flotte(self.flotte)),
+            "coups": len(self.coups),
+            "gagnant_index": self.gagnant,
+            "octets": self.octets,
+        }
+
+    def partie(self) -> LogiqueJeu:
+        """
+        Partie au coup zéro : flottes placées, aucun tir.
+        """
+        logique = LogiqueJeu(self.taille, self.flotte)
+        for joueur, navires in enumerate(self.flottes):
+            for taille, nom, x, y, orientation in navires:
+                logique.placer_navire(joueur, taille, (x, y), orientation, nom)
+        return logique
+
+    def jouer(self, logique: LogiqueJeu, numero: int):
+        """
+        Rejoue le tir numéro `numero` ; retourne (attaquant, (x, y), résultat de traiter_attaque).
+        """
+        coup = self.coups[numero]
+        indice, attaquant = coup >> 1, coup & 1
+        x, y = divmod(indice, self.taille) if indice < self.taille * self.taille else (-1, -1)
+        return attaquant, (x, y), logique.traiter_attaque(1 - attaquant, x, y)
+
+    def construire_images(self):
+        """
+        Un seul passage sur la partie : image des deux plateaux tous les `intervalle` coups.
+        """
+        logique = self.partie()
+        images = []
+        for numero in range(len(self.coups)):
+            if numero % self.intervalle == 0:
+                images.append(tuple(plateau.figer() for plateau in logique.plateaux))
+            self.jouer(logique, numero)
+        self.images = images
+
+    def etat(self, coup: int):
+        """
+        Partie après `coup` tirs, reprise depuis l'image clé précédente.
+        Retourne (logique, dernier tir ou None, nombre de coups rejoués).
+        Lève IndexError si le coup n'existe pas.
+        """
+        if not 0 <= coup <= len(self.coups):
+            raise IndexError(f"Coup entre 0 et {len(self.coups)}")
+        logique = self.partie()
+        if coup == 0:
+            return logique, None, 0
+        if self.images is None:
+            self.construire_images()
+        # Le dernier tir est toujours rejoué : son résultat accompagne l'état
+        image = (coup - 1) // self.intervalle
+        for plateau, etat_plateau in zip(logique.plateaux, self.images[image]):
+            plateau.restaurer(etat_plateau)
+        depart = image * self.intervalle
+        for numero in range(depart, coup):
+            dernier = self.jouer(logique, numero)
+        return logique, dernier, coup - depart
+
+def decoder_rediffusion(donnees, intervalle: int = INTERVALLE_IMAGES_CLES) -> Rediffusion:
+    """
+    Décode un enregistrement de rediffusion (sans en-tête de fichier).
+    Lève JournalCorrompu s'il est tronqué ou mal formé.
+    """
+    horodatage, pos = _lire_varint(donnees, 0)
+    id_salle, pos = _lire_chaine(donnees, pos)
+    taille, pos = _lire_varint(donnees, pos)
+    flotte, pos = _lire_chaine(donnees, pos)
+    gagnant, pos = _lire_varint(donnees, pos)
+    try:
+        composition = composer_flotte(flotte)
+    except ValueError as e:
+        raise JournalCorrompu(str(e)) from None
+    flottes = []
+    for _ in (0, 1):
+        nombre, pos = _lire_varint(donnees, pos)
+        navires = []
+        for _ in range(nombre):
+            k, pos = _lire_varint(donnees, pos)
+            if k < 0:
+                taille_navire, pos = _lire_varint(donnees, pos)
+                nom, pos = _lire_chaine(donnees, pos)
+            elif k < len(composition):
+                taille_navire, nom = composition[k]["taille"], composition[k]["nom"]
+            else:
+                raise JournalCorrompu(f"Navire inconnu : {k}")
+            position, pos = _lire_varint(donnees, pos)
+            x, y = divmod(position >> 2, taille)
+            navires.append((taille_navire, nom, x, y, ORIENTATIONS[position & 3]))
+        flottes.append(navires)
+    nombre, pos = _lire_varint(donnees, pos)
+    largeur = largeur_coups(taille)
+    if pos + nombre * largeur != len(donnees):
+        raise JournalCorrompu("Liste de tirs tronquée")
+    if largeur == 1:
+        coups = list(donnees[pos:])
+    else:
+        coups = [int.from_bytes(donnees[i:i + largeur], "little") for i in range(pos, len(donnees), largeur)]
+    return Rediffusion(horodatage, id_salle, taille, flotte, gagnant, flottes, coups, len(donnees), intervalle)
+
+class Rediffusions:
+    """
+    Rediffusions du processus : enregistrements des dernières parties en mémoire,
+    tous ajoutés à l'archive, et quelques rediffusions décodées pour les consultations.
+    Les identifiants commencent par la date de fin en hexadécimal (voir archive.py).
+    """
+
+    def __init__(self, archive=archive_parties, en_memoire: int = REDIFFUSIONS_EN_MEMOIRE,
+                 intervalle: int = INTERVALLE_IMAGES_CLES):
+        self.archive = archive
+        self.en_memoire = en_memoire
+        self.intervalle = intervalle
+        self.lecteurs = None            # Lecteurs des archives du dossier, ouverts au premier besoin
+        # Reprise de la dernière date de l'archive : l'index reste trié après un redémarrage
+        self.derniere_date = archive.derniere_date() if archive.dossier else 0
+        self.recentes = OrderedDict()   # id_partie -> enregistrement
+        self.decodees = OrderedDict()   # id_partie -> Rediffusion
+        # Compteurs exposés par /statistiques/rediffusions et /metrics
+        self.exportees = 0
+        self.octets_exportes = 0
+        self.consultations = 0
+        self.coups_rejoues = 0
+
+    def exporter(self, id_salle: str, logique: LogiqueJeu) -> str:
+        """
+        Enregistre la partie terminée d'une salle ; retourne l'identifiant de la rediffusion.
+        """
+        # Dates croissantes : l'index de l'archive reste trié même si l'horloge recule
+        date = self.derniere_date = max(int(time.time()), self.derniere_date)
+        id_partie = f"{date:08x}{uuid.uuid4().hex[:8]}"
+        donnees = encoder_rediffusion(logique, id_salle, date)
+        self.recentes[id_partie] = donnees
+        while len(self.recentes) > self.en_memoire:
+            self.recentes.popitem(last=False)
+        self.archive.archiver(id_partie, date, logique.taille, len(logique.coups or ()),
+                              gagnant_partie(logique), donnees)
+        self.exportees += 1
+        self.octets_exportes += len(donnees)
+        return id_partie
+
+    def archives(self, rafraichir: bool = False):
+        """
+        Lecteurs des archives (une par worker), projections étendues si `rafraichir`.
+        """
+        if not self.archive.dossier:
+            return []
+        if self.lecteurs is None or rafraichir:
+            connus = {lecteur.chemin for lecteur in self.lecteurs or ()}
+            if rafraichir:
+                for lecteur in self.lecteurs or ():
+                    lecteur.rafraichir()
+            self.lecteurs = (self.lecteurs or []) + [
+                lecteur for lecteur in ouvrir_archives(self.archive.dossier) if lecteur.chemin not in connus
+            ]
+        return self.lecteurs
+
+    def donnees(self, id_partie: str):
+        """
+        Enregistrement d'une rediffusion (mémoire, sinon archive, sans copie),
+        None si elle est inconnue.
+        """
+        donnees = self.recentes.get(id_partie)
+        if donnees is not None:
+            return donnees
+        for rafraichir in (False, True):
+            for lecteur in self.archives(rafraichir):
+                partie = lecteur.chercher(id_partie)
+                if partie is not None:
+                    return partie[-1]
+        return None
+
+    def charger(self, id_partie: str):
+        """
+        Rediffusion décodée (gardée avec ses images clés), None si elle est inconnue.
+        """
+        rediffusion = self.decodees.get(id_partie)
+        if rediffusion is not None:
+            self.decodees.move_to_end(id_partie)
+            return rediffusion
+        donnees = self.donnees(id_partie)
+        if donnees is None:
+            return None
+        rediffusion = self.decodees[id_partie] = decoder_rediffusion(donnees, self.intervalle)
+        if len(self.decodees) > DECODEES_MAX:
+            self.decodees.popitem(last=False)
+        return rediffusion
+
+    def etat(self, id_partie: str, coup: int):
+        """
+        Grilles complètes des deux joueurs après `coup` tirs, None si la rediffusion est inconnue.
+        Lève IndexError si le coup n'existe pas.
+        """
+        rediffusion = self.charger(id_partie)
+        if rediffusion is None:
+            return None
+        logique, dernier, rejoues = rediffusion.etat(coup)
+        self.consultations += 1
+        self.coups_rejoues += rejoues
+        dernier_tir = None
+        if dernier is not None:
+            attaquant, (x, y), resultat = dernier
+            dernier_tir = {"attaquant_index": attaquant, "coordonnees": [x, y], "resultat": resultat["resultat"]}
+        return {
+            "id": id_partie,
+            "coup": coup,
+            "coups": len(rediffusion.coups),
+            "tour_joueur": rediffusion.coups[coup] & 1 if coup < len(rediffusion.coups) else None,
+            "dernier_tir": dernier_tir,
+            "grilles": [logique.instantane_grille(joueur)[1] for joueur in (0, 1)],
+            "rejoues": rejoues,
+        }
+
+    def lister(self, nombre: int = 50, depuis=None, jusqua=None) -> list:
+        """
+        Résumés des dernières parties gardées en mémoire, de la plus récente à la plus ancienne ;
+        avec une période (dates en secondes), parties de l'archive terminées dans [depuis, jusqua[.
+        """
+        if depuis is not None or jusqua is not None:
+            return self.lister_archive(nombre, depuis or 0, jusqua if jusqua is not None else 2 ** 63 - 1)
+        resumes = []
+        for id_partie in reversed(self.recentes):
+            if len(resumes) >= nombre:
+                break
+            resumes.append({"id": id_partie, **decoder_rediffusion(self.recentes[id_partie]).resume()})
+        return resumes
+
+    def lister_archive(self, nombre: int, depuis: int, jusqua: int) -> list:
+        """
+        Résumés des premières parties archivées dans [depuis, jusqua[, toutes archives confondues.
+        """
+        resumes = []
+        for lecteur in self.archives(rafraichir=True):
+            for id_partie, _, _, _, _, donnees in lecteur.entre(depuis, jusqua):
+                resumes.append({"id": id_partie, **decoder_rediffusion(donnees).resume()})
+                if len(resumes) >= nombre:
+                    break
+        resumes.sort(key=lambda resume: resume["id"])
+        return resumes[:nombre]
+
+    def statistiques(self) -> dict:
+        return {
+            "archivees": self.archive.parties,
+            "erreurs_archive": self.archive.erreurs,
+            "exportees": self.exportees,
+            "octets_exportes": self.octets_exportes,
+            "octets_par_partie": self.octets_exportes // self.exportees if self.exportees else 0,
+            "en_memoire": len(self.recentes),
+            "decodees": len(self.decodees),
+            "consultations": self.consultations,
+            "coups_rejoues": self.coups_rejoues,
+            "intervalle_images_cles": self.intervalle,
+        }
+
+# Rediffusions du processus
+rediffusions = Rediffusions()
@@ -0,0 +1,282 @@
+# *******************************************************
+# Nom ......... : relais.py
+# Rôle ........ : Répartition des salles entre processus workers (affinité par id_salle)
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Avec plusieurs workers, chaque salle appartient à une seule partition :
+#                 crc32(id_salle) % NB_PARTITIONS. Toute sa logique s'exécute dans le
+#                 processus propriétaire. Une WebSocket arrivée sur un autre worker y est
+#                 seulement relayée : ses trames partent telles quelles sur le canal de la
+#                 partition propriétaire, qui les rejoue dans websocket_jeu à travers une
+#                 WebSocketDistante, et les réponses reviennent sur le canal de la connexion.
+#                 L'appariement ("auto") passe par une file partagée du backend d'état.
+#                 Avec une seule partition (défaut), rien n'est relayé.
+#
+#                 Trame relayée : type (1 octet) + [identifiant de connexion (16 octets)] + charge
+#                   vers une partition : OUVRIR (JSON), TEXTE, OCTETS, FERMER, IA (JSON)
+#                   vers une connexion : TEXTE, OCTETS, FERMER (code sur 2 octets)
+#
+# Technologies  : Python, asyncio
+# Dépendances . : asyncio, json, logging, uuid, zlib, app.config, app.etat_partage,
+#                 app.connexion, app.protocole_binaire, app.reprise, app.journalisation
+# Usage ....... : if not relais.est_locale(id_salle): await relais.relayer(websocket, id_salle, params)
+# *******************************************************
+
+import asyncio
+import json
+import logging
+import uuid
+import zlib
+
+from .config import NB_PARTITIONS, PARTITION, BACKEND_ETAT, ID_SALLE_APPARIEMENT
+from .etat_partage import creer_backend
+from .connexion import Connexion
+from .protocole_binaire import SOUS_PROTOCOLE_BINAIRE
+from .reprise import verifier_jeton
+from .journalisation import journaliser
+
+OUVRIR, TEXTE, OCTETS, FERMER, IA = range(1, 6)
+CLE_APPARIEMENT = "bataille:appariement"
+
+def partition_de(id_salle: str, nb_partitions: int = NB_PARTITIONS) -> int:
+    """
+    Partition propriétaire d'une salle (stable d'un processus et d'un redémarrage à l'autre).
+    """
+    return zlib.crc32(id_salle.encode("utf-8")) % nb_partitions
+
+def canal_partition(partition: int) -> str:
+    return f"bataille:partition:{partition}"
+
+def canal_connexion(cid: bytes) -> str:
+    return f"bataille:connexion:{cid.hex()}"
+
+class ClientDistant:
+    """
+    Équivalent de websocket.client pour une connexion relayée.
+    """
+
+    def __init__(self, host):
+        self.host = host
+
+class WebSocketDistante:
+    """
+    Côté partition propriétaire : présente une connexion relayée avec l'interface
+    de WebSocket utilisée par websocket_jeu et Connexion.
+    """
+
+    def __init__(self, relais, cid: bytes, ouverture: dict):
+        self.relais = relais
+        self.cid = cid
+        self.canal = canal_connexion(cid)
+        self.query_params = ouverture.get("params", {})
+        self.scope = {"subprotocols": ouverture.get("sous_protocoles", [])}
+        self.client = ClientDistant(ouverture["ip"]) if ouverture.get("ip") else None
+        self.entrees = asyncio.Queue()  # messages ASGI reçus du worker d'entrée
+        self.fermee = False
+
+    async def accept(self, subprotocol=None):
+        pass  # Déjà acceptée par le worker d'entrée
+
+    async def receive(self) -> dict:
+        return await self.entrees.get()
+
+    async def send_text(self, texte: str):
+        await self.relais.backend.publier(self.canal, bytes((TEXTE,)) + texte.encode("utf-8"))
+
+    async def send_bytes(self, donnees: bytes):
+        await self.relais.backend.publier(self.canal, bytes((OCTETS,)) + donnees)
+
+    async def close(self, code: int = 1000):
+        if not self.fermee:
+            self.fermee = True
+            await self.relais.backend.publier(self.canal, bytes((FERMER,)) + code.to_bytes(2, "big"))
+
+class Relais:
+    """
+    Routage des connexions vers la partition propriétaire de leur salle.
+    """
+
+    def __init__(self, partition: int = PARTITION, nb_partitions: int = NB_PARTITIONS, url: str = BACKEND_ETAT):
+        self.partition = partition
+        self.nb_partitions = nb_partitions
+        self.url = url
+        self.backend = None
+        self.sessions = {}  # cid -> WebSocketDistante servie ici pour un autre worker
+        self.ouvrir_session = None
+        self.lancer_ia = None
+        # Compteurs exposés par /statistiques/partitions
+        self.connexions_relayees = 0
+        self.sessions_distantes = 0
+
+    @property
+    def actif(self) -> bool:
+        return self.nb_partitions > 1
+
+    def est_locale(self, id_salle: str) -> bool:
+        return not self.actif or partition_de(id_salle, self.nb_partitions) == self.partition
+
+    async def demarrer(self, ouvrir_session, lancer_ia):
+        """
+        Se connecte au backend et écoute le canal de sa partition.
+        `ouvrir_session(websocket, id_salle)` sert une connexion relayée (websocket_jeu) ;
+        `lancer_ia(id_salle, difficulte, appariement)` ajoute un joueur IA demandé par un autre worker.
+        """
+        if not self.actif:
+            return
+        self.ouvrir_session = ouvrir_session
+        self.lancer_ia = lancer_ia
+        self.backend = creer_backend(self.url)
+        await self.backend.abonner(canal_partition(self.partition), self._recevoir)
+        journaliser(logging.INFO, "partition_demarree", partition=self.partition,
+                    partitions=self.nb_partitions, backend=self.url)
+
+    async def arreter(self):
+        if self.backend is not None:
+            await self.backend.fermer()
+            self.backend = None
+
+    # ---- Côté worker d'entrée ----
+
+    async def router(self, id_salle: str, params: dict):
+        """
+        Détermine la salle réellement visée : celle du jeton de reprise, ou une salle de la
+        file d'appariement partagée (sinon une nouvelle) pour ID_SALLE_APPARIEMENT.
+        Retourne (id_salle, params) ; params["appariement"] marque une salle d'appariement.
+        """
+        identite = verifier_jeton(params["reprise"]) if params.get("reprise") else None
+        if identite is not None:
+            return identite[0], params
+        if id_salle == ID_SALLE_APPARIEMENT:
+            en_attente = await self.backend.retirer(CLE_APPARIEMENT)
+            return en_attente or str(uuid.uuid4()), {**params, "appariement": "1"}
+        return id_salle, params
+
+    async def proposer_salle(self, id_salle: str):
+        """
+        Met une salle d'appariement incomplète à disposition des autres workers.
+        """
+        await self.backend.pousser(CLE_APPARIEMENT, id_salle)
+
+    async def demander_ia(self, id_salle: str, difficulte: str, params: dict):
+        """
+        Demande à la partition propriétaire d'ajouter un joueur IA dans la salle.
+        """
+        charge = json.dumps({"salle": id_salle, "difficulte": difficulte, "params": params}).encode("utf-8")
+        await self.backend.publier(canal_partition(partition_de(id_salle, self.nb_partitions)),
+                                   bytes((IA,)) + bytes(16) + charge)
+
+    async def relayer(self, websocket, id_salle: str, params: dict):
+        """
+        Accepte la WebSocket du client et relaie ses trames, dans les deux sens,
+        avec la partition propriétaire de la salle, jusqu'à la fermeture d'un côté.
+        """
+        sous_protocoles = websocket.scope.get("subprotocols", [])
+        binaire = SOUS_PROTOCOLE_BINAIRE in sous_protocoles
+        await websocket.accept(subprotocol=SOUS_PROTOCOLE_BINAIRE if binaire else None)
+        connexion = Connexion(websocket, binaire=binaire)
+        connexion.demarrer()
+        cid = uuid.uuid4().bytes
+        cible = canal_partition(partition_de(id_salle, self.nb_partitions))
+        fermeture = asyncio.get_running_loop().create_future()
+        self.connexions_relayees += 1
+
+        def recevoir(donnees: bytes):
+            genre = donnees[0]
+            if genre == TEXTE:
+                connexion.deposer(donnees[1:].decode("utf-8"))
+            elif genre == OCTETS:
+                connexion.deposer(bytes(donnees[1:]))
+            elif genre == FERMER and not fermeture.done():
+                fermeture.set_result(int.from_bytes(donnees[1:3], "big"))
+
+        await self.backend.abonner(canal_connexion(cid), recevoir)
+        ouverture = {
+            "salle": id_salle,
+            "params": params,
+            "sous_protocoles": sous_protocoles,
+            "ip": websocket.client.host if websocket.client else None,
+        }
+        await self.backend.publier(cible, bytes((OUVRIR,)) + cid + json.dumps(ouverture).encode("utf-8"))
+        lecture = asyncio.create_task(self._lire_client(websocket, cible, cid))
+        try:
+            await asyncio.wait({lecture, fermeture}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            lecture.cancel()
+            await self.backend.desabonner(canal_connexion(cid))
+            if fermeture.done():
+                await connexion.vider()  # La partition a fermé : derniers messages puis fermeture
+                await connexion.fermer(fermeture.result())
+            else:
+                fermeture.cancel()
+                await self.backend.publier(cible, bytes((FERMER,)) + cid)
+                await connexion.fermer()
+
+    async def _lire_client(self, websocket, cible: str, cid: bytes):
+        """
+        Transmet les trames du client à la partition propriétaire, sans les décoder.
+        """
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                await self.backend.publier(cible, bytes((OCTETS,)) + cid + message["bytes"])
+            else:
+                await self.backend.publier(cible, bytes((TEXTE,)) + cid + message["text"].encode("utf-8"))
+
+    # ---- Côté partition propriétaire ----
+
+    def _recevoir(self, donnees: bytes):
+        """
+        Trame reçue sur le canal de la partition (appelée par le backend, sans attendre).
+        """
+        genre, cid, charge = donnees[0], bytes(donnees[1:17]), donnees[17:]
+        if genre == OUVRIR:
+            ouverture = json.loads(charge)
+            websocket = self.sessions[cid] = WebSocketDistante(self, cid, ouverture)
+            self.sessions_distantes += 1
+            asyncio.ensure_future(self._servir(websocket, ouverture["salle"]))
+            return
+        if genre == IA:
+            demande = json.loads(charge)
+            asyncio.ensure_future(self._ajouter_ia(demande))
+            return
+        websocket = self.sessions.get(cid)
+        if websocket is None:
+            return
+        if genre == TEXTE:
+            websocket.entrees.put_nowait({"type": "websocket.receive", "text": bytes(charge).decode("utf-8")})
+        elif genre == OCTETS:
+            websocket.entrees.put_nowait({"type": "websocket.receive", "bytes": bytes(charge)})
+        elif genre == FERMER:
+            websocket.entrees.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+    async def _servir(self, websocket, id_salle):
+        try:
+            await self.ouvrir_session(websocket, id_salle)
+        finally:
+            self.sessions.pop(websocket.cid, None)
+            await websocket.close()
+
+    async def _ajouter_ia(self, demande):
+        try:
+            params = demande.get("params", {})
+            await self.lancer_ia(demande["salle"], demande["difficulte"],
+                                 bool(params.get("appariement")), params.get("demandeur"))
+        except Exception as e:
+            journaliser(logging.WARNING, "ia_refusee", salle=demande["salle"], erreur=str(e))
+
+    def statistiques(self) -> dict:
+        return {
+            "partition": self.partition,
+            "partitions": self.nb_partitions,
+            "backend": self.url,
+            "connexions_relayees": self.connexions_relayees,
+            "sessions_distantes_actives": len(self.sessions),
+            "sessions_distantes": self.sessions_distantes,
+            "reconnexions_courtier": getattr(self.backend, "reconnexions", 0),
+        }
+
+# Relais du processus courant
+relais = Relais()
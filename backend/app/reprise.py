@@ -0,0 +1,62 @@
+# *******************************************************
+# Nom ......... : reprise.py
+# Rôle ........ : Jetons signés de reprise de session après une coupure réseau
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : À son arrivée, chaque joueur reçoit un jeton qui associe sa salle
+#                 à son identifiant et à une date d'expiration (DUREE_JETON_REPRISE),
+#                 signé par HMAC-SHA256 avec CLÉ_SECRÈTE. Sans clé configurée, une clé
+#                 aléatoire est tirée au démarrage : jamais de clé connue d'avance. Après
+#                 une coupure, le client rouvre la WebSocket avec ?reprise=<jeton> :
+#                 si sa place est encore gardée (délai de grâce), il la reprend et
+#                 reçoit aussitôt un instantané de la partie, sans autre échange.
+#                 Le jeton ne donne rien une fois la place libérée, ni après son expiration.
+#
+# Technologies  : Python
+# Dépendances . : base64, hashlib, hmac, secrets, time, typing, app.config
+# Usage ....... : jeton = creer_jeton(salle.id, id_joueur); verifier_jeton(jeton) -> (id_salle, id_joueur)
+# *******************************************************
+
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Optional, Tuple
+
+from .config import CLÉ_SECRÈTE, DUREE_JETON_REPRISE
+
+_CLE = CLÉ_SECRÈTE.encode("utf-8") if CLÉ_SECRÈTE else secrets.token_bytes(32)
+TAILLE_SIGNATURE = 16  # Octets de HMAC conservés (128 bits)
+
+def _b64(donnees: bytes) -> str:
+    return base64.urlsafe_b64encode(donnees).rstrip(b"=").decode("ascii")
+
+def _signer(charge: bytes) -> bytes:
+    return hmac.new(_CLE, charge, hashlib.sha256).digest()[:TAILLE_SIGNATURE]
+
+def creer_jeton(id_salle: str, id_joueur: str, duree: int = DUREE_JETON_REPRISE) -> str:
+    """
+    Jeton "<charge>.<signature>" (base64 url) où la charge est "expiration:id_joueur:id_salle".
+    """
+    charge = f"{int(time.time()) + duree}:{id_joueur}:{id_salle}".encode("utf-8")
+    return f"{_b64(charge)}.{_b64(_signer(charge))}"
+
+def verifier_jeton(jeton: str) -> Optional[Tuple[str, str]]:
+    """
+    Retourne (id_salle, id_joueur) si le jeton est authentique et non expiré, None sinon.
+    """
+    try:
+        charge_b64, signature_b64 = jeton.split(".")
+        charge = base64.urlsafe_b64decode(charge_b64 + "=" * (-len(charge_b64) % 4))
+        signature = base64.urlsafe_b64decode(signature_b64 + "=" * (-len(signature_b64) % 4))
+    except (ValueError, AttributeError):
+        return None
+    if not hmac.compare_digest(signature, _signer(charge)):
+        return None
+    expiration, _, reste = charge.decode("utf-8", "replace").partition(":")
+    if not expiration.isdigit() or int(expiration) < time.time():
+        return None
+    id_joueur, _, id_salle = reste.partition(":")
+    return id_salle, id_joueur
@@ -0,0 +1,111 @@
+# *******************************************************
+# Nom ......... : spectateurs.py
+# Rôle ........ : Spectateurs d'une salle : vue publique de la partie, diffusion un-vers-plusieurs
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Un spectateur ouvre /ws/game/<salle>?spectateur=1 : il reçoit un
+#                 instantané public de la partie puis ses événements publics (tirs,
+#                 tours, début, fin, redémarrage), sans jamais voir un navire non coulé
+#                 (brouillard de guerre : mêmes informations que vue_publique()).
+#                 Il ne peut rien jouer. Chaque événement est sérialisé une seule fois
+#                 par format (JSON ou binaire) pour toute la salle, puis la même trame
+#                 est déposée directement dans la file d'envoi de chaque spectateur :
+#                 un match suivi par des milliers de spectateurs coûte O(événements)
+#                 en sérialisation, et un simple ajout en file par spectateur.
+#
+# Technologies  : Python, asyncio
+# Dépendances . : asyncio, app.config, app.diffusion
+# Usage ....... : tribunes.ajouter(salle.id, connexion) ; tribunes.diffuser(salle.id, {...})
+# *******************************************************
+
+import asyncio
+
+from .config import SPECTATEURS_MAX
+from .diffusion import FORMATS
+
+class Tribunes:
+    """
+    Spectateurs de chaque salle (id_salle -> ensemble de connexions).
+    Les salles sans spectateur n'ont aucune entrée.
+    """
+
+    def __init__(self, maximum=SPECTATEURS_MAX):
+        self.maximum = maximum
+        self.par_salle = {}
+        # Compteurs exposés par /statistiques/spectateurs et /metrics
+        self.evenements = 0       # Appels à diffuser() ayant au moins un spectateur
+        self.serialisations = 0   # Trames sérialisées (au plus une par format et par événement)
+        self.trames_deposees = 0  # Trames déposées dans les files des spectateurs
+        self.refuses = 0
+
+    def nombre(self, id_salle) -> int:
+        spectateurs = self.par_salle.get(id_salle)
+        return len(spectateurs) if spectateurs else 0
+
+    def connexions(self, id_salle):
+        return list(self.par_salle.get(id_salle, ()))
+
+    def ajouter(self, id_salle, connexion) -> bool:
+        """
+        Inscrit un spectateur ; retourne False si la salle a déjà `maximum` spectateurs.
+        """
+        spectateurs = self.par_salle.setdefault(id_salle, set())
+        if len(spectateurs) >= self.maximum:
+            self.refuses += 1
+            return False
+        spectateurs.add(connexion)
+        return True
+
+    def retirer(self, id_salle, connexion):
+        spectateurs = self.par_salle.get(id_salle)
+        if spectateurs is not None:
+            spectateurs.discard(connexion)
+            if not spectateurs:
+                del self.par_salle[id_salle]
+
+    def diffuser(self, id_salle, *messages):
+        """
+        Envoie des événements publics à tous les spectateurs d'une salle, dans une seule
+        trame ("lot" s'il y en a plusieurs), sérialisée une fois par format utilisé.
+        Ne fait que déposer dans les files d'envoi : n'attend aucune socket.
+        """
+        spectateurs = self.par_salle.get(id_salle)
+        if not spectateurs or not messages:
+            return
+        self.evenements += 1
+        trames = {}  # Connexion.binaire -> trame
+        fermees = []
+        for connexion in spectateurs:
+            trame = trames.get(connexion.binaire)
+            if trame is None:
+                encoder_message, encoder_lot_format = FORMATS[connexion.binaire]
+                trame = trames[connexion.binaire] = encoder_lot_format([encoder_message(m) for m in messages])
+                self.serialisations += 1
+            if connexion.deposer(trame):
+                self.trames_deposees += 1
+            elif connexion.fermee:
+                fermees.append(connexion)
+        for connexion in fermees:
+            self.retirer(id_salle, connexion)
+
+    def fermer_salle(self, id_salle):
+        """
+        La salle a disparu : prévient ses spectateurs puis ferme leurs connexions.
+        """
+        self.diffuser(id_salle, {"action": "salle_fermee", "message": "La partie est terminée."})
+        for connexion in self.par_salle.pop(id_salle, ()):
+            asyncio.ensure_future(connexion.vider_et_fermer())
+
+    def statistiques(self) -> dict:
+        return {
+            "salles_suivies": len(self.par_salle),
+            "spectateurs": sum(len(s) for s in self.par_salle.values()),
+            "evenements": self.evenements,
+            "serialisations": self.serialisations,
+            "trames_deposees": self.trames_deposees,
+            "refuses": self.refuses,
+        }
+
+# Spectateurs de toutes les salles du processus
+tribunes = Tribunes()
@@ -42,11 +42,14 @@ def positions_navire(x: int, y: int, taille: int, orientation: str):
         return [(x - i, y) for i in range(taille)]
     return []
 
-def grille_vide():
+def grille_vide(taille: int = TAILLE_GRILLE):
     """
-    Génère une grille vide de la taille définie dans la configuration.
+    Génère une grille vide (par défaut de la taille définie dans la configuration).
+
+    Args:
+        taille (int): Nombre de lignes et de colonnes
 
     Returns:
         List[List[str]]: Grille carrée remplie de '~' représentant la mer.
     """
-    return [['~' for _ in range(TAILLE_GRILLE)] for _ in range(TAILLE_GRILLE)]
\ No newline at end of file
+    return [['~' for _ in range(taille)] for _ in range(taille)]
\ No newline at end of file
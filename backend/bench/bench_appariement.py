@@ -0,0 +1,74 @@
+# *******************************************************
+# Nom ......... : bench_appariement.py
+# Rôle ........ : Benchmark du coût d'un join sans identifiant de salle
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Remplit le gestionnaire avec N salles actives (pire cas de l'ancien
+#                 parcours : la seule salle incomplète est la dernière) puis mesure le
+#                 coût moyen d'un join sans identifiant, avec l'index des salles en
+#                 attente et avec l'ancien parcours linéaire de toutes les salles.
+#
+# Technologies  : Python
+# Dépendances . : time, argparse, app.game_manager
+# Usage ....... : cd backend && python -m bench.bench_appariement [--salles 1000 10000 100000]
+# *******************************************************
+
+import argparse
+import time
+
+from app.game_manager import GestionnaireParties
+
+def join_historique(gestionnaire, id_joueur):
+    """
+    Ancien join sans identifiant : parcours linéaire de toutes les salles.
+    """
+    salle = next((r for r in gestionnaire.salles.values() if len(r.joueurs) < 2), None)
+    if not salle:
+        salle = gestionnaire.creer_salle()
+    salle.ajouter_joueur(id_joueur)
+    gestionnaire.joueur_vers_salle[id_joueur] = salle.id
+    return salle
+
+def preparer(nb_salles, mode):
+    """
+    Crée `nb_salles` salles nommées complètes, suivies d'une salle nommée avec un joueur en attente,
+    pour que l'ancien parcours linéaire visite toutes les salles.
+    """
+    gestionnaire = GestionnaireParties(mode_appariement=mode)
+    for i in range(nb_salles):
+        gestionnaire.rejoindre_salle(f"a{i}", id_salle=f"salle-{i}")
+        gestionnaire.rejoindre_salle(f"b{i}", id_salle=f"salle-{i}")
+    gestionnaire.rejoindre_salle("attente", id_salle="salle-ouverte")
+    return gestionnaire
+
+def mesurer(gestionnaire, rejoindre, iterations):
+    """
+    Durée moyenne (µs) d'un cycle join + départ d'un joueur sans identifiant de salle.
+    """
+    debut = time.perf_counter()
+    for i in range(iterations):
+        id_joueur = f"j{i}"
+        rejoindre(gestionnaire, id_joueur)
+        gestionnaire.quitter_salle(id_joueur)
+    return (time.perf_counter() - debut) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'appariement")
+    parser.add_argument("--salles", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    for nb_salles in args.salles:
+        print(f"--- {nb_salles} salles")
+        for mode in ("fifo", ""):
+            gestionnaire = preparer(nb_salles, mode)
+            cout = mesurer(gestionnaire, lambda g, j: g.rejoindre_salle(j), args.iterations)
+            libelle = f"index ({mode or 'toute salle'})"
+            print(f"  {libelle:<24}: {cout:9.2f} µs / join")
+        gestionnaire = preparer(nb_salles, "")
+        cout = mesurer(gestionnaire, join_historique, max(20, args.iterations // 100))
+        print(f"  {'parcours linéaire':<24}: {cout:9.2f} µs / join")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# *******************************************************
+# Nom ......... : bench_archive.py
+# Rôle ........ : Écriture et lecture de l'archive des parties (millions de parties)
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Ajoute N parties terminées à une archive neuve par le chemin du serveur
+#                 (archiver() + thread d'écriture par lots), puis l'ouvre par projection
+#                 mémoire et mesure : parcours complet (lecture des en-têtes et total des
+#                 coups, sans copie), décodage complet d'un échantillon, recherche par
+#                 identifiant et requête sur une période.
+#                 Les parties sont tirées d'une réserve de vraies parties jouées avant la
+#                 mesure (placement automatique puis tirs au hasard jusqu'à la victoire).
+#
+# Technologies  : Python, mmap
+# Dépendances . : argparse, os, random, tempfile, time, app.archive, app.game_logic, app.rediffusions
+# Usage ....... : cd backend && python -m bench.bench_archive --parties 1000000
+# *******************************************************
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.archive import ArchiveParties, LecteurArchive, EXTENSION, EXTENSION_INDEX
+from app.game_logic import LogiqueJeu
+from app.rediffusions import encoder_rediffusion, decoder_rediffusion, gagnant_partie
+
+TAILLE_RESERVE = 1000
+PARTIES_PAR_SECONDE = 50  # Dates simulées : 50 parties terminées par seconde
+
+def jouer_partie(rng):
+    """
+    Partie complète en 10x10 : tirs au hasard, même règle de tour que le serveur.
+    """
+    logique = LogiqueJeu()
+    for joueur in (0, 1):
+        logique.placement_automatique(joueur, rng)
+    cases = [(x, y) for x in range(10) for y in range(10)]
+    cibles = [rng.sample(cases, len(cases)), rng.sample(cases, len(cases))]
+    tour = 0
+    while True:
+        x, y = cibles[tour].pop()
+        resultat = logique.traiter_attaque(1 - tour, x, y)
+        if resultat.get("partie_finie"):
+            return logique
+        if not resultat["peut_rejouer"]:
+            tour = 1 - tour
+
+def preparer_reserve(rng):
+    reserve = []
+    for _ in range(TAILLE_RESERVE):
+        logique = jouer_partie(rng)
+        reserve.append((len(logique.coups), gagnant_partie(logique), encoder_rediffusion(logique, "bench")))
+    return reserve
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive des parties : écriture et lecture")
+    parser.add_argument("--parties", type=int, default=1000000)
+    parser.add_argument("--recherches", type=int, default=10000)
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.graine)
+    reserve = preparer_reserve(rng)
+    debut_dates = 1_700_000_000
+    identifiants = []
+
+    with tempfile.TemporaryDirectory() as dossier:
+        archive = ArchiveParties(dossier, "bench")
+        debut = time.perf_counter()
+        for i in range(args.parties):
+            date = debut_dates + i // PARTIES_PAR_SECONDE
+            id_partie = f"{date:08x}{i:08x}"
+            coups, gagnant, donnees = reserve[i % TAILLE_RESERVE]
+            archive.archiver(id_partie, date, 10, coups, gagnant, donnees)
+            if i % 997 == 0:
+                identifiants.append(id_partie)
+        duree_depot = time.perf_counter() - debut
+        archive.vider(delai=600)
+        duree_ecriture = time.perf_counter() - debut
+        archive.arreter()
+        taille_archive = os.path.getsize(archive.chemin + EXTENSION)
+        taille_index = os.path.getsize(archive.chemin + EXTENSION_INDEX)
+
+        with LecteurArchive(archive.chemin) as lecteur:
+            debut = time.perf_counter()
+            total_coups = victoires = 0
+            for _, _, coups, _, gagnant, _ in lecteur:
+                total_coups += coups
+                victoires += gagnant
+            duree_parcours = time.perf_counter() - debut
+
+            echantillon = min(args.parties, 100000)
+            debut = time.perf_counter()
+            for i, partie in enumerate(lecteur):
+                if i >= echantillon:
+                    break
+                decoder_rediffusion(partie[-1])
+            duree_decodage = time.perf_counter() - debut
+
+            recherches = [rng.choice(identifiants) for _ in range(args.recherches)]
+            debut = time.perf_counter()
+            trouvees = sum(lecteur.chercher(id_partie) is not None for id_partie in recherches)
+            duree_recherche = time.perf_counter() - debut
+
+            milieu = debut_dates + args.parties // PARTIES_PAR_SECONDE // 2
+            debut = time.perf_counter()
+            periode = sum(1 for _ in lecteur.entre(milieu, milieu + 60))
+            duree_periode = time.perf_counter() - debut
+            nombre = len(lecteur)
+
+    print(f"{args.parties:,} parties 10x10 ({total_coups / nombre:.0f} coups en moyenne)")
+    print(f"  écriture  : {args.parties / duree_ecriture:12,.0f} parties/s "
+          f"(dépôt depuis la boucle : {duree_depot / args.parties * 1e6:.2f} µs par partie)")
+    print(f"  fichiers  : {taille_archive / nombre:12,.0f} o par partie + {taille_index / nombre:.0f} o d'index "
+          f"({(taille_archive + taille_index) / 2**20:,.1f} Mio)")
+    print(f"  parcours  : {nombre / duree_parcours:12,.0f} parties/s (en-têtes, sans copie), "
+          f"victoires du joueur 1 : {victoires / nombre:.1%}")
+    print(f"  décodage  : {echantillon / duree_decodage:12,.0f} parties/s (flottes et tirs)")
+    print(f"  recherche : {duree_recherche / args.recherches * 1e6:12.1f} µs par identifiant "
+          f"({trouvees:,}/{args.recherches:,} trouvées)")
+    print(f"  période   : {duree_periode * 1000:12.2f} ms pour une minute ({periode:,} parties)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# *******************************************************
+# Nom ......... : bench_autojeu.py
+# Rôle ........ : Parties simulées en masse (moteur + IA) sans WebSocket, sur plusieurs processus
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Joue des parties complètes directement sur LogiqueJeu : placement des
+#                 deux flottes par placement_automatique, puis tirs par traiter_attaque
+#                 et changer_tour, exactement comme le serveur. Chaque confrontation
+#                 entre stratégies (tir aléatoire ou niveaux de CerveauIA) est jouée à
+#                 tour de rôle, les places 0 et 1 alternant d'une partie à l'autre.
+#                 Les parties sont réparties par lots sur un pool de processus ; la partie
+#                 n dépend seulement de (graine, n), le résultat est donc reproductible
+#                 quel que soit le nombre de processus. Rapporte le débit (parties/s),
+#                 le nombre moyen de tirs pour gagner par stratégie et le taux d'échec
+#                 du placement : à relancer avant de déployer un changement de NAVIRES.
+#
+# Technologies  : Python, multiprocessing
+# Dépendances . : argparse, concurrent.futures, itertools, os, random, time, app.config,
+#                 app.game_logic, app.ia
+# Usage ....... : cd backend && python -m bench.bench_autojeu [--parties 100000] [--processus 8]
+# *******************************************************
+
+import argparse
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import TAILLE_GRILLE, NAVIRES
+from app.game_logic import LogiqueJeu
+from app.ia import CerveauIA, NIVEAUX_IA
+
+class TireurAleatoire:
+    """
+    Stratégie de référence : tire sur les cases non encore visées, dans un ordre aléatoire.
+    """
+
+    def __init__(self, taille, graine):
+        self.cibles = [(x, y) for x in range(taille) for y in range(taille)]
+        random.Random(graine).shuffle(self.cibles)
+
+    def choisir(self):
+        return self.cibles.pop()
+
+    def noter_resultat(self, x, y, resultat, positions_coule=None):
+        pass
+
+STRATEGIES = ("aleatoire",) + tuple(NIVEAUX_IA)
+
+def creer_tireur(strategie, graine):
+    if strategie == "aleatoire":
+        return TireurAleatoire(TAILLE_GRILLE, graine)
+    return CerveauIA(TAILLE_GRILLE, [n["taille"] for n in NAVIRES], strategie, graine)
+
+def graine_partie(graine, numero) -> int:
+    return graine * 1_000_003 + numero
+
+def jouer_partie(strategies, graine):
+    """
+    Joue une partie entre strategies[0] (place 0) et strategies[1] (place 1).
+    Retourne (gagnant, tirs_par_joueur), ou None si une flotte n'a pas pu être placée.
+    """
+    rng = random.Random(graine)
+    jeu = LogiqueJeu()
+    try:
+        for id_joueur in (0, 1):
+            jeu.placement_automatique(id_joueur, rng)
+    except Exception:
+        return None
+    tireurs = [creer_tireur(s, rng.getrandbits(32)) for s in strategies]
+    tirs = [0, 0]
+    jeu.tour_actuel = 0
+    while True:
+        joueur = jeu.tour_actuel
+        x, y = tireurs[joueur].choisir()
+        resultat = jeu.traiter_attaque(1 - joueur, x, y)
+        tirs[joueur] += 1
+        if resultat["resultat"] in ("invalide", "deja_attaque"):
+            raise RuntimeError(f"Tir refusé par le moteur ({strategies[joueur]}) : {resultat}")
+        tireurs[joueur].noter_resultat(x, y, resultat["resultat"], resultat.get("positions_coule"))
+        if resultat["resultat"] == "gagne":
+            return joueur, tirs
+        if not resultat["peut_rejouer"]:
+            jeu.changer_tour()
+
+def jouer_lot(graine, debut, fin, confrontations):
+    """
+    Joue les parties numérotées [debut, fin) ; retourne des totaux additionnables entre lots.
+    Partie n : confrontation n % len(confrontations), places inversées une fois sur deux.
+    """
+    totaux = {
+        "parties": 0,
+        "echecs_placement": 0,
+        "tirs": 0,
+        "victoires": {},       # stratégie -> [victoires, tirs des parties gagnées]
+        "confrontations": {},  # (a, b) -> [parties, victoires de a]
+    }
+    for numero in range(debut, fin):
+        a, b = confrontations[numero % len(confrontations)]
+        inverse = (numero // len(confrontations)) % 2 == 1
+        places = (b, a) if inverse else (a, b)
+        issue = jouer_partie(places, graine_partie(graine, numero))
+        if issue is None:
+            totaux["echecs_placement"] += 1
+            continue
+        gagnant, tirs = issue
+        totaux["parties"] += 1
+        totaux["tirs"] += sum(tirs)
+        victoires = totaux["victoires"].setdefault(places[gagnant], [0, 0])
+        victoires[0] += 1
+        victoires[1] += tirs[gagnant]
+        confrontation = totaux["confrontations"].setdefault((a, b), [0, 0])
+        confrontation[0] += 1
+        confrontation[1] += (gagnant == 1) == inverse
+    return totaux
+
+def fusionner(totaux, lot):
+    for cle in ("parties", "echecs_placement", "tirs"):
+        totaux[cle] += lot[cle]
+    for cle in ("victoires", "confrontations"):
+        for nom, (n, somme) in lot[cle].items():
+            cumul = totaux[cle].setdefault(nom, [0, 0])
+            cumul[0] += n
+            cumul[1] += somme
+
+def executer(args):
+    strategies = args.strategies.split(",")
+    for strategie in strategies:
+        if strategie not in STRATEGIES:
+            raise SystemExit(f"Stratégie inconnue : {strategie} (choix : {', '.join(STRATEGIES)})")
+    if args.duels:
+        confrontations = list(itertools.combinations_with_replacement(strategies, 2))
+    else:
+        confrontations = [(s, s) for s in strategies]
+    lots = [(args.graine, debut, min(debut + args.lot, args.parties), confrontations)
+            for debut in range(0, args.parties, args.lot)]
+
+    totaux = {"parties": 0, "echecs_placement": 0, "tirs": 0, "victoires": {}, "confrontations": {}}
+    debut = time.perf_counter()
+    if args.processus <= 1:
+        for lot in lots:
+            fusionner(totaux, jouer_lot(*lot))
+    else:
+        with ProcessPoolExecutor(args.processus) as pool:
+            for lot in pool.map(jouer_lot, *zip(*lots)):
+                fusionner(totaux, lot)
+    duree = time.perf_counter() - debut
+
+    tentees = totaux["parties"] + totaux["echecs_placement"]
+    flotte = ", ".join(str(n["taille"]) for n in NAVIRES)
+    print(f"{tentees} parties ({TAILLE_GRILLE}x{TAILLE_GRILLE}, flotte {flotte}) en {duree:.2f} s "
+          f"sur {max(args.processus, 1)} processus, graine {args.graine}")
+    print(f"  {tentees / duree:,.1f} parties/s, {totaux['tirs'] / duree:,.0f} tirs/s, "
+          f"échecs de placement : {totaux['echecs_placement']} "
+          f"({100 * totaux['echecs_placement'] / max(tentees, 1):.3f} %)")
+    print(f"  {'stratégie':<12} {'victoires':>10} {'tirs pour gagner':>17}")
+    for strategie in strategies:
+        victoires, tirs = totaux["victoires"].get(strategie, [0, 0])
+        moyenne = f"{tirs / victoires:.2f}" if victoires else "-"
+        print(f"  {strategie:<12} {victoires:>10} {moyenne:>17}")
+    if args.duels:
+        print(f"  {'confrontation':<26} {'parties':>8} {'victoires de la 1re':>20}")
+        for (a, b), (parties, victoires_a) in totaux["confrontations"].items():
+            if a != b:
+                print(f"  {a + ' contre ' + b:<26} {parties:>8} {100 * victoires_a / parties:>19.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Parties simulées en masse sur LogiqueJeu (sans WebSocket)")
+    parser.add_argument("--parties", type=int, default=20000, help="Nombre total de parties")
+    parser.add_argument("--processus", type=int, default=os.cpu_count() or 1,
+                        help="Taille du pool de processus (1 = tout dans ce processus)")
+    parser.add_argument("--lot", type=int, default=500, help="Parties par tâche envoyée au pool")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES),
+                        help=f"Stratégies séparées par des virgules ({', '.join(STRATEGIES)})")
+    parser.add_argument("--duels", action="store_true",
+                        help="Confronte aussi les stratégies entre elles (sinon chacune contre elle-même)")
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+    executer(args)
+
+if __name__ == "__main__":
+    main()
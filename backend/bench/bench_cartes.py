@@ -0,0 +1,118 @@
+# *******************************************************
+# Nom ......... : bench_cartes.py
+# Rôle ........ : Coût des cartes de chaleur pour les gestionnaires et pour le thread
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Joue une réserve de vraies parties, puis rejoue leurs tirs et leurs flottes :
+#                 - en ligne : chaque événement incrémente directement les tableaux NumPy
+#                   depuis le gestionnaire (indexation NumPy case par case) ;
+#                 - cartes_chaleur : le gestionnaire ne fait que déposer (noter_tir,
+#                   noter_flotte) ; le thread additionne par lots. On mesure le temps passé
+#                   côté gestionnaire, puis le débit d'agrégation jusqu'à vider().
+#                 Mesure enfin la construction d'une réponse HTTP (dans le thread, après chaque
+#                 lot) et une réponse resservie par la boucle d'événements.
+#
+# Technologies  : Python, NumPy
+# Dépendances . : argparse, random, time, numpy, app.cartes_chaleur, app.game_logic, app.plateau
+# Usage ....... : cd backend && python -m bench.bench_cartes [--parties 2000]
+# *******************************************************
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.cartes_chaleur import CartesChaleur
+from app.game_logic import LogiqueJeu
+from app.plateau import Plateau
+
+def jouer_parties(nombre, rng):
+    """
+    Parties 10x10 au hasard : (flottes, tirs) avec un plateau figé après chaque tir.
+    """
+    parties = []
+    for _ in range(nombre):
+        logique = LogiqueJeu()
+        for joueur in (0, 1):
+            logique.placement_automatique(joueur, rng)
+        cases = [(x, y) for x in range(10) for y in range(10)]
+        cibles = [rng.sample(cases, len(cases)), rng.sample(cases, len(cases))]
+        recus = [Plateau(10), Plateau(10)]  # Tirs reçus au fil de la partie (pour premier tir)
+        tirs, tour = [], 0
+        while True:
+            x, y = cibles[tour].pop()
+            resultat = logique.traiter_attaque(1 - tour, x, y)
+            recus[1 - tour].tirer(x, y)
+            tirs.append((recus[1 - tour].tirs, x, y, resultat["resultat"] != "manque"))
+            if resultat.get("partie_finie"):
+                break
+            if not resultat["peut_rejouer"]:
+                tour = 1 - tour
+        parties.append((logique.plateaux, tirs))
+    return parties
+
+def en_ligne(parties):
+    """
+    Chemin naïf : le gestionnaire met à jour lui-même les tableaux, événement par événement.
+    """
+    tirs, touches, premiers, navires = (np.zeros((10, 10), dtype=np.int64) for _ in range(4))
+    plateau = Plateau(10)
+    debut = time.perf_counter()
+    for plateaux, coups in parties:
+        for p in plateaux:
+            for indice in p.case_vers_navire:
+                navires[divmod(indice, 10)] += 1
+        for masque, x, y, touche in coups:
+            plateau.tirs = masque
+            tirs[x, y] += 1
+            if touche:
+                touches[x, y] += 1
+            if plateau.un_seul_tir():
+                premiers[x, y] += 1
+    return time.perf_counter() - debut
+
+def par_lots(parties):
+    """
+    cartes_chaleur : dépôt seul côté gestionnaire, agrégation dans le thread.
+    """
+    cartes = CartesChaleur(intervalle=0.05)
+    plateau = Plateau(10)
+    debut = time.perf_counter()
+    for plateaux, coups in parties:
+        for p in plateaux:
+            cartes.noter_flotte(p)
+        for masque, x, y, touche in coups:
+            plateau.tirs = masque
+            cartes.noter_tir(plateau, x, y, touche)
+    depot = time.perf_counter() - debut
+    cartes.vider(delai=600)
+    total = time.perf_counter() - debut
+    construite = cartes.duree_construction / cartes.reponses_construites
+    debut = time.perf_counter()
+    for _ in range(1000):
+        cartes.reponse(10)
+    servie = (time.perf_counter() - debut) / 1000
+    cartes.arreter()
+    return depot, total, construite, servie, cartes
+
+def main():
+    parser = argparse.ArgumentParser(description="Cartes de chaleur : coût par événement")
+    parser.add_argument("--parties", type=int, default=2000)
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+
+    parties = jouer_parties(args.parties, random.Random(args.graine))
+    evenements = sum(len(coups) + 2 for _, coups in parties)
+    naif = en_ligne(parties)
+    depot, total, construite, servie, cartes = par_lots(parties)
+    print(f"{args.parties:,} parties 10x10, {evenements:,} événements (tirs + flottes)")
+    print(f"  en ligne       : {naif / evenements * 1e6:8.2f} µs par événement dans le gestionnaire")
+    print(f"  cartes_chaleur : {depot / evenements * 1e6:8.2f} µs par événement dans le gestionnaire, "
+          f"{evenements / total:,.0f} événements/s agrégés ({cartes.lots} lots)")
+    print(f"  réponse HTTP   : {construite * 1000:8.2f} ms construite par le thread ({cartes.reponses_construites} fois), "
+          f"{servie * 1e6:.2f} µs resservie")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# *******************************************************
+# Nom ......... : bench_charge.py
+# Rôle ........ : Générateur de charge WebSocket sans interface (benchmark de bout en bout)
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Lance N paires de joueurs simulés contre /ws/game/{id_salle}. Chaque
+#                 paire enchaîne join → joueur_pret → demande_placement_auto →
+#                 confirmation_placement → attaques → rejouer, autant de parties que
+#                 demandé. Le script mesure le débit (actions et parties par seconde) et
+#                 les latences p50/p95/p99 par action (envoi → première réponse).
+#                 Une attaque refusée ("erreur", anti-spam) est renvoyée après une attente
+#                 qui double à chaque refus (voir ATTENTE_RELANCE), ESSAIS_ATTAQUE fois au plus.
+#                 Les refus sont comptés à part (colonne « refusées ») : seul le résultat de
+#                 l'attaque finalement acceptée donne une mesure de latence.
+#                 Par défaut, un worker uvicorn `app.main:app` est démarré sur la boucle
+#                 locale avec l'anti-spam désactivé (BATTLESHIP_SPAM_FACTOR=0) ; --url
+#                 vise un serveur déjà lancé, --en-processus le sert dans ce processus.
+#
+# Technologies  : Python, asyncio, WebSocket
+# Dépendances . : asyncio, argparse, contextlib, json, os, random, socket, subprocess, sys, time,
+#                 websockets, uvicorn, app.protocole_binaire
+# Usage ....... : cd backend && python -m bench.bench_charge [--paires 50] [--parties 3] [--binaire]
+# *******************************************************
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import websockets
+
+from app.protocole_binaire import SOUS_PROTOCOLE_BINAIRE, encoder_binaire, decoder_binaire
+
+# Réponse(s) qui terminent la mesure de latence de chaque action envoyée
+REPONSES = {
+    "join": {"player_joined"},
+    "joueur_pret": {"attente_adversaire", "debut_placement"},
+    "demande_placement_auto": {"delta_grille", "mise_a_jour_grille"},
+    "confirmation_placement": {"placement_confirme"},
+    "attaque": {"resultat_attaque"},
+    "rejouer": {"attente_rejouer"},
+}
+
+# Délai maximal sans message avant de considérer une partie comme bloquée
+DELAI_RECEPTION = 10.0
+
+# Renvoi d'une attaque refusée : première attente (secondes), plafond et nombre d'essais
+ATTENTE_RELANCE = 0.05
+ATTENTE_RELANCE_MAX = 2.0
+ESSAIS_ATTAQUE = 10
+
+class JoueurSimule:
+    """
+    Client WebSocket piloté par les messages du serveur (aucune attente artificielle).
+    """
+
+    def __init__(self, url, parties, taille_grille, latences, binaire, rng):
+        self.url = url
+        self.parties = parties
+        self.taille_grille = taille_grille
+        self.latences = latences          # action -> [secondes]
+        self.binaire = binaire
+        self.rng = rng
+        self.ws = None
+        self.index = None
+        self.id_joueur = None
+        self.en_attente = {}              # action -> instant d'envoi
+        self.cibles = []
+        self.pret_envoye = False          # "ready" peut être diffusé deux fois à l'arrivée du second joueur
+        self.parties_jouees = 0
+        self.erreurs = 0
+        self.tir_en_cours = None          # Coordonnées de l'attaque envoyée, jusqu'à son résultat
+        self.essais = 0
+        self.relances = 0
+        self.refusees = 0                 # Attaques refusées (anti-spam, tour) : hors latences
+
+    async def envoyer(self, action, **champs):
+        message = {"action": action, **champs}
+        if action in REPONSES:
+            self.en_attente[action] = time.perf_counter()
+        await self.ws.send(encoder_binaire(message) if self.binaire else json.dumps(message))
+
+    async def recevoir(self):
+        trame = await asyncio.wait_for(self.ws.recv(), DELAI_RECEPTION)
+        message = decoder_binaire(trame) if isinstance(trame, bytes) else json.loads(trame)
+        return message["messages"] if message.get("action") == "lot" else [message]
+
+    def noter_reponse(self, message):
+        """
+        Termine la mesure de l'action en attente à laquelle ce message répond.
+        Une attaque refusée reste en attente : seul son résultat (après renvoi) clôt la mesure.
+        """
+        action = message.get("action")
+        if action == "erreur" and "attaque" in self.en_attente:
+            self.refusees += 1
+            return
+        for envoyee, debut in list(self.en_attente.items()):
+            if action not in REPONSES[envoyee]:
+                continue
+            if action == "attente_rejouer" and message.get("waiting_player") != self.id_joueur:
+                continue
+            if action == "resultat_attaque" and message.get("type_joueur") != "attaquant":
+                continue
+            self.latences.setdefault(envoyee, []).append(time.perf_counter() - debut)
+            del self.en_attente[envoyee]
+            return
+
+    async def attaquer(self):
+        self.tir_en_cours = self.cibles.pop()
+        self.essais = 0
+        await self.envoyer("attaque", coordonnees=list(self.tir_en_cours))
+
+    async def relancer_attaque(self):
+        """
+        Renvoie l'attaque refusée par le serveur après une attente croissante.
+        """
+        if self.tir_en_cours is None or self.essais >= ESSAIS_ATTAQUE:
+            return
+        await asyncio.sleep(min(ATTENTE_RELANCE * 2 ** self.essais, ATTENTE_RELANCE_MAX))
+        self.essais += 1
+        self.relances += 1
+        await self.envoyer("attaque", coordonnees=list(self.tir_en_cours))
+
+    async def jouer(self, id_salle):
+        sous_protocoles = [SOUS_PROTOCOLE_BINAIRE] if self.binaire else None
+        async with websockets.connect(f"{self.url}/ws/game/{id_salle}", subprotocols=sous_protocoles,
+                                      max_queue=None) as ws:
+            self.ws = ws
+            await self.envoyer("join")
+            while self.parties_jouees < self.parties:
+                doit_attaquer = False
+                refusee = False
+                fin = False
+                for message in await self.recevoir():
+                    self.noter_reponse(message)
+                    action = message.get("action")
+                    if action == "player_joined":
+                        self.index = message["player_index"]
+                        self.id_joueur = message["player_id"]
+                    elif action in ("ready", "restart") and not self.pret_envoye:
+                        self.pret_envoye = True
+                        await self.envoyer("joueur_pret")
+                    elif action == "debut_placement":
+                        await self.envoyer("demande_placement_auto")
+                    elif action in ("delta_grille", "mise_a_jour_grille") and self.cibles == []:
+                        self.cibles = [(x, y) for x in range(self.taille_grille) for y in range(self.taille_grille)]
+                        self.rng.shuffle(self.cibles)
+                        await self.envoyer("confirmation_placement")
+                    elif action in ("debut_tour", "changement_tour"):
+                        doit_attaquer = message["tour_joueur"] == self.index
+                    elif action == "resultat_attaque" and message["type_joueur"] == "attaquant":
+                        self.tir_en_cours = None
+                        doit_attaquer = message["peut_rejouer"]
+                    elif action == "fin_partie":
+                        fin = True
+                    elif action == "ping":
+                        await self.envoyer("pong")
+                    elif action == "erreur":
+                        self.erreurs += 1
+                        refusee = True
+                if fin:
+                    self.parties_jouees += 1
+                    self.tir_en_cours = None
+                    self.cibles = []
+                    self.pret_envoye = False
+                    if self.parties_jouees < self.parties:
+                        await self.envoyer("rejouer")
+                elif doit_attaquer and self.cibles:
+                    await self.attaquer()
+                elif refusee:
+                    await self.relancer_attaque()
+
+def centile(valeurs, p):
+    """
+    Centile p (0-100) par rang le plus proche sur une liste triée.
+    """
+    if not valeurs:
+        return 0.0
+    return valeurs[min(len(valeurs) - 1, int(len(valeurs) * p / 100))]
+
+def port_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def attendre_port(port, delai=15.0):
+    limite = time.monotonic() + delai
+    while time.monotonic() < limite:
+        try:
+            _, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+            ecrivain.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Le serveur n'écoute pas sur le port {port}")
+
+def environnement_serveur(args):
+    """
+    Variables d'environnement du serveur testé : anti-spam réglable, limite IP désactivée
+    (toutes les connexions viennent de 127.0.0.1), journal limité aux avertissements.
+    """
+    return {
+        "BATTLESHIP_SPAM_FACTOR": str(args.facteur_anti_spam),
+        "BATTLESHIP_IP_RATE": "0",
+        "BATTLESHIP_LOG_LEVEL": "WARNING",
+    }
+
+async def executer(args):
+    serveur = tache_serveur = processus = None
+    url = args.url
+    if url is None:
+        port = port_libre()
+        url = f"ws://127.0.0.1:{port}"
+        if args.en_processus:
+            os.environ.update(environnement_serveur(args))
+            import uvicorn
+            from app.main import app
+            serveur = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+            tache_serveur = asyncio.create_task(serveur.serve())
+        else:
+            processus = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                 "--port", str(port), "--log-level", "warning"],
+                env={**os.environ, **environnement_serveur(args)},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        await attendre_port(port)
+
+    from app.config import TAILLE_GRILLE
+    latences = {}
+    rng = random.Random(args.graine)
+    joueurs = [JoueurSimule(url, args.parties, TAILLE_GRILLE, latences, args.binaire, random.Random(rng.random()))
+               for _ in range(2 * args.paires)]
+    # Le serveur servi dans ce processus peut écrire sur la console : on la fait taire pendant la mesure
+    with open(os.devnull, "w") as sortie_nulle, \
+            contextlib.redirect_stdout(sortie_nulle if serveur else sys.stdout), \
+            contextlib.redirect_stderr(sortie_nulle if serveur else sys.stderr):
+        debut = time.perf_counter()
+        resultats = await asyncio.gather(
+            *(j.jouer(f"charge-{i // 2}-{args.graine}") for i, j in enumerate(joueurs)),
+            return_exceptions=True,
+        )
+        duree = time.perf_counter() - debut
+
+    if serveur is not None:
+        serveur.should_exit = True
+        await tache_serveur
+    if processus is not None:
+        processus.terminate()
+        processus.wait()
+
+    echecs = [r for r in resultats if isinstance(r, BaseException)]
+    parties = sum(j.parties_jouees for j in joueurs) // 2
+    total_actions = sum(len(v) for v in latences.values())
+    print(f"{args.paires} paires, {parties} parties en {duree:.2f} s "
+          f"({'binaire' if args.binaire else 'JSON'}, anti-spam x{args.facteur_anti_spam})")
+    print(f"  {parties / duree:,.1f} parties/s, {total_actions / duree:,.0f} actions/s, "
+          f"{sum(j.erreurs for j in joueurs)} erreurs ({sum(j.relances for j in joueurs)} attaques renvoyées), "
+          f"{len(echecs)} joueurs en échec")
+    for exception in echecs[:3]:
+        print(f"  échec : {exception!r}")
+    refusees = {"attaque": sum(j.refusees for j in joueurs)}
+    print(f"  {'action':<24} {'nombre':>8} {'refusées':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for action in REPONSES:
+        valeurs = sorted(latences.get(action, []))
+        print(f"  {action:<24} {len(valeurs):>8} {refusees.get(action, 0):>9} " +
+              " ".join(f"{centile(valeurs, p) * 1000:>9.2f}" for p in (50, 95, 99)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de charge WebSocket de bout en bout")
+    parser.add_argument("--paires", type=int, default=50, help="Nombre de paires de joueurs simultanées")
+    parser.add_argument("--parties", type=int, default=3, help="Parties jouées par chaque paire")
+    parser.add_argument("--url", default=None, help="Serveur existant (ex : ws://127.0.0.1:8000)")
+    parser.add_argument("--en-processus", action="store_true", help="Sert l'application dans ce processus")
+    parser.add_argument("--facteur-anti-spam", type=float, default=0.0,
+                        help="Multiplicateur des intervalles anti-spam du serveur lancé (0 = désactivé)")
+    parser.add_argument("--binaire", action="store_true", help="Utilise le sous-protocole binaire")
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(executer(args))
+
+if __name__ == "__main__":
+    main()
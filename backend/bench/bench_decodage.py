@@ -0,0 +1,66 @@
+# *******************************************************
+# Nom ......... : bench_decodage.py
+# Rôle ........ : Benchmark du décodage + validation des messages WebSocket
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Mesure le nombre de messages par seconde (un seul cœur) traités
+#                 par l'ancien chemin (json.loads + construction du modèle Pydantic)
+#                 et par le codec (backend JSON rapide + validateurs précompilés),
+#                 sur un mélange de messages représentatif d'une partie.
+#
+# Technologies  : Python
+# Dépendances . : json, time, argparse, app.codec, app.main
+# Usage ....... : cd backend && python -m bench.bench_decodage [--messages 200000]
+# *******************************************************
+
+import argparse
+import json
+import time
+
+from app.codec import NOM_BACKEND_JSON, charger_backend_json, ValidateurActions
+from app.main import MODELES_ACTIONS
+
+# Mélange de trames : surtout des attaques et des actions sans champ
+TRAMES = [
+    '{"action":"attaque","coordonnees":[3,7]}',
+    '{"action":"attaque","coordonnees":[9,0]}',
+    '{"action":"placer_navire","taille_navire":4,"coordonnees":[2,2],"orientation":"VD","nom_navire":"Croiseur"}',
+    '{"action":"join"}',
+    '{"action":"joueur_pret"}',
+    '{"action":"demande_placement_auto"}',
+    '{"action":"confirmation_placement"}',
+    '{"action":"rejouer"}',
+]
+
+def chemin_historique(texte):
+    donnees = json.loads(texte)
+    return MODELES_ACTIONS[donnees["action"]](**donnees)
+
+def mesurer(traiter, nb_messages):
+    """
+    Messages par seconde pour la fonction de traitement donnée.
+    """
+    trames = (TRAMES * (nb_messages // len(TRAMES) + 1))[:nb_messages]
+    debut = time.perf_counter()
+    for texte in trames:
+        traiter(texte)
+    return nb_messages / (time.perf_counter() - debut)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du décodage des messages")
+    parser.add_argument("--messages", type=int, default=200000)
+    args = parser.parse_args()
+
+    validateur = ValidateurActions(MODELES_ACTIONS)
+    reference = mesurer(chemin_historique, args.messages)
+    print(f"{'json + Modele(**donnees)':>30} : {reference:12,.0f} messages/s")
+    for nom in ("json", NOM_BACKEND_JSON):
+        _, decoder, _ = charger_backend_json(nom)
+        debit = mesurer(lambda texte: validateur.valider(decoder(texte)), args.messages)
+        print(f"{'codec ' + nom:>30} : {debit:12,.0f} messages/s  (x{debit / reference:.1f})")
+        if nom == NOM_BACKEND_JSON:
+            break
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# *******************************************************
+# Nom ......... : bench_grandes_grilles.py
+# Rôle ........ : Coût d'une partie selon la taille de grille (10x10 à 1000x1000)
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Pour chaque taille de grille, joue le début d'une partie sur un
+#                 LogiqueJeu configuré (placement automatique des deux flottes puis
+#                 N tirs de chaque côté) et mesure : mémoire de la partie (tracemalloc),
+#                 temps d'un placement automatique, temps moyen d'un tir, temps et
+#                 taille (JSON) de l'instantané d'une grille. Les mêmes tirs sont aussi
+#                 appliqués à un masque de bits couvrant toute la grille (représentation
+#                 précédente des tirs) : son coût suit la surface, celui du plateau creux non.
+#
+# Technologies  : Python, tracemalloc
+# Dépendances . : argparse, json, random, time, tracemalloc, app.game_logic
+# Usage ....... : cd backend && python -m bench.bench_grandes_grilles [--tailles 10,100,1000 --tirs 2000]
+# *******************************************************
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from app.game_logic import LogiqueJeu
+
+def placer(logique, graine):
+    for joueur in (0, 1):
+        logique.placement_automatique(joueur, random.Random(graine + joueur))
+        logique.extraire_delta(joueur)
+
+def tirer(logique, cibles):
+    for joueur in (0, 1):
+        for x, y in cibles[joueur]:
+            logique.traiter_attaque(1 - joueur, x, y)
+
+def jouer(taille, flotte, tirs, graine):
+    """
+    Début de partie chronométré, puis rejoué à l'identique sous tracemalloc
+    (qui ralentit les allocations) pour la mémoire ; retourne un dict de mesures.
+    """
+    rng = random.Random(graine)
+    nombre = min(tirs, taille * taille)
+    cibles = [[divmod(indice, taille) for indice in rng.sample(range(taille * taille), nombre)] for _ in (0, 1)]
+
+    logique = LogiqueJeu(taille, flotte)
+    debut = time.perf_counter()
+    placer(logique, graine)
+    duree_placement = (time.perf_counter() - debut) / 2
+    debut = time.perf_counter()
+    tirer(logique, cibles)
+    duree_tir = (time.perf_counter() - debut) / (2 * nombre)
+    debut = time.perf_counter()
+    _, contenu = logique.instantane_grille(0)
+    duree_instantane = time.perf_counter() - debut
+
+    tracemalloc.start()
+    logique = LogiqueJeu(taille, flotte)
+    placer(logique, graine)
+    apres_placement = tracemalloc.get_traced_memory()[0]
+    tirer(logique, cibles)
+    apres_tirs = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Mêmes tirs sur un masque de bits couvrant toute la grille
+    masque = 0
+    debut = time.perf_counter()
+    for x, y in cibles[0]:
+        masque |= 1 << (x * taille + y)
+    duree_masque = (time.perf_counter() - debut) / nombre
+
+    return {
+        "navires": len(logique.composition),
+        "tirs": nombre,
+        "memoire_placement": apres_placement,
+        "memoire_tirs": apres_tirs - apres_placement,
+        "placement_ms": duree_placement * 1000,
+        "tir_us": duree_tir * 1e6,
+        "instantane_ms": duree_instantane * 1000,
+        "instantane_octets": len(json.dumps(contenu)),
+        "masque_us": duree_masque * 1e6,
+        "masque_octets": (masque.bit_length() + 7) // 8,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût d'une partie selon la taille de grille")
+    parser.add_argument("--tailles", default="10,100,1000", help="Tailles de grille, séparées par des virgules")
+    parser.add_argument("--flotte", default=None,
+                        help="Flotte de toutes les grilles (défaut : classique en 10x10, mega au-delà)")
+    parser.add_argument("--tirs", type=int, default=2000, help="Tirs de chaque joueur")
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+
+    for taille in (int(t) for t in args.tailles.split(",")):
+        flotte = args.flotte or ("classique" if taille <= 10 else "mega")
+        m = jouer(taille, flotte, args.tirs, args.graine)
+        print(f"--- {taille}x{taille}, flotte {flotte} ({m['navires']} navires, {m['tirs']} tirs par joueur)")
+        print(f"  mémoire        : {m['memoire_placement']:>10,} o après placement, "
+              f"+{m['memoire_tirs']:,} o après les tirs")
+        print(f"  placement auto : {m['placement_ms']:10.2f} ms")
+        print(f"  tir            : {m['tir_us']:10.2f} µs   (masque de bits : {m['masque_us']:.2f} µs, "
+              f"{m['masque_octets']:,} o)")
+        print(f"  instantané     : {m['instantane_ms']:10.2f} ms, {m['instantane_octets']:,} o en JSON")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# *******************************************************
+# Nom ......... : bench_memoire.py
+# Rôle ........ : Empreinte mémoire d'une salle, inactive et en cours de partie
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Ouvre N salles de deux joueurs dans un GestionnaireParties neuf et
+#                 mesure avec tracemalloc les octets alloués par salle :
+#                 - salle inactive : deux joueurs arrivés, aucune action ;
+#                 - salle en cours : flottes placées et quelques tirs de chaque côté.
+#                 Les connexions (WebSocket) ne sont pas comptées : les joueurs n'en ont pas.
+#                 Flottes et tirs sont tirés d'une réserve calculée avant la mesure
+#                 (tracemalloc multiplie par 7 le coût du générateur de flottes).
+#
+# Technologies  : Python, tracemalloc
+# Dépendances . : argparse, gc, os, random, time, tracemalloc, app.game_manager, app.placement
+# Usage ....... : cd backend && python -m bench.bench_memoire --salles 100000
+# *******************************************************
+
+import argparse
+import gc
+import os
+import random
+import time
+import tracemalloc
+
+# Pas de journal de parties pendant la mesure (un fichier par salle sinon)
+os.environ["BATTLESHIP_JOURNAL_DIR"] = ""
+
+from app.config import TAILLE_GRILLE, NAVIRES
+from app.game_manager import GestionnaireParties
+from app.placement import generer_flotte
+
+TAILLE_RESERVE = 1000  # Flottes et séries de tirs distinctes
+
+def ouvrir_salles(gestionnaire, nombre):
+    for i in range(nombre):
+        id_salle = f"salle-{i}"
+        gestionnaire.rejoindre_salle(f"{id_salle}-a", id_salle=id_salle)
+        gestionnaire.rejoindre_salle(f"{id_salle}-b", id_salle=id_salle)
+
+def preparer_reserve(tirs, rng):
+    """
+    Flottes aléatoires et séries de tirs, calculées une fois avant la mesure.
+    """
+    cases = [(x, y) for x in range(TAILLE_GRILLE) for y in range(TAILLE_GRILLE)]
+    flottes = [generer_flotte(TAILLE_GRILLE, [n["taille"] for n in NAVIRES], rng) for _ in range(TAILLE_RESERVE)]
+    series = [rng.sample(cases, tirs) for _ in range(TAILLE_RESERVE)]
+    return flottes, series
+
+def jouer_debut(gestionnaire, flottes, series):
+    """
+    Place les deux flottes (comme placement_automatique) puis tire une série de coups de chaque côté.
+    """
+    for i, salle in enumerate(gestionnaire.salles.values()):
+        logique = salle.logique
+        for joueur in (0, 1):
+            logique.reset_etats_joueur(joueur)
+            for navire, (x, y, orientation) in zip(NAVIRES, flottes[(2 * i + joueur) % TAILLE_RESERVE]):
+                logique.placer_navire(joueur, navire["taille"], (x, y), orientation, navire["nom"])
+            logique.extraire_delta(joueur)
+            logique.pret[joueur] = True
+        logique.tour_actuel = 0
+        for joueur in (0, 1):
+            for x, y in series[(2 * i + joueur) % TAILLE_RESERVE]:
+                logique.traiter_attaque(1 - joueur, x, y)
+            logique.extraire_delta(1 - joueur)
+
+def mesurer(etape, nombre):
+    """
+    Exécute `etape` sous tracemalloc et renvoie (octets alloués par salle, durée).
+    """
+    gc.collect()
+    avant = tracemalloc.get_traced_memory()[0]
+    debut = time.perf_counter()
+    etape()
+    duree = time.perf_counter() - debut
+    gc.collect()
+    return (tracemalloc.get_traced_memory()[0] - avant) / nombre, duree
+
+def main():
+    parser = argparse.ArgumentParser(description="Empreinte mémoire par salle")
+    parser.add_argument("--salles", type=int, default=100000)
+    parser.add_argument("--tirs", type=int, default=20, help="Tirs de chaque joueur dans une salle en cours")
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+
+    flottes, series = preparer_reserve(args.tirs, random.Random(args.graine))
+    gestionnaire = GestionnaireParties()
+    tracemalloc.start()
+    inactive, duree_ouverture = mesurer(lambda: ouvrir_salles(gestionnaire, args.salles), args.salles)
+    supplement, duree_partie = mesurer(lambda: jouer_debut(gestionnaire, flottes, series), args.salles)
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{args.salles:,} salles de 2 joueurs ({TAILLE_GRILLE}x{TAILLE_GRILLE}, {args.tirs} tirs par joueur)")
+    print(f"  salle inactive : {inactive:,.0f} octets ({duree_ouverture:.1f} s)")
+    print(f"  salle en cours : {inactive + supplement:,.0f} octets ({duree_partie:.1f} s)")
+    print(f"  total suivi    : {total / 2**20:,.1f} Mio")
+
+if __name__ == "__main__":
+    main()
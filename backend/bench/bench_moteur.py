@@ -0,0 +1,126 @@
+# *******************************************************
+# Nom ......... : bench_moteur.py
+# Rôle ........ : Micro-benchmark du moteur d'attaque (plateau vs grille historique)
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Mesure le nombre d'attaques par seconde de LogiqueJeu (plateau
+#                 creux de plateau.py) et le compare à l'ancien moteur qui parcourait
+#                 toute la grille à chaque touche et à chaque test de victoire.
+#
+# Technologies  : Python
+# Dépendances . : random, time, argparse, app.game_logic
+# Usage ....... : cd backend && python -m bench.bench_moteur [--parties 2000]
+# *******************************************************
+
+import argparse
+import random
+import time
+
+from app.config import TAILLE_GRILLE, NAVIRES
+from app.game_logic import LogiqueJeu
+from app.utils import grille_vide, positions_navire
+
+class LogiqueJeuHistorique(LogiqueJeu):
+    """
+    Reproduit l'algorithme d'attaque d'origine (parcours complet de la grille)
+    pour servir de référence, sur sa propre grille de cases (listes de chaînes).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.grilles = [grille_vide(), grille_vide()]
+
+    def reset_etats_joueur(self, id_joueur):
+        super().reset_etats_joueur(id_joueur)
+        self.grilles[id_joueur] = grille_vide()
+
+    def placer_navire(self, id_joueur, taille_navire, coordonnees, orientation, nom_navire):
+        if not super().placer_navire(id_joueur, taille_navire, coordonnees, orientation, nom_navire):
+            return False
+        navire = self.navires[id_joueur][-1]
+        for (x, y) in positions_navire(*coordonnees, taille_navire, orientation):
+            self.grilles[id_joueur][x][y] = [navire.id, 'S', navire.nom]
+        return True
+
+    def _positions_navire_sur_grille(self, grille, id_navire):
+        return [
+            (i, j)
+            for i in range(TAILLE_GRILLE)
+            for j in range(TAILLE_GRILLE)
+            if isinstance(grille[i][j], list) and grille[i][j][0] == id_navire
+        ]
+
+    def traiter_attaque(self, id_cible, x, y):
+        if not (0 <= x < TAILLE_GRILLE and 0 <= y < TAILLE_GRILLE):
+            return {"resultat": "invalide", "peut_rejouer": False}
+        cellule = self.grilles[id_cible][x][y]
+        if isinstance(cellule, list):
+            id_navire, etat, nom_navire = cellule
+            if etat == 'S':
+                self.grilles[id_cible][x][y] = [id_navire, 'X', nom_navire]
+                positions = self._positions_navire_sur_grille(self.grilles[id_cible], id_navire)
+                navire_coule = all(self.grilles[id_cible][i][j][1] != 'S' for (i, j) in positions)
+                if navire_coule:
+                    for (i, j) in positions:
+                        self.grilles[id_cible][i][j] = [id_navire, 'C', nom_navire]
+                    nom_navire_reel = id_navire.split("_", 2)[2]
+                    taille_navire = next(n['taille'] for n in NAVIRES if n['nom'] == nom_navire_reel)
+                    tous_coules = not any(
+                        isinstance(self.grilles[id_cible][i][j], list) and self.grilles[id_cible][i][j][1] == 'S'
+                        for i in range(TAILLE_GRILLE) for j in range(TAILLE_GRILLE)
+                    )
+                    resultat = "gagne" if tous_coules else "coule"
+                    return {
+                        "resultat": resultat,
+                        "peut_rejouer": (resultat == "coule"),
+                        "taille_navire": taille_navire,
+                        "nom_navire": nom_navire_reel,
+                        "positions_coule": positions,
+                        "partie_finie": (resultat == "gagne"),
+                        "coordonnees": (x, y)
+                    }
+                return {"resultat": "touche", "peut_rejouer": True, "coordonnees": (x, y)}
+            return {"resultat": "deja_attaque", "peut_rejouer": False, "coordonnees": (x, y)}
+        elif cellule == '~':
+            self.grilles[id_cible][x][y] = 'O'
+            return {"resultat": "manque", "peut_rejouer": False, "coordonnees": (x, y)}
+        return {"resultat": "deja_attaque", "peut_rejouer": False, "coordonnees": (x, y)}
+
+def mesurer(classe, parties, graine):
+    """
+    Joue `parties` parties complètes contre une flotte aléatoire et renvoie
+    (nombre d'attaques, durée cumulée des appels à traiter_attaque).
+    """
+    random.seed(graine)
+    cases = [(x, y) for x in range(TAILLE_GRILLE) for y in range(TAILLE_GRILLE)]
+    attaques = 0
+    duree = 0.0
+    for _ in range(parties):
+        logique = classe()
+        logique.placement_automatique(1)
+        ordre = cases[:]
+        random.shuffle(ordre)
+        debut = time.perf_counter()
+        for x, y in ordre:
+            attaques += 1
+            if logique.traiter_attaque(1, x, y).get("partie_finie"):
+                break
+        duree += time.perf_counter() - debut
+    return attaques, duree
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du moteur d'attaque")
+    parser.add_argument("--parties", type=int, default=2000)
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+
+    resultats = {}
+    for nom, classe in (("historique", LogiqueJeuHistorique), ("plateau", LogiqueJeu)):
+        attaques, duree = mesurer(classe, args.parties, args.graine)
+        resultats[nom] = attaques / duree
+        print(f"{nom:>10} : {attaques} attaques en {duree:.3f} s -> {resultats[nom]:,.0f} attaques/s")
+    print(f"Accélération : x{resultats['plateau'] / resultats['historique']:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# *******************************************************
+# Nom ......... : bench_placement.py
+# Rôle ........ : Benchmark du placement automatique (index des placements légaux)
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Mesure la latence par appel (moyenne, p50, p99) et le taux d'échec
+#                 du générateur de flottes sur la grille 10x10 et sur des grilles
+#                 plus grandes à densité de flotte équivalente, en le comparant à
+#                 l'ancien tirage aléatoire avec 100 essais par navire.
+#
+# Technologies  : Python
+# Dépendances . : random, time, statistics, argparse, app.placement, app.plateau
+# Usage ....... : cd backend && python -m bench.bench_placement [--appels 500]
+# *******************************************************
+
+import argparse
+import random
+import statistics
+import time
+
+from app.config import NAVIRES
+from app.placement import generer_flotte
+from app.plateau import Plateau
+from app.utils import positions_navire
+
+def placement_historique(taille_grille, tailles_navires, rng):
+    """
+    Ancien algorithme : tirages aléatoires, 100 essais par navire.
+    """
+    plateau = Plateau(taille_grille)
+    for taille_navire in tailles_navires:
+        for _ in range(100):
+            x = rng.randint(0, taille_grille - 1)
+            y = rng.randint(0, taille_grille - 1)
+            orientation = rng.choice(["HR", "HL", "VD", "VU"])
+            positions = positions_navire(x, y, taille_navire, orientation)
+            if plateau.peut_placer(positions):
+                plateau.placer(positions)
+                break
+        else:
+            raise Exception("Impossible de placer le navire")
+
+def mesurer(fonction, taille_grille, tailles_navires, appels, graine):
+    """
+    Retourne (latences en µs des appels réussis, nombre d'échecs).
+    """
+    rng = random.Random(graine)
+    latences = []
+    echecs = 0
+    for _ in range(appels):
+        debut = time.perf_counter()
+        try:
+            fonction(taille_grille, tailles_navires, rng)
+        except Exception:
+            echecs += 1
+            continue
+        latences.append((time.perf_counter() - debut) * 1e6)
+    return latences, echecs
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du placement automatique")
+    parser.add_argument("--appels", type=int, default=500)
+    parser.add_argument("--graine", type=int, default=1)
+    args = parser.parse_args()
+
+    flotte = [n['taille'] for n in NAVIRES]
+    scenarios = [
+        ("10x10 flotte standard", 10, flotte),
+        ("10x10 flotte dense (x2)", 10, flotte * 2),
+        ("30x30 flotte x9", 30, flotte * 9),
+        ("100x100 flotte x100", 100, flotte * 100),
+    ]
+    for libelle, taille_grille, tailles in scenarios:
+        appels = args.appels if taille_grille <= 30 else max(5, args.appels // 50)
+        print(f"--- {libelle} ({appels} appels)")
+        for nom, fonction in (("historique", placement_historique), ("generateur", generer_flotte)):
+            latences, echecs = mesurer(fonction, taille_grille, tailles, appels, args.graine)
+            if latences:
+                latences.sort()
+                p99 = latences[min(len(latences) - 1, int(len(latences) * 0.99))]
+                print(f"{nom:>10} : moyenne {statistics.mean(latences):9.1f} µs  "
+                      f"p50 {statistics.median(latences):9.1f} µs  p99 {p99:9.1f} µs  "
+                      f"échecs {echecs}/{appels}")
+            else:
+                print(f"{nom:>10} : échecs {echecs}/{appels}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# *******************************************************
+# Nom ......... : bench_spectateurs.py
+# Rôle ........ : Coût de la diffusion d'une partie à des milliers de spectateurs
+# Auteur ...... : Maxim Khomenko
+# Version ..... : 1.1.0 du 16/10/2026
+# Licence ..... : Réalisé dans le cadre du cours de Réseaux
+# Description . : Inscrit N spectateurs (moitié JSON, moitié binaire) dans les tribunes
+#                 d'une salle, puis diffuse une série d'événements publics de tir :
+#                 - par spectateur : chaque connexion sérialise le message (send_json) ;
+#                 - tribunes : une sérialisation par format et par événement, la même
+#                   trame étant déposée dans toutes les files (spectateurs.py).
+#                 Les connexions n'ont pas de socket : seul le côté serveur est mesuré
+#                 (sérialisation + dépôt en file), les files étant vidées entre deux événements.
+#
+# Technologies  : Python
+# Dépendances . : argparse, time, app.connexion, app.spectateurs
+# Usage ....... : cd backend && python -m bench.bench_spectateurs [--spectateurs 10,1000,10000]
+# *******************************************************
+
+import argparse
+import time
+
+from app.connexion import Connexion
+from app.spectateurs import Tribunes
+
+def evenements(nombre):
+    """
+    Événements publics d'une partie : tirs manqués, touchés et coulés, avec changement de tour.
+    """
+    lots = []
+    for i in range(nombre):
+        x, y = divmod(i % 100, 10)
+        resultat = ("manque", "touche", "coule")[i % 3]
+        tir = {
+            "action": "resultat_attaque",
+            "attaquant_index": i % 2,
+            "resultat": resultat,
+            "coordonnees": [x, y],
+            "nom_navire": "Croiseur" if resultat == "coule" else "",
+            "positions_coule": [[x, y], [x, (y + 1) % 10], [x, (y + 2) % 10]] if resultat == "coule" else [],
+        }
+        lots.append([tir, {"action": "changement_tour", "tour_joueur": (i + 1) % 2}] if resultat == "manque" else [tir])
+    return lots
+
+def vider(connexions):
+    for connexion in connexions:
+        connexion.file.clear()
+
+def par_spectateur(connexions, lots):
+    """
+    Chemin naïf : chaque spectateur sérialise chaque message de l'événement.
+    """
+    debut = time.perf_counter()
+    for messages in lots:
+        for connexion in connexions:
+            for message in messages:
+                connexion.deposer(connexion.encoder(message))
+        vider(connexions)
+    return time.perf_counter() - debut
+
+def par_tribunes(connexions, lots):
+    """
+    Tribunes : une sérialisation par format, puis dépôt de la même trame partout.
+    """
+    tribunes = Tribunes(maximum=len(connexions))
+    for connexion in connexions:
+        tribunes.ajouter("vitrine", connexion)
+    debut = time.perf_counter()
+    for messages in lots:
+        tribunes.diffuser("vitrine", *messages)
+        vider(connexions)
+    return time.perf_counter() - debut, tribunes.serialisations
+
+def main():
+    parser = argparse.ArgumentParser(description="Diffusion aux spectateurs")
+    parser.add_argument("--spectateurs", default="10,1000,10000", help="Nombres de spectateurs, séparés par des virgules")
+    parser.add_argument("--evenements", type=int, default=200)
+    args = parser.parse_args()
+
+    lots = evenements(args.evenements)
+    for nombre in (int(n) for n in args.spectateurs.split(",")):
+        connexions = [Connexion(None, taille_file=8, binaire=(i % 2 == 1)) for i in range(nombre)]
+        naif = par_spectateur(connexions, lots)
+        partage, serialisations = par_tribunes(connexions, lots)
+        print(f"--- {nombre:,} spectateurs, {len(lots)} événements")
+        print(f"  par spectateur : {naif / len(lots) * 1000:9.3f} ms par événement, "
+              f"{sum(len(m) for m in lots) * nombre:,} sérialisations")
+        print(f"  tribunes       : {partage / len(lots) * 1000:9.3f} ms par événement, "
+              f"{serialisations:,} sérialisations (x{naif / partage:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ import React, { useState, useRef } from "react";
 import PlacementPanel from "@/components/PlacementPanel";
 import GameBoard from "@/components/GameBoard";
 import VantaBackground from "@/components/VantaBackground";
-import { connectWebSocket, sendWS, closeWebSocket } from "@/utils/ws";
+import { connectWebSocket, sendWS, closeWebSocket, definirJetonReprise } from "@/utils/ws";
 import "@/styles/main.css";
 import {
   Loader2, Check, Repeat2, ThumbsUp, Menu as MenuIcon, FileText,
@@ -139,6 +139,17 @@ const PHASES = {
   CONFIRM_REPLAY: "CONFIRM_REPLAY",
 };
 
+// Phase de l'instantané de reprise (serveur) -> [phase de l'interface, type d'attente]
+const PHASES_REPRISE = {
+  attente: [PHASES.WAITING, "searching"],
+  menu: [PHASES.MENU, null],
+  attente_adversaire: [PHASES.WAITING, "waiting_ready_btn"],
+  placement: [PHASES.PLACEMENT, null],
+  attente_placement: [PHASES.WAITING, "waiting_placement"],
+  bataille: [PHASES.BATTLE, null],
+  fin: [PHASES.FIN, null],
+};
+
 const iconGlowStyle = {
   marginRight: 14,
   verticalAlign: "-0.18em",
@@ -237,6 +248,9 @@ export default function App() {
   const [playerIndex, setPlayerIndex] = useState(null);
   const [grilleJoueur, setGrilleJoueur] = useState(Array(10).fill().map(() => Array(10).fill("~")));
   const [grilleAdversaire, setGrilleAdversaire] = useState(Array(10).fill().map(() => Array(10).fill("~")));
+  // Version de la grille connue du serveur + copie synchrone (pour appliquer les deltas)
+  const grilleVersionRef = useRef(0);
+  const grilleJoueurRef = useRef(Array(10).fill().map(() => Array(10).fill("~")));
   const [statusMessage, setStatusMessage] = useState(""); // message contextuel ou erreur
   const [monTour, setMonTour] = useState(false);
   const [finInfo, setFinInfo] = useState({ victoire: null, details: null });
@@ -263,13 +277,21 @@ export default function App() {
     connectWebSocket({
       url: `/ws/game/${roomId || "default-room"}`,
       onMessage: handleWSMessage,
-      onOpen: () => {
+      onOpen: (event, reprise) => {
         setWsStatus("connected");
+        // En reprise, le serveur envoie directement l'instantané de la partie
+        if (reprise) return;
         send("join");
         setPhase(PHASES.WAITING);
         setStatusMessage("Recherche d’un adversaire…");
       },
-      onClose: () => {
+      onClose: (event, reprisePrevue) => {
+        if (reprisePrevue) {
+          // Coupure : la place est gardée par le serveur le temps de se reconnecter
+          setWsStatus("connecting");
+          setStatusMessage("Connexion perdue, reconnexion…");
+          return;
+        }
         setWsStatus("disconnected");
         setEventLog([]);
         setPhase(PHASES.LOBBY);
@@ -277,6 +299,8 @@ export default function App() {
       },
       onError: () => setStatusMessage("Erreur WebSocket"),
       autoReconnect: true,
+      // Protocole binaire compact (opt-in) : VITE_WS_BINAIRE=1 au build
+      binaire: import.meta.env.VITE_WS_BINAIRE === "1",
     });
   }
   function send(action, payload = {}) {
@@ -301,7 +325,9 @@ export default function App() {
     return naviresTrouves;
   }
   function resetAllStates({ full = false, toLobby = false } = {}) {
-    setGrilleJoueur(Array(10).fill().map(() => Array(10).fill("~")));
+    grilleVersionRef.current = 0;
+    grilleJoueurRef.current = Array(10).fill().map(() => Array(10).fill("~"));
+    setGrilleJoueur(grilleJoueurRef.current);
     setGrilleAdversaire(Array(10).fill().map(() => Array(10).fill("~")));
     setNaviresPlaces([]);
     setSelectedNavire(null);
@@ -329,6 +355,7 @@ export default function App() {
 
     switch (data.action) {
       case "player_joined":
+        definirJetonReprise(data.jeton_reprise);
         setPlayerId(data.player_id);
         setPlayerIndex(data.player_index);
         setPhase(PHASES.WAITING);
@@ -336,6 +363,50 @@ export default function App() {
         setStatusMessage("");
         break;
 
+      case "reprise": {
+        // Instantané après reconnexion : grille complète + tirs visibles sur la grille adverse
+        definirJetonReprise(data.jeton_reprise);
+        setPlayerId(data.player_id);
+        setPlayerIndex(data.player_index);
+        grilleVersionRef.current = data.version ?? 0;
+        grilleJoueurRef.current = data.grille || [];
+        setGrilleJoueur(grilleJoueurRef.current);
+        setNaviresPlaces(detectNaviresPlaces(grilleJoueurRef.current));
+        const grilleAdv = Array(10).fill().map(() => Array(10).fill("~"));
+        (data.tirs || []).forEach(([x, y, cell]) => { grilleAdv[x][y] = cell; });
+        setGrilleAdversaire(grilleAdv);
+        setMonTour(data.tour_joueur === data.player_index);
+        const [phaseReprise, attente] = PHASES_REPRISE[data.phase] || [PHASES.WAITING, "searching"];
+        if (attente) setWaitingType(attente);
+        if (phaseReprise === PHASES.FIN) setFinInfo({ victoire: data.victoire, details: data });
+        setPhase(phaseReprise);
+        setStatusMessage(
+          phaseReprise === PHASES.BATTLE
+            ? (data.tour_joueur === data.player_index ? "À vous de jouer !" : "Tour de l’adversaire…")
+            : "Reconnecté : partie reprise."
+        );
+        eventMessage = { type: "nouvelle", msg: "Reconnecté à la partie." };
+        break;
+      }
+
+      case "reprise_refusee":
+        // Place libérée entre-temps : on repart d'une nouvelle partie dans la même salle
+        definirJetonReprise(null);
+        resetAllStates();
+        send("join");
+        setPhase(PHASES.WAITING);
+        setWaitingType("searching");
+        setStatusMessage(data.message || "Session expirée.");
+        break;
+
+      case "adversaire_deconnexion_temporaire":
+        setStatusMessage(data.message || "L'adversaire a perdu la connexion…");
+        break;
+
+      case "adversaire_reconnecte":
+        setStatusMessage(data.message || "L'adversaire est de retour.");
+        break;
+
       case "ready":
         setPhase(PHASES.MENU);
         setStatusMessage("");
@@ -356,11 +427,30 @@ export default function App() {
         break;
 
       case "mise_a_jour_grille":
-        setGrilleJoueur(data.grille || []);
-        setNaviresPlaces(detectNaviresPlaces(data.grille || []));
+        grilleVersionRef.current = data.version ?? 0;
+        grilleJoueurRef.current = data.grille || [];
+        setGrilleJoueur(grilleJoueurRef.current);
+        setNaviresPlaces(detectNaviresPlaces(grilleJoueurRef.current));
+        setSelectedNavire(null);
+        setStatusMessage("Navire placé !");
+        break;
+
+      case "delta_grille": {
+        // Delta basé sur une autre version : on redemande la grille complète
+        if (data.version_base !== grilleVersionRef.current) {
+          send("demande_grille", { version: grilleVersionRef.current });
+          break;
+        }
+        const newGrid = grilleJoueurRef.current.map((row) => [...row]);
+        (data.cases || []).forEach(([x, y, cell]) => { newGrid[x][y] = cell; });
+        grilleVersionRef.current = data.version;
+        grilleJoueurRef.current = newGrid;
+        setGrilleJoueur(newGrid);
+        setNaviresPlaces(detectNaviresPlaces(newGrid));
         setSelectedNavire(null);
         setStatusMessage("Navire placé !");
         break;
+      }
 
       case "erreur_placement":
         setStatusMessage(data.message || "Placement invalide.");
@@ -496,6 +586,13 @@ export default function App() {
         }, 0);
         break;
 
+      case "salle_fermee":
+        // Salle supprimée par le serveur après une longue inactivité
+        resetAllStates({ toLobby: true });
+        setStatusMessage(data.message || "Partie fermée par le serveur.");
+        eventMessage = { type: "defaite", msg: data.message || "Partie fermée par le serveur." };
+        break;
+
       case "adversaire_deconnecte":
         resetAllStates({ toLobby: true });
         setStatusMessage("L'adversaire s'est déconnecté. Cliquez sur Jouer pour une nouvelle partie.");
@@ -0,0 +1,176 @@
+/**
+ * *******************************************************
+ * Nom ......... : binaire.js
+ * Rôle ........ : Encodage/décodage du sous-protocole WebSocket binaire compact
+ * Auteur ...... : Maxim Khomenko
+ * Version ..... : 1.1.0 du 16/10/2026
+ * Licence ..... : Réalisé dans le cadre du cours de Réseaux
+ * Description . : Pendant JavaScript de backend/app/protocole_binaire.py : mêmes
+ *                 étiquettes et même dictionnaire partagé (ordre figé). Les messages
+ *                 restent les mêmes objets qu'en JSON, seule la trame change.
+ *
+ * Technologies  : JavaScript (Web API)
+ * Dépendances . : Aucune (TextEncoder/TextDecoder, DataView)
+ * Usage ....... : Utilisé par ws.js quand connectWebSocket({ binaire: true })
+ * *******************************************************
+ */
+
+export const SOUS_PROTOCOLE_BINAIRE = "bataille-navale.bin.v1";
+
+// Même ordre que DICTIONNAIRE côté serveur : ne jamais réordonner, seulement ajouter à la fin
+const DICTIONNAIRE = [
+  // Clés
+  "action", "message", "coordonnees", "resultat", "type_joueur", "peut_rejouer",
+  "nom_navire", "positions_coule", "taille_navire", "orientation", "version",
+  "version_base", "cases", "grille", "tour_joueur", "player_index", "player_id",
+  "gagnant_id", "victoire", "waiting_player", "messages", "symbole_cle",
+  // Actions du client
+  "join", "joueur_pret", "demande_placement_auto", "confirmation_placement",
+  "reinitialisation_placement", "placer_navire", "attaque", "demande_grille",
+  "rejouer", "deconnexion",
+  // Actions du serveur
+  "lot", "player_joined", "ready", "debut_placement", "attente_adversaire", "erreur",
+  "erreur_placement", "mise_a_jour_grille", "delta_grille", "placement_confirme",
+  "tous_navires_prets", "debut_tour", "changement_tour", "resultat_attaque",
+  "fin_partie", "attente_rejouer", "restart", "adversaire_deconnecte",
+  // Valeurs fréquentes
+  "touche", "manque", "coule", "gagne", "deja_attaque", "attaquant", "defenseur",
+  "~", "O", "X", "HR", "VD", "HL", "VU",
+  // Entrées étendues (étiquette 0xC8)
+  "S", "Porte-avions", "Croiseur", "Contre-torpilleur", "Sous-marin", "Torpilleur",
+  "C'est votre tour !", "Tour de l'adversaire.",
+  "ping", "pong",
+  "taille_grille", "navires", "taille", "nom",
+  "spectateur", "attaquant_index", "gagnant_index", "tirs", "joueurs", "phase", "spectateurs",
+  "rediffusion",
+];
+const INDICES = new Map(DICTIONNAIRE.map((chaine, i) => [chaine, i]));
+
+const NONE = 0xc0, FAUX = 0xc1, VRAI = 0xc2;
+const ENTIER = 0xc3, FLOTTANT = 0xc4, CHAINE = 0xc5, LISTE = 0xc6, OBJET = 0xc7, ETENDU = 0xc8;
+
+const encodeurTexte = new TextEncoder();
+const decodeurTexte = new TextDecoder();
+
+function ecrireVarint(n, sortie) {
+  while (n > 0x7f) {
+    sortie.push((n & 0x7f) | 0x80);
+    n = Math.floor(n / 128);
+  }
+  sortie.push(n);
+}
+
+function ecrireNombre(etiquette, n, sortie) {
+  const vue = new DataView(new ArrayBuffer(8));
+  if (etiquette === ENTIER) vue.setBigInt64(0, BigInt(n), true);
+  else vue.setFloat64(0, n, true);
+  sortie.push(etiquette, ...new Uint8Array(vue.buffer));
+}
+
+function ecrireChaine(chaine, sortie) {
+  const indice = INDICES.get(chaine);
+  if (indice !== undefined) {
+    if (indice < 64) sortie.push(0x80 | indice);
+    else sortie.push(ETENDU, indice - 64);
+    return;
+  }
+  const octets = encodeurTexte.encode(chaine);
+  sortie.push(CHAINE);
+  ecrireVarint(octets.length, sortie);
+  for (const octet of octets) sortie.push(octet);
+}
+
+function ecrireValeur(valeur, sortie) {
+  if (typeof valeur === "string") ecrireChaine(valeur, sortie);
+  else if (valeur === true) sortie.push(VRAI);
+  else if (valeur === false) sortie.push(FAUX);
+  else if (valeur === null || valeur === undefined) sortie.push(NONE);
+  else if (typeof valeur === "number") {
+    if (Number.isInteger(valeur) && valeur >= 0 && valeur <= 0x7f) sortie.push(valeur);
+    else ecrireNombre(Number.isInteger(valeur) ? ENTIER : FLOTTANT, valeur, sortie);
+  } else if (Array.isArray(valeur)) {
+    sortie.push(LISTE);
+    ecrireVarint(valeur.length, sortie);
+    valeur.forEach((element) => ecrireValeur(element, sortie));
+  } else {
+    const entrees = Object.entries(valeur).filter(([, v]) => v !== undefined);
+    sortie.push(OBJET);
+    ecrireVarint(entrees.length, sortie);
+    for (const [cle, element] of entrees) {
+      ecrireChaine(cle, sortie);
+      ecrireValeur(element, sortie);
+    }
+  }
+}
+
+/**
+ * Encode un message (objet JSON-compatible) en trame binaire.
+ * @param {object} message
+ * @returns {Uint8Array}
+ */
+export function encoderBinaire(message) {
+  const sortie = [];
+  ecrireValeur(message, sortie);
+  return Uint8Array.from(sortie);
+}
+
+/**
+ * Décode une trame binaire reçue du serveur.
+ * @param {ArrayBuffer} tampon
+ * @returns {object}
+ */
+export function decoderBinaire(tampon) {
+  const octets = new Uint8Array(tampon);
+  const vue = new DataView(octets.buffer, octets.byteOffset, octets.byteLength);
+  let pos = 0;
+
+  function lireVarint() {
+    let n = 0, facteur = 1, octet;
+    do {
+      if (pos >= octets.length) throw new Error("Trame tronquée");
+      octet = octets[pos++];
+      n += (octet & 0x7f) * facteur;
+      facteur *= 128;
+    } while (octet & 0x80);
+    return n;
+  }
+
+  function lireValeur() {
+    if (pos >= octets.length) throw new Error("Trame tronquée");
+    const etiquette = octets[pos++];
+    if (etiquette < 0x80) return etiquette;
+    if (etiquette < 0xc0) return DICTIONNAIRE[etiquette & 0x3f];
+    switch (etiquette) {
+      case NONE: return null;
+      case FAUX: return false;
+      case VRAI: return true;
+      case ETENDU: return DICTIONNAIRE[octets[pos++] + 64];
+      case ENTIER: pos += 8; return Number(vue.getBigInt64(pos - 8, true));
+      case FLOTTANT: pos += 8; return vue.getFloat64(pos - 8, true);
+      case CHAINE: {
+        const longueur = lireVarint();
+        pos += longueur;
+        return decodeurTexte.decode(octets.subarray(pos - longueur, pos));
+      }
+      case LISTE: {
+        const nombre = lireVarint();
+        const liste = [];
+        for (let i = 0; i < nombre; i++) liste.push(lireValeur());
+        return liste;
+      }
+      case OBJET: {
+        const nombre = lireVarint();
+        const objet = {};
+        for (let i = 0; i < nombre; i++) {
+          const cle = lireValeur();
+          objet[cle] = lireValeur();
+        }
+        return objet;
+      }
+      default:
+        throw new Error(`Étiquette inconnue : ${etiquette}`);
+    }
+  }
+
+  return lireValeur();
+}
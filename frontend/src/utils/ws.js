@@ -8,19 +8,27 @@
  * Description . : Fournit un wrapper simple autour des WebSockets avec :
  *                 reconnexion automatique, file d’attente de messages offline,
  *                 nettoyage sécurisé et callbacks personnalisables.
+ *                 Peut négocier le sous-protocole binaire compact (option `binaire`),
+ *                 le JSON restant le format par défaut.
+ *                 Après une coupure, la reconnexion présente le jeton de reprise reçu
+ *                 du serveur (?reprise=...) pour retrouver sa place dans la partie.
  *
  * Technologies  : JavaScript (Web API)
- * Dépendances . : Aucune (standard JS natif)
+ * Dépendances . : ./binaire.js
  * Usage ....... : Importé dans App.jsx pour interagir avec le backend en temps réel
  * *******************************************************
  */
 
+import { SOUS_PROTOCOLE_BINAIRE, encoderBinaire, decoderBinaire } from "./binaire";
+
 let socket = null;                  // Instance WebSocket globale
 let connected = false;              // Statut de connexion
+let modeBinaire = false;            // true si le serveur a accepté le sous-protocole binaire
 let sendQueue = [];                 // File d’attente des messages (quand offline)
 let reconnectTries = 0;             // Nombre de tentatives de reconnexion
 const MAX_RECONNECT_TRIES = 5;      // Limite des tentatives de reconnexion auto
 let reconnectTimeout = null;        // ID du timeout de reconnexion
+let jetonReprise = null;            // Jeton signé du serveur pour reprendre sa place après une coupure
 
 /**
  * Nettoie proprement les listeners et ferme la socket courante si présente.
@@ -35,9 +43,35 @@ function cleanupSocket() {
     try { socket.close(); } catch {}
     socket = null;
     connected = false;
+    modeBinaire = false;
   }
 }
 
+/**
+ * Mémorise le jeton de reprise envoyé par le serveur (null pour l'oublier).
+ * @param {string|null} jeton
+ */
+export function definirJetonReprise(jeton) {
+  jetonReprise = jeton || null;
+}
+
+/**
+ * Ajoute le jeton de reprise à l'URL de connexion, s'il y en a un.
+ * @param {string} url
+ */
+function urlAvecReprise(url) {
+  if (!jetonReprise) return url;
+  return `${url}${url.includes("?") ? "&" : "?"}reprise=${encodeURIComponent(jetonReprise)}`;
+}
+
+/**
+ * Sérialise un message dans le format négocié avec le serveur (binaire ou JSON).
+ * @param {object} message
+ */
+function encoderMessage(message) {
+  return modeBinaire ? encoderBinaire(message) : JSON.stringify(message);
+}
+
 /**
  * Ouvre une nouvelle connexion WebSocket.
  * Gère automatiquement la reconnexion, la file d'attente de messages et les callbacks personnalisés.
@@ -45,10 +79,11 @@ function cleanupSocket() {
  * @param {Object} params
  * @param {string} params.url - L’URL WebSocket à utiliser
  * @param {function} [params.onMessage] - Callback pour chaque message reçu
- * @param {function} [params.onOpen] - Callback à l’ouverture de la connexion
- * @param {function} [params.onClose] - Callback à la fermeture
+ * @param {function} [params.onOpen] - Callback à l’ouverture de la connexion (event, reprise)
+ * @param {function} [params.onClose] - Callback à la fermeture (event, reprisePrevue)
  * @param {function} [params.onError] - Callback en cas d’erreur
  * @param {boolean} [params.autoReconnect=true] - Active/désactive la reconnexion automatique
+ * @param {boolean} [params.binaire=false] - Propose le sous-protocole binaire compact (repli JSON si refusé)
  */
 export function connectWebSocket({
   url,
@@ -57,54 +92,71 @@ export function connectWebSocket({
   onClose,
   onError,
   autoReconnect = true,
+  binaire = false,
 }) {
   // Toujours fermer l’ancienne connexion avant d’en ouvrir une nouvelle
   cleanupSocket();
 
-  console.log("Tentative de connexion WebSocket :", url);
-  socket = new WebSocket(url);
+  // Avec un jeton, le serveur renvoie directement l'état de la partie : pas de "join"
+  const reprise = !!jetonReprise;
+  const urlConnexion = urlAvecReprise(url);
+  console.log("Tentative de connexion WebSocket :", urlConnexion);
+  socket = binaire ? new WebSocket(urlConnexion, [SOUS_PROTOCOLE_BINAIRE]) : new WebSocket(urlConnexion);
+  socket.binaryType = "arraybuffer";
 
   socket.onopen = (event) => {
     connected = true;
     reconnectTries = 0;
-    console.log("WebSocket connecté.");
-
-    // On envoie d’emblée le message “join”
-    try {
-      socket.send(JSON.stringify({ action: "join" }));
-    } catch (e) {
-      console.error("[WS] Erreur lors de l'envoi du message 'join':", e);
+    // Un serveur plus ancien ignore la proposition : on reste alors en JSON
+    modeBinaire = socket.protocol === SOUS_PROTOCOLE_BINAIRE;
+    console.log("WebSocket connecté.", modeBinaire ? "(binaire)" : "(JSON)");
+
+    // On envoie d’emblée le message “join” (sauf en reprise de session)
+    if (!reprise) {
+      try {
+        socket.send(encoderMessage({ action: "join" }));
+      } catch (e) {
+        console.error("[WS] Erreur lors de l'envoi du message 'join':", e);
+      }
     }
 
     // Vide la file d'attente des messages non envoyés
     while (sendQueue.length && socket.readyState === WebSocket.OPEN) {
-      socket.send(sendQueue.shift());
+      socket.send(encoderMessage(sendQueue.shift()));
     }
 
-    if (onOpen) onOpen(event);
+    if (onOpen) onOpen(event, reprise);
   };
 
   socket.onmessage = (event) => {
     try {
-      const data = JSON.parse(event.data);
-      if (onMessage) onMessage(data, event);
+      const data = typeof event.data === "string" ? JSON.parse(event.data) : decoderBinaire(event.data);
+      // Une trame "lot" regroupe plusieurs événements d'une même action serveur
+      // Battement de cœur : le serveur vérifie que la connexion est toujours vivante
+      if (data.action === "ping") {
+        socket.send(encoderMessage({ action: "pong" }));
+        return;
+      }
+      const messages = data.action === "lot" ? data.messages : [data];
+      if (onMessage) messages.forEach((message) => onMessage(message, event));
     } catch (e) {
-      console.error("[WS] Erreur JSON :", event.data, e);
+      console.error("[WS] Message illisible :", event.data, e);
     }
   };
 
   socket.onclose = (event) => {
     connected = false;
     console.warn("WebSocket fermé :", event.code, event.reason || "(aucune raison)");
-    if (onClose) onClose(event);
+    const reconnexion = autoReconnect && reconnectTries < MAX_RECONNECT_TRIES;
+    if (onClose) onClose(event, reconnexion && !!jetonReprise);
 
     // Gestion reconnexion automatique
-    if (autoReconnect && reconnectTries < MAX_RECONNECT_TRIES) {
+    if (reconnexion) {
       const delay = Math.min(2000, Math.pow(2, reconnectTries) * 350);
       console.log(`[WS] Tentative de reconnexion dans ${delay}ms...`);
       reconnectTimeout = setTimeout(() => {
         reconnectTries++;
-        connectWebSocket({ url, onMessage, onOpen, onClose, onError, autoReconnect });
+        connectWebSocket({ url, onMessage, onOpen, onClose, onError, autoReconnect, binaire });
       }, delay);
     }
   };
@@ -125,15 +177,15 @@ export function connectWebSocket({
 /**
  * Envoie un message via WebSocket.
  * Si la connexion n’est pas encore ouverte, stocke le message dans la file d’attente.
- * @param {object} message - Objet à envoyer (sera JSON.stringifié)
+ * @param {object} message - Objet à envoyer (sérialisé en JSON ou en binaire selon la connexion)
  */
 export function sendWS(message) {
-  const msgString = JSON.stringify(message);
   if (socket && connected && socket.readyState === WebSocket.OPEN) {
-    socket.send(msgString);
+    socket.send(encoderMessage(message));
   } else {
-    sendQueue.push(msgString);
-    console.warn("[WS] Message en file d’attente :", msgString);
+    // Stocké tel quel : le format n'est connu qu'à l'ouverture de la connexion
+    sendQueue.push(message);
+    console.warn("[WS] Message en file d’attente :", message);
   }
 }
 
@@ -146,12 +198,14 @@ export function closeWebSocket() {
     clearTimeout(reconnectTimeout);
     reconnectTimeout = null;
   }
+  // Départ volontaire : le serveur libère la place, le jeton ne sert plus
+  jetonReprise = null;
 
   if (socket) {
     try {
       // Informe le serveur de la déconnexion volontaire
       if (socket.readyState === WebSocket.OPEN) {
-        socket.send(JSON.stringify({ action: "deconnexion" }));
+        socket.send(encoderMessage({ action: "deconnexion" }));
       }
     } catch (e) {}
     cleanupSocket();